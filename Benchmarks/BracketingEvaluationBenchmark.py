@@ -0,0 +1,103 @@
+"""
+Iterations and function evaluations needed by the bracketing root finders on a standard test set.
+
+Each solver is stepped until its root estimate is within ``tolerance`` of the known root
+(or it fails, or reaches max_iterations), counting user function calls with instrument=True.
+The estimate is the solver's current best point: x_root for bisection, Brent and safeguarded Newton,
+c for false position and x for Newton.
+BiSectionMethod re-evaluates its bracket ends on every step, so it is also run with an evaluation cache.
+False position is run in each of its modes: plain regula falsi and the Illinois, Pegasus and
+Anderson-Bjorck modifications, which avoid its one-sided convergence.
+The safeguarded Newton method is compared with plain Newton-Raphson started from the middle of the bracket.
+Both count each derivative evaluation as one evaluation (the test functions use ``math``, so f' is a finite
+difference costing two more calls of f).
+
+Run from the repository root:
+    python -m Benchmarks.BracketingEvaluationBenchmark
+"""
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.log_config import get_logger
+
+# Configure logging before any solver module creates its logger, with console output off
+get_logger(__name__, 'OFF')
+
+from Core.Numerical import Numerical  # noqa: E402
+from FindRoots.BracketingMethods.BiSectionMethod import BiSectionMethod  # noqa: E402
+from FindRoots.BracketingMethods.BrentMethod import BrentMethod  # noqa: E402
+from FindRoots.BracketingMethods.FalsePositionMethod import FalsePositionMethod  # noqa: E402
+from FindRoots.BracketingMethods.SafeguardedNewtonMethod import SafeguardedNewtonMethod  # noqa: E402
+from FindRoots.OpenMethods.NewtonRaphsonMethod import NewtonRaphsonMethod  # noqa: E402
+
+# name: (function, a, b, root)
+TEST_SET = {
+    'x^3-2x-5': (lambda x: x ** 3 - 2 * x - 5, 2.0, 3.0, 2.094551481542327),
+    'cos(x)-x': (lambda x: math.cos(x) - x, 0.0, 1.0, 0.7390851332151607),
+    'x exp(-x)-0.1': (lambda x: x * math.exp(-x) - 0.1, 0.0, 1.0, 0.11183255915896297),
+    'sin(x)-x/2': (lambda x: math.sin(x) - x / 2, math.pi / 2, math.pi, 1.895494267033981),
+    'x^2-2': (lambda x: x ** 2 - 2, 0.0, 2.0, math.sqrt(2)),
+    'ln(x)': (lambda x: math.log(x), 0.5, 5.0, 1.0),
+    'x^10-1': (lambda x: x ** 10 - 1, 0.0, 1.3, 1.0),
+    '(x-1)^3': (lambda x: (x - 1) ** 3, 0.0, 3.5, 1.0),
+    'exp(10x)-10': (lambda x: math.exp(10 * x) - 10, 0.0, 1.0, math.log(10) / 10),
+}
+
+SOLVERS = {
+    'bisection': (lambda **kwargs: BiSectionMethod(**kwargs), 'x_root'),
+    'bisection (cached)': (lambda **kwargs: BiSectionMethod(evaluation_cache_size=16, **kwargs), 'x_root'),
+    'false position': (lambda **kwargs: FalsePositionMethod(**kwargs), 'c'),
+    'illinois': (lambda **kwargs: FalsePositionMethod(mode='illinois', **kwargs), 'c'),
+    'pegasus': (lambda **kwargs: FalsePositionMethod(mode='pegasus', **kwargs), 'c'),
+    'anderson-bjorck': (lambda **kwargs: FalsePositionMethod(mode='anderson_bjorck', **kwargs), 'c'),
+    'brent': (lambda **kwargs: BrentMethod(**kwargs), 'x_root'),
+    'newton': (lambda a, b, **kwargs: NewtonRaphsonMethod(x0=(a + b) / 2, **kwargs), 'x'),
+    'safeguarded newton': (lambda **kwargs: SafeguardedNewtonMethod(**kwargs), 'x_root'),
+}
+
+
+def cost_to_root(make_solver: Callable[..., Numerical], estimate: str,
+                 function: Callable, a: float, b: float, root: float,
+                 tolerance: float) -> Optional[Tuple[int, int]]:
+    """Iterations and function evaluations until the estimate is within tolerance of the root, None if that never happens"""
+    solver = make_solver(function=function, a=a, b=b, instrument=True, fast_run=True,
+                         absolute_tolerance=tolerance / 10)
+    # Only the distance to the known root decides when to stop
+    solver.stop_conditions.clear()
+    try:
+        for iteration, state in enumerate(solver.iterate(record=False)):
+            if abs(state[estimate] - root) <= tolerance:
+                return iteration, solver.metrics['total_evaluations']
+    except (ValueError, ZeroDivisionError, ArithmeticError):
+        pass
+    return None
+
+
+def print_table(title: str, costs: Dict[str, Dict[str, Optional[int]]]) -> None:
+    print(f"{title:<16}" + ''.join(f'{name:>20}' for name in SOLVERS))
+    for problem, row in costs.items():
+        print(f'{problem:<16}' + ''.join(f'{row[name] if row[name] is not None else "failed":>20}'
+                                        for name in SOLVERS))
+    totals = {name: sum(row[name] or 0 for row in costs.values()) for name in SOLVERS}
+    solved = {name: sum(row[name] is not None for row in costs.values()) for name in SOLVERS}
+    print(f"{'total (solved)':<16}" + ''.join(f'{totals[name]:>20}' for name in SOLVERS))
+    print(f"{'problems solved':<16}" + ''.join(f'{solved[name]:>20}' for name in SOLVERS))
+    print()
+
+
+def main(tolerance: float = 1e-6, max_iterations: int = 200):
+    iterations: Dict[str, Dict[str, Optional[int]]] = {}
+    evaluations: Dict[str, Dict[str, Optional[int]]] = {}
+    for problem, (function, a, b, root) in TEST_SET.items():
+        iterations[problem], evaluations[problem] = {}, {}
+        for name, (make_solver, estimate) in SOLVERS.items():
+            def make(**kwargs):
+                return make_solver(max_iterations=max_iterations, **kwargs)
+            cost = cost_to_root(make, estimate, function, a, b, root, tolerance)
+            iterations[problem][name], evaluations[problem][name] = cost if cost is not None else (None, None)
+    print_table('iterations', iterations)
+    print_table('evaluations', evaluations)
+
+
+if __name__ == '__main__':
+    main()
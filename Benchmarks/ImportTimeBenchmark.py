@@ -0,0 +1,75 @@
+"""
+Cold import time of the package entry points, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter so nothing is cached between measurements.
+Besides the cumulative import time, the benchmark checks that the heavy optional dependencies
+(plotting, LaTeX, IPython display, sympy, pandas) are not pulled in on import; they are only loaded
+when first used. The exit status is non-zero when a guard fails, so it can run in CI.
+
+Run from the repository root:
+    python -m Benchmarks.ImportTimeBenchmark
+    python -m Benchmarks.ImportTimeBenchmark --max-ms 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    'Core',
+    'FindRoots.BracketingMethods.BiSectionMethod',
+    'ODE.RungeKutta.RungeKutta4',
+    'SolveEquations.LinearEquations',
+]
+
+# Must not be imported as a side effect of importing any of MODULES
+LAZY_DEPENDENCIES = ['pandas', 'matplotlib', 'sympy', 'IPython', 'jinja2']
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import ``module`` in a fresh interpreter and return the cumulative import time [us] of every module loaded"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPOSITORY_ROOT),
+                                                                    os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=REPOSITORY_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{completed.stderr}')
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def check(module: str, max_ms: Optional[float]) -> Tuple[float, List[str]]:
+    """Return the cumulative import time [ms] of ``module`` and the guards it fails"""
+    times = import_times(module)
+    elapsed = times[module] / 1_000
+    failures = [f'{dependency} imported' for dependency in LAZY_DEPENDENCIES if dependency in times]
+    if max_ms is not None and elapsed > max_ms:
+        failures.append(f'{elapsed:.0f} ms > {max_ms:.0f} ms')
+    return elapsed, failures
+
+
+def main(max_ms: Optional[float] = None) -> int:
+    print(f"{'module':<48}{'import [ms]':>12}  status")
+    failed = False
+    for module in MODULES:
+        elapsed, failures = check(module, max_ms)
+        failed = failed or bool(failures)
+        print(f"{module:<48}{elapsed:>12.1f}  {'; '.join(failures) or 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--max-ms', type=float, default=None, help='fail when an import takes longer than this')
+    sys.exit(main(parser.parse_args().max_ms))
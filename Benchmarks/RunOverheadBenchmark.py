@@ -0,0 +1,75 @@
+"""
+Per-iteration overhead of Numerical.run with and without fast_run.
+
+Both modes run under the stock logging configuration (INFO console output through the queue listener),
+written to os.devnull so the benchmark output stays readable. The default mode builds stop condition
+status/reason strings and logs every state, as before fast_run existed; fast_run only evaluates structured
+reason codes. Each timed run includes stop_logging(), so the records still queued by the listener are
+written within the run that produced them. Both modes are warmed up and run alternately, each going
+first in half of the rounds, so neither benefits from running later.
+
+Run from the repository root:
+    python -m Benchmarks.RunOverheadBenchmark
+"""
+import contextlib
+import os
+import time
+from typing import Callable, Dict, Tuple
+
+from utils.log_config import configure_logging, stop_logging
+
+from Core.Numerical import Numerical
+from FindRoots.BracketingMethods.BiSectionMethod import BiSectionMethod
+from ODE.RungeKutta.RungeKutta4 import RungeKutta4
+
+
+def timed_run(make_solver: Callable[[bool], Numerical], fast_run: bool, console) -> Tuple[float, int]:
+    """Return (seconds, iterations) of one run with INFO console logging written to console"""
+    with contextlib.redirect_stdout(console):
+        configure_logging('INFO')
+    solver = make_solver(fast_run)
+    start = time.perf_counter()
+    solver.run()
+    stop_logging()
+    return time.perf_counter() - start, len(solver.history) - 1
+
+
+def time_per_iteration(make_solver: Callable[[bool], Numerical], repeats: int,
+                       warmup: int = 3) -> Tuple[Dict[bool, float], int]:
+    """Return ({fast_run: seconds per iteration}, iterations per run), alternating the order of the modes"""
+    total_time = {False: 0.0, True: 0.0}
+    total_iterations = {False: 0, True: 0}
+    with open(os.devnull, 'w') as console:
+        for _ in range(warmup):
+            for fast_run in (False, True):
+                timed_run(make_solver, fast_run, console)
+        for repeat in range(repeats):
+            for fast_run in ((False, True) if repeat % 2 == 0 else (True, False)):
+                seconds, iterations = timed_run(make_solver, fast_run, console)
+                total_time[fast_run] += seconds
+                total_iterations[fast_run] += iterations
+    configure_logging('OFF')
+    return ({fast_run: total_time[fast_run] / total_iterations[fast_run] for fast_run in total_time},
+            total_iterations[False] // repeats)
+
+
+def bisection(fast_run: bool) -> Numerical:
+    return BiSectionMethod(function=lambda x: x ** 3 - 2 * x - 5, a=2.0, b=3.0, fast_run=fast_run)
+
+
+def runge_kutta4(fast_run: bool) -> Numerical:
+    return RungeKutta4(derivative_function=lambda y, t: -0.5 * y + t,
+                       y0=1.0, t0=0.0, t_final=20.0, h=0.01, fast_run=fast_run)
+
+
+def main(repeats: int = 20):
+    print(f"{'solver':<16}{'iterations':>12}{'default [us/it]':>18}{'fast_run [us/it]':>18}{'speed-up':>10}")
+    for name, make_solver, solver_repeats in [('BiSectionMethod', bisection, repeats * 10),
+                                              ('RungeKutta4', runge_kutta4, max(repeats // 10, 2))]:
+        seconds, iterations = time_per_iteration(make_solver, solver_repeats)
+        default, fast = seconds[False], seconds[True]
+        print(f"{name:<16}{iterations:>12}{default * 1e6:>18.1f}{fast * 1e6:>18.1f}{default / fast:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from Core.Numerical import Numerical
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+
+try:
+    import cloudpickle
+except ImportError:  # optional: only needed to ship lambdas to non-forked workers
+    cloudpickle = None
+
+
+@dataclass
+class RunSummary:
+    """Compact result of a single solver run"""
+    index: int
+    parameters: Dict[str, Any]
+    final_state: Optional[dict] = None
+    iterations: int = 0
+    stop_condition: Optional[str] = None
+    stop_reason: Optional[str] = None
+    error: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    history: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def _run_one(solver_class: Type[Numerical], index: int, parameters: Dict[str, Any],
+             common_kwargs: Dict[str, Any], return_history: bool) -> RunSummary:
+    # Parameters are attached by the parent process, they may hold functions that cannot be sent back
+    summary = RunSummary(index=index, parameters={})
+    try:
+        # Copy so stop conditions passed in common_kwargs are not shared between runs
+        solver = solver_class(**copy.deepcopy(common_kwargs), **parameters)
+        for _ in solver.iterate(record=return_history):
+            pass
+    except Exception as e:
+        summary.error = f'{e.__class__.__name__}: {e}'
+        return summary
+
+    summary.final_state = solver.history.last_state
+    summary.iterations = len(solver.history) - 1
+    summary.metrics = solver.metrics
+    if solver.stopped_by is not None:
+        summary.stop_condition = str(solver.stopped_by)
+        summary.stop_reason = solver.stopped_by.reason
+    if return_history:
+        summary.history = solver.history.to_data_frame.rename(
+            columns={'t': solver.t_label, 'y': solver.y_label})
+    return summary
+
+
+def _attach_parameters(summaries: List[RunSummary], indexed_parameters: List[tuple]) -> List[RunSummary]:
+    for summary in summaries:
+        summary.parameters = indexed_parameters[summary.index][1]
+    return summaries
+
+
+def _run_chunk(solver_class, chunk, common_kwargs, return_history) -> List[RunSummary]:
+    return [_run_one(solver_class, index, parameters, common_kwargs, return_history)
+            for index, parameters in chunk]
+
+
+# Batches handed to forked workers by reference, so lambdas never need to be pickled
+_FORKED_BATCHES: Dict[int, tuple] = {}
+
+
+def _run_forked_chunk(batch_id: int, start: int, stop: int) -> List[RunSummary]:
+    solver_class, indexed_parameters, common_kwargs, return_history = _FORKED_BATCHES[batch_id]
+    return _run_chunk(solver_class, indexed_parameters[start:stop], common_kwargs, return_history)
+
+
+def _run_pickled_chunk(payload: bytes) -> List[RunSummary]:
+    return _run_chunk(*pickle.loads(payload))
+
+
+def run_many(
+        solver_class: Type[Numerical],
+        parameter_sets: Sequence[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        return_history: bool = False,
+        **common_kwargs
+) -> List[RunSummary]:
+    """
+    Run one solver class over many parameter sets in a process pool.
+
+    Each run builds ``solver_class(**common_kwargs, **parameters)`` in a worker process
+    and reports a RunSummary; a run that raises is reported with its error instead of aborting the batch.
+    Runs are sent to workers in chunks to amortize the inter-process overhead.
+
+    Functions such as lambdas cannot be pickled, so on platforms with ``fork`` the batch is
+    inherited by the workers instead of being sent to them. Elsewhere the batch is serialized
+    with ``cloudpickle`` if it is installed, or with ``pickle`` otherwise (module-level functions only).
+    Solver instances never cross process boundaries, only the summaries do.
+
+    :param solver_class: Numerical subclass to run
+    :param parameter_sets: One dict of constructor keyword arguments per run
+    :param max_workers: Number of processes (defaults to the CPU count). 0 or 1 runs serially in-process.
+    :param chunk_size: Runs per task (defaults to about four chunks per worker)
+    :param return_history: Also return each run's full history DataFrame
+    :param common_kwargs: Constructor keyword arguments shared by every run (fast_run defaults to True)
+    :returns: One RunSummary per parameter set, in input order
+    """
+    common_kwargs.setdefault('fast_run', True)
+    indexed_parameters = list(enumerate(dict(parameters) for parameters in parameter_sets))
+    if not indexed_parameters:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        return _attach_parameters(
+            _run_chunk(solver_class, indexed_parameters, common_kwargs, return_history), indexed_parameters)
+
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(indexed_parameters) / (max_workers * 4)))
+    bounds = [(start, min(start + chunk_size, len(indexed_parameters)))
+              for start in range(0, len(indexed_parameters), chunk_size)]
+    max_workers = min(max_workers, len(bounds))
+
+    summaries: List[RunSummary] = []
+    if 'fork' in multiprocessing.get_all_start_methods():
+        batch_id = id(indexed_parameters)
+        _FORKED_BATCHES[batch_id] = (solver_class, indexed_parameters, common_kwargs, return_history)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=multiprocessing.get_context('fork')) as executor:
+                futures = [executor.submit(_run_forked_chunk, batch_id, start, stop) for start, stop in bounds]
+                for future in futures:
+                    summaries.extend(future.result())
+        finally:
+            del _FORKED_BATCHES[batch_id]
+        return _attach_parameters(summaries, indexed_parameters)
+
+    dumps = cloudpickle.dumps if cloudpickle is not None else pickle.dumps
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_run_pickled_chunk,
+                            dumps((solver_class, indexed_parameters[start:stop], common_kwargs, return_history)))
+            for start, stop in bounds
+        ]
+        for future in futures:
+            summaries.extend(future.result())
+    return _attach_parameters(summaries, indexed_parameters)
+
+
+def sweep(
+        solver_class: Type[Numerical],
+        grid: Dict[str, Sequence[Any]],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        return_history: bool = False,
+        **common_kwargs
+) -> List[RunSummary]:
+    """
+    Run a solver over the cartesian product of parameter values, e.g.
+    ``sweep(RungeKutta4, dict(y0=[0, 1], h=[0.1, 0.01]), derivative_function=f, t_final=1)``.
+    See run_many for the remaining arguments.
+    """
+    names = list(grid)
+    parameter_sets = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    return run_many(solver_class, parameter_sets, max_workers=max_workers, chunk_size=chunk_size,
+                    return_history=return_history, **common_kwargs)
+
+
+async def arun_many(solvers: Iterable[Numerical], return_exceptions: bool = False) -> List[pd.DataFrame]:
+    """
+    Run several solver instances concurrently on the running event loop with Numerical.arun().
+
+    This suits solvers whose functions are coroutines (e.g. waiting on an external process):
+    while one solver awaits an evaluation the others keep stepping. CPU-bound functions gain
+    nothing here, use run_many for those. The solvers must not share stop condition instances.
+
+    :param solvers: Configured solver instances
+    :param return_exceptions: Return a failed run's exception in place of its history instead of raising
+    :returns: One history DataFrame per solver, in input order
+    """
+    return list(await asyncio.gather(*(solver.arun() for solver in solvers), return_exceptions=return_exceptions))
+
+
+def summaries_to_data_frame(summaries: Sequence[RunSummary]) -> pd.DataFrame:
+    """One row per run: the parameters, the final state, the iteration count and the stop condition"""
+    return pd.DataFrame([
+        {
+            **summary.parameters,
+            **(summary.final_state or {}),
+            'iterations': summary.iterations,
+            'stop_condition': summary.stop_condition,
+            'error': summary.error,
+        }
+        for summary in summaries
+    ])
@@ -0,0 +1,115 @@
+import os
+import pickle
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from Core.MemoryMappedNumericalHistory import MemoryMappedNumericalHistory
+from Core.NumericalHistory import NumericalHistory
+
+CHECKPOINT_VERSION = 2
+
+
+@dataclass(frozen=True)
+class RowLog:
+    """
+    Append-only file next to a checkpoint (``<path>.rows``) holding the rows of a history without retention
+    policy, and how much of it belongs to the last checkpoint. Each checkpoint only appends the rows recorded
+    since the previous one, so checkpointing a long run costs the new rows rather than the whole history.
+    """
+    path: str
+    rows: int = 0
+    size: int = 0
+
+    @classmethod
+    def next_to(cls, checkpoint_path: str | os.PathLike) -> 'RowLog':
+        return cls(path=f'{os.fspath(checkpoint_path)}.rows')
+
+    def append(self, history: NumericalHistory) -> 'RowLog':
+        """Write the rows recorded after this position, dropping whatever was written past it"""
+        with open(self.path, 'r+b' if self.size else 'wb') as file:
+            file.seek(self.size)
+            file.truncate()
+            if len(history) > self.rows:
+                rows = [history.state(iteration) for iteration in range(self.rows, len(history))]
+                pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+            return RowLog(path=self.path, rows=len(history), size=file.tell())
+
+    def read(self) -> List[dict]:
+        rows = []
+        with open(self.path, 'rb') as file:
+            while file.tell() < self.size:
+                rows.extend(pickle.load(file))
+        return rows
+
+
+@dataclass
+class Checkpoint:
+    """
+    Snapshot of a running solver, enough to continue the run with Numerical.resume().
+
+    Functions and other constructor arguments are not saved: the run is resumed by a solver
+    built with the same arguments. Besides the history, the snapshot holds the iteration counter,
+    the run state of each stop condition and the global NumPy and ``random`` RNG states.
+
+    A history with a retention policy (its retained rows and look-back tail) or a memory-mapped one
+    (a reference to its files) is saved in the snapshot. Otherwise the rows go to the RowLog next to it,
+    which only grows by the rows recorded since the previous checkpoint.
+    """
+    solver: str
+    iteration: int
+    parameters: Set[str]
+    history: Optional[NumericalHistory] = field(default=None, repr=False)
+    row_log: Optional[RowLog] = field(default=None)
+    stop_conditions: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    numpy_random_state: tuple = field(default=None, repr=False)
+    python_random_state: tuple = field(default=None, repr=False)
+    version: int = field(default=CHECKPOINT_VERSION)
+
+    @classmethod
+    def capture(cls, solver, row_log: RowLog) -> 'Checkpoint':
+        """Snapshot the current state of a Numerical solver, appending its new rows to row_log if it uses one"""
+        history = solver.history
+        in_snapshot = history.retention is not None or isinstance(history, MemoryMappedNumericalHistory)
+        return cls(
+            solver=type(solver).__qualname__,
+            iteration=solver.iteration,
+            parameters=set(solver.parameters),
+            history=history if in_snapshot else None,
+            row_log=None if in_snapshot else row_log.append(history),
+            stop_conditions=[stop_cond.run_state() for stop_cond in solver.stop_conditions],
+            numpy_random_state=np.random.get_state(),
+            python_random_state=random.getstate(),
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the checkpoint atomically: a crash while writing leaves the previous checkpoint intact"""
+        path = os.fspath(path)
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> 'Checkpoint':
+        with open(path, 'rb') as file:
+            checkpoint = pickle.load(file)
+        if not isinstance(checkpoint, cls):
+            raise ValueError(f'{path} does not contain a {cls.__name__}')
+        if checkpoint.version != CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version {checkpoint.version}, expected {CHECKPOINT_VERSION}')
+        return checkpoint
+
+    def restore_history(self, empty_history: NumericalHistory) -> NumericalHistory:
+        """The saved history, or empty_history filled with the rows of the row log"""
+        if self.row_log is None:
+            return self.history
+        for row in self.row_log.read():
+            empty_history.record_state(row)
+        return empty_history
+
+    def restore_random_state(self) -> None:
+        np.random.set_state(self.numpy_random_state)
+        random.setstate(self.python_random_state)
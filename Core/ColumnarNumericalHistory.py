@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from Core.NumericalHistory import NumericalHistory
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def _value_dtype(value: Any) -> np.dtype:
+    """Return the column dtype needed to store a single state value"""
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(bool)
+    if isinstance(value, (int, float, complex, np.number)):
+        dtype = np.asarray(value).dtype
+        return dtype if dtype.kind in 'iufc' else np.dtype(object)
+    return np.dtype(object)
+
+
+def _promote(column_dtype: np.dtype, value_dtype: np.dtype) -> np.dtype:
+    """Smallest dtype able to hold both the column values and the new value"""
+    if column_dtype == value_dtype:
+        return column_dtype
+    if object in (column_dtype, value_dtype) or bool in (column_dtype, value_dtype):
+        return np.dtype(object)
+    return np.promote_types(column_dtype, value_dtype)
+
+
+def _missing_value(dtype: np.dtype) -> Any:
+    return np.nan if dtype.kind in 'fc' else None
+
+
+# Python types that can be written into a column of the given kind without promotion
+_DIRECT_TYPES = {
+    'f': (float, int, np.float64, np.float32, np.int64, np.int32),
+    'c': (complex, float, int, np.complex128, np.float64, np.int64),
+    'i': (int, np.int64, np.int32),
+    'b': (bool, np.bool_),
+}
+
+
+class _StateView(Sequence):
+    """Read-only list-of-dicts view over the stored rows of a ColumnarNumericalHistory"""
+
+    def __init__(self, history: 'ColumnarNumericalHistory'):
+        self._history = history
+
+    def __len__(self) -> int:
+        return self._history._stored_count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._history._stored_state(i) for i in range(len(self))[item]]
+        return self._history._stored_state(item)
+
+    def clear(self) -> None:
+        self._history.clear()
+
+
+@dataclass
+class ColumnarNumericalHistory(NumericalHistory):
+    """
+    NumericalHistory backend that stores each state variable in its own NumPy column.
+
+    The column schema is inferred from the first recorded state (the solver's ``initial_state``).
+    Numeric values go into typed columns, anything else (e.g. the ``log`` strings) into an object column.
+    Columns grow by amortized doubling, so recording a state is O(1) and no per-iteration dict is kept.
+    A column is promoted (e.g. int -> float -> object) if a later value does not fit its dtype.
+
+    ``to_data_frame`` wraps the filled part of the columns without copying them;
+    the returned frame is a view that is only guaranteed valid until the history is cleared
+    or compacted by its retention policy.
+    """
+    initial_capacity: int = field(default=64)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.initial_capacity < 1:
+            raise ValueError(f'initial_capacity must be at least 1, got {self.initial_capacity}')
+        if not self._size:
+            # The data setter ran before initial_capacity was assigned
+            self._clear_stored()
+
+    def __getstate__(self) -> dict:
+        # Only the filled part of the columns is pickled (e.g. in checkpoints)
+        state = self.__dict__.copy()
+        capacity = max(self._size, 1)
+        state['_columns'] = {name: column[:capacity].copy() for name, column in self._columns.items()}
+        state['_capacity'] = capacity
+        return state
+
+    @property
+    def data(self) -> _StateView:
+        """List-like view of the recorded states (for compatibility with the list backend)"""
+        return _StateView(self)
+
+    @data.setter
+    def data(self, states: Iterable[dict]) -> None:
+        states = list(states)
+        self._clear_stored()
+        for state in states:
+            self.record_state(state)
+
+    @property
+    def schema(self) -> Dict[str, np.dtype]:
+        """Column name to dtype mapping"""
+        return {name: column.dtype for name, column in self._columns.items()}
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _position(self, position: int) -> int:
+        absolute = position + self._size if position < 0 else position
+        if not 0 <= absolute < self._size:
+            raise IndexError(f'Iteration {position} out of range for history of length {self._size}')
+        return absolute
+
+    def _stored_count(self) -> int:
+        return self._size
+
+    def _stored_state(self, position: int) -> dict:
+        position = self._position(position)
+        return {name: column[position] for name, column in self._columns.items()}
+
+    def _stored_value(self, position: int, item: str) -> Any:
+        return self._columns[item][self._position(position)]
+
+    def _drop_stored(self, keep: List[bool]) -> None:
+        keep = np.asarray(keep, dtype=bool)
+        kept = int(keep.sum())
+        for column in self._columns.values():
+            column[:kept] = column[:self._size][keep]
+        self._size = kept
+
+    def _clear_stored(self) -> None:
+        self._columns: Dict[str, np.ndarray] = {}
+        self._direct_types: Dict[str, tuple] = {}
+        self._size: int = 0
+        self._capacity: int = self.initial_capacity
+
+    def _stored_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: column[:self._size] for name, column in self._columns.items()},
+            copy=False
+        )
+
+    def _add_column(self, name: str, dtype: np.dtype) -> None:
+        if self._size and dtype.kind in 'iub':
+            # Earlier iterations are backfilled as missing, which integer/bool columns cannot hold
+            dtype = np.dtype(float) if dtype.kind in 'iu' else np.dtype(object)
+        column = np.empty(self._capacity, dtype=dtype)
+        if self._size:
+            column[:self._size] = _missing_value(dtype)
+        self._columns[name] = column
+        self._direct_types[name] = _DIRECT_TYPES.get(dtype.kind, ())
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def _retype(self, name: str, dtype: np.dtype) -> np.ndarray:
+        self._columns[name] = self._columns[name].astype(dtype)
+        self._direct_types[name] = _DIRECT_TYPES.get(dtype.kind, ())
+        return self._columns[name]
+
+    def _set(self, name: str, value: Any) -> None:
+        column = self._columns[name]
+        if value is None:
+            if column.dtype.kind in 'iub':
+                column = self._retype(name, np.dtype(float) if column.dtype.kind in 'iu' else np.dtype(object))
+            column[self._size] = _missing_value(column.dtype)
+            return
+
+        dtype = _value_dtype(value)
+        if dtype != column.dtype:
+            new_dtype = _promote(column.dtype, dtype)
+            if new_dtype != column.dtype:
+                column = self._retype(name, new_dtype)
+        column[self._size] = value
+
+    def _store(self, state: dict) -> None:
+        if self._size == self._capacity:
+            self._grow()
+
+        columns, direct_types, size = self._columns, self._direct_types, self._size
+        for name, value in state.items():
+            column = columns.get(name)
+            if column is None:
+                self._add_column(name, np.dtype(float) if value is None else _value_dtype(value))
+            elif column.dtype.kind == 'O' and value is not None or type(value) in direct_types[name]:
+                try:
+                    column[size] = value
+                    continue
+                except OverflowError:
+                    pass
+            self._set(name, value)
+
+        if len(state) < len(self._columns):
+            for name in self._columns.keys() - state.keys():
+                self._set(name, None)
+
+        self._size += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Filled part of a single stored column (a view, not a copy)"""
+        return self._columns[name][:self._size]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
@@ -0,0 +1,109 @@
+import functools
+import inspect
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+
+def impure(function: Callable) -> Callable:
+    """
+    Mark a function as impure (noisy, stateful, time dependent...) so solvers never cache its results,
+    even when an evaluation cache is enabled, e.g. ``BiSectionMethod(function=impure(measure), ...)``.
+    """
+    function.__impure__ = True
+    return function
+
+
+def is_impure(function: Callable) -> bool:
+    return getattr(function, '__impure__', False)
+
+
+def _key(x: Any) -> Any:
+    """Bit-exact cache key of an input: -0.0 and 0.0, or 1, 1.0 and True, are different entries"""
+    if isinstance(x, np.generic):
+        return type(x), x.tobytes()
+    if isinstance(x, float):
+        return float, x.hex()
+    if isinstance(x, complex):
+        return complex, x.real.hex(), x.imag.hex()
+    return type(x), x
+
+
+class CachedFunction:
+    """
+    LRU memoizing wrapper around a user function of a single scalar argument.
+
+    Results are keyed on the exact input, its type and bits (0.0 and -0.0, or 1 and 1.0, are distinct entries),
+    and the least recently used entry is evicted once ``maxsize`` entries are held.
+    Calls that cannot be keyed (arrays, extra arguments)
+    and functions marked with ``impure`` bypass the cache. Awaitable results (coroutine functions)
+    are cached once awaited.
+    """
+
+    def __init__(self, function: Callable, maxsize: int = 1_024):
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got {maxsize}')
+        self.function = function
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._cache: OrderedDict = OrderedDict()
+        functools.update_wrapper(self, function)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        if len(args) != 1 or kwargs or is_impure(self.function):
+            self.bypassed += 1
+            return self.function(*args, **kwargs)
+
+        x = args[0]
+        key = _key(x)
+        try:
+            value = self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable input, e.g. a NumPy array when plotting
+            self.bypassed += 1
+            return self.function(x)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.function(x)
+        if inspect.isawaitable(value):
+            return self._store_when_done(key, value)
+        self._store(key, value)
+        return value
+
+    async def _store_when_done(self, key: Any, awaitable) -> Any:
+        value = await awaitable
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Any, value: Any) -> None:
+        self._cache[key] = value
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Hit/miss statistics since the cache was last cleared"""
+        calls = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            bypassed=self.bypassed,
+            hit_rate=self.hits / calls if calls else 0.0,
+            size=len(self._cache),
+            maxsize=self.maxsize,
+        )
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = self.bypassed = 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.function!r}, maxsize={self.maxsize})'
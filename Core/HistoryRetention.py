@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class HistoryRetention(ABC):
+    """
+    Policy deciding which states a NumericalHistory keeps.
+
+    Besides the retained rows, the history always keeps the last ``look_back`` states in a ring buffer,
+    so stop conditions that look back (e.g. ``history(-2, ...)``) keep working whatever the policy drops.
+    """
+    look_back: int = field(default=10, kw_only=True)
+
+    def __post_init__(self):
+        if self.look_back < 1:
+            raise ValueError(f"look_back must be at least 1, got {self.look_back}")
+
+    @abstractmethod
+    def keep(self, iteration: int) -> bool:
+        """Whether the state recorded at this iteration should be retained"""
+        pass
+
+    def compact(self, iterations: List[int]) -> Optional[List[bool]]:
+        """
+        Called after a row is retained. Return a keep-mask over the retained iterations
+        to drop rows, or None to keep them all.
+        """
+        return None
+
+    def reset(self) -> None:
+        """Forget any state accumulated during a previous run"""
+        pass
+
+
+@dataclass
+class KeepLast(HistoryRetention):
+    """Keep only the last ``n`` states (a ring buffer)"""
+    n: int = field(default=1_000)
+
+    def __post_init__(self):
+        if self.n < 1:
+            raise ValueError(f"n must be at least 1, got {self.n}")
+        self.look_back = self.n
+        super().__post_init__()
+
+    def keep(self, iteration: int) -> bool:
+        # Everything lives in the look-back ring buffer
+        return False
+
+
+@dataclass
+class KeepEvery(HistoryRetention):
+    """
+    Keep every ``k``-th state.
+
+    Whenever more than ``max_rows`` rows are retained, the stride doubles (and every other retained row is
+    dropped), so memory stays bounded for any run length. ``max_rows=None`` keeps every k-th state without bound.
+    """
+    k: int = field(default=10)
+    max_rows: Optional[int] = field(default=10_000)
+    stride: int = field(init=False, default=None)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.k < 1:
+            raise ValueError(f"k must be at least 1, got {self.k}")
+        if self.max_rows is not None and self.max_rows < 2:
+            raise ValueError(f"max_rows must be at least 2, got {self.max_rows}")
+        self.reset()
+
+    def keep(self, iteration: int) -> bool:
+        return iteration % self.stride == 0
+
+    def compact(self, iterations: List[int]) -> Optional[List[bool]]:
+        if self.max_rows is None or len(iterations) <= self.max_rows:
+            return None
+        self.stride *= 2
+        return [iteration % self.stride == 0 for iteration in iterations]
+
+    def reset(self) -> None:
+        self.stride = self.k
+
+
+@dataclass
+class KeepLogSpaced(HistoryRetention):
+    """Keep about ``per_decade`` log-spaced states per decade of iterations (0, 1, 2, ..., 10, 13, 16, ...)"""
+    per_decade: int = field(default=10)
+    _next_kept: int = field(init=False, default=0, repr=False)
+    _exponent: int = field(init=False, default=0, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.per_decade < 1:
+            raise ValueError(f"per_decade must be at least 1, got {self.per_decade}")
+        self.reset()
+
+    def keep(self, iteration: int) -> bool:
+        if iteration < self._next_kept:
+            return False
+        while self._next_kept <= iteration:
+            self._exponent += 1
+            self._next_kept = max(self._next_kept + 1, round(10 ** (self._exponent / self.per_decade)))
+        return True
+
+    def reset(self) -> None:
+        self._next_kept = 0
+        self._exponent = 0
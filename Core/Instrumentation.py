@@ -0,0 +1,79 @@
+import functools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+
+class CountedFunction:
+    """Transparent wrapper around a user function that counts how often it is called"""
+
+    def __init__(self, function: Callable):
+        self.function = function
+        self.calls = 0
+        functools.update_wrapper(self, function)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        self.calls += 1
+        return self.function(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.function!r}, calls={self.calls})'
+
+
+@dataclass
+class SolverMetrics:
+    """
+    Cost of a single run: user function evaluations and the time spent in each phase of the loop.
+    Times are in seconds, measured with time.perf_counter.
+    """
+    counters: Dict[str, CountedFunction] = field(default_factory=dict)
+    iterations: int = 0
+    step_time: float = 0.0
+    stop_check_time: float = 0.0
+    record_time: float = 0.0
+    _counted: Dict[str, int] = field(default_factory=dict, repr=False)
+    _step_started: float = field(default=0.0, repr=False)
+    _pending_stop_check_time: float = field(default=0.0, repr=False)
+
+    @property
+    def evaluations(self) -> Dict[str, int]:
+        return {name: counter.calls for name, counter in self.counters.items()}
+
+    def start_step(self) -> None:
+        self._step_started = time.perf_counter()
+
+    def finish_step(self) -> Dict[str, Any]:
+        """Close the current step and return its history columns"""
+        step_time = time.perf_counter() - self._step_started
+        self.step_time += step_time
+        self.iterations += 1
+        return self.row(step_time)
+
+    def add_stop_check(self, elapsed: float) -> None:
+        self.stop_check_time += elapsed
+        self._pending_stop_check_time += elapsed
+
+    def row(self, step_time: float = float('nan')) -> Dict[str, Any]:
+        """
+        History columns for the row being recorded: the evaluations and the time of the step that produced it,
+        and the time of the stop condition checks that preceded it.
+        """
+        row = {}
+        for name, counter in self.counters.items():
+            row[f'{name}_evals'] = counter.calls - self._counted.get(name, 0)
+            self._counted[name] = counter.calls
+        row['step_time'] = step_time
+        row['stop_check_time'] = self._pending_stop_check_time
+        self._pending_stop_check_time = 0.0
+        return row
+
+    def as_dict(self) -> Dict[str, Any]:
+        evaluations = self.evaluations
+        return {
+            'iterations': self.iterations,
+            **{f'{name}_evaluations': calls for name, calls in evaluations.items()},
+            'total_evaluations': sum(evaluations.values()),
+            'step_time': self.step_time,
+            'stop_check_time': self.stop_check_time,
+            'record_time': self.record_time,
+        }
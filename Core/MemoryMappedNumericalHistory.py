@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import struct
+import tempfile
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from Core.ColumnarNumericalHistory import _StateView, _missing_value, _promote, _value_dtype
+from Core.NumericalHistory import NumericalHistory
+from utils.LaTeXTools import df_to_latex
+from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+
+# Fixed .npy header size, so the header can be rewritten in place as the column grows
+_HEADER_SIZE = 128
+
+# Rows copied at a time when a column file is rewritten or exported
+_CHUNK_ROWS = 65_536
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """A version 1.0 .npy header for a 1-D array, padded to _HEADER_SIZE bytes"""
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (length,)})
+    preamble = np.lib.format.magic(1, 0)
+    header_length = _HEADER_SIZE - len(preamble) - 2
+    return preamble + struct.pack('<H', header_length) + (header.ljust(header_length - 1) + '\n').encode('latin1')
+
+
+class _NpyColumn:
+    """Append-only 1-D .npy file, read through a memory map"""
+
+    def __init__(self, path: str, dtype: np.dtype, length: int = 0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = length
+        self._map: Optional[np.memmap] = None
+        if not length:
+            with open(self.path, 'wb') as file:
+                file.write(_npy_header(self.dtype, 0))
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_map'] = None
+        return state
+
+    def append(self, values: np.ndarray) -> None:
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._map = None
+        with open(self.path, 'r+b') as file:
+            # Written at the logical end, so anything past it (e.g. after resuming a checkpoint) is overwritten
+            file.seek(_HEADER_SIZE + self.length * self.dtype.itemsize)
+            file.write(values.tobytes())
+            file.truncate()
+            self.length += len(values)
+            file.seek(0)
+            file.write(_npy_header(self.dtype, self.length))
+
+    def array(self) -> np.ndarray:
+        """Read-only memory map over the column (nothing is read until it is indexed)"""
+        if not self.length:
+            return np.empty(0, dtype=self.dtype)
+        if self._map is None:
+            self._map = np.memmap(self.path, dtype=self.dtype, mode='r', offset=_HEADER_SIZE, shape=(self.length,))
+        return self._map
+
+    def rewrite(self, dtype: np.dtype, keep: Optional[np.ndarray] = None) -> None:
+        """Rewrite the file chunk by chunk with a new dtype and/or only the rows selected by keep"""
+        old = self.array()
+        temporary = _NpyColumn(f'{self.path}.tmp', dtype)
+        for start in range(0, self.length, _CHUNK_ROWS):
+            block = old[start:start + _CHUNK_ROWS]
+            if keep is not None:
+                block = block[keep[start:start + _CHUNK_ROWS]]
+            temporary.append(block.astype(dtype))
+        del old
+        self._map = None
+        os.replace(temporary.path, self.path)
+        self.dtype, self.length = temporary.dtype, temporary.length
+
+    def remove(self) -> None:
+        self._map = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _ObjectColumn:
+    """
+    Column of arbitrary Python values (e.g. log strings), dictionary-encoded:
+    int32 codes go to disk, only the distinct values are kept in RAM.
+    """
+    dtype = np.dtype(object)
+
+    def __init__(self, path: str, values: Iterable[Any] = ()):
+        self.codes = _NpyColumn(path, np.dtype(np.int32))
+        self.categories: List[Any] = []
+        self._lookup: Dict[Any, int] = {}
+        self._hashable = True
+        self.append(list(values))
+
+    @property
+    def length(self) -> int:
+        return self.codes.length
+
+    def _code(self, value: Any) -> int:
+        if value is None:
+            return -1
+        try:
+            code = self._lookup.get(value)
+        except TypeError:
+            # Unhashable values cannot be deduplicated, each one gets its own code
+            self._hashable = False
+            self.categories.append(value)
+            return len(self.categories) - 1
+        if code is None:
+            code = self._lookup[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def append(self, values: List[Any]) -> None:
+        self.codes.append(np.fromiter((self._code(value) for value in values), dtype=np.int32, count=len(values)))
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        categories = np.empty(len(self.categories) + 1, dtype=object)
+        # Assigned one by one, so that tuple values are not unpacked into a second dimension
+        for code, category in enumerate(self.categories):
+            categories[code] = category
+        categories[-1] = None
+        return categories[np.asarray(codes)]
+
+    def array(self) -> pd.Categorical | np.ndarray:
+        codes = self.codes.array()
+        if self._hashable:
+            try:
+                categories = pd.Index(self.categories, dtype=object, tupleize_cols=False)
+                return pd.Categorical.from_codes(codes, categories=categories)
+            except ValueError:
+                # e.g. NaN among the values, which cannot be a category
+                pass
+        return self.decode(codes)
+
+    def value(self, position: int) -> Any:
+        code = int(self.codes.array()[position])
+        return None if code < 0 else self.categories[code]
+
+    def rewrite(self, dtype: np.dtype, keep: Optional[np.ndarray] = None) -> None:
+        self.codes.rewrite(self.codes.dtype, keep)
+
+    def remove(self) -> None:
+        self.codes.remove()
+
+
+@dataclass
+class MemoryMappedNumericalHistory(NumericalHistory):
+    """
+    NumericalHistory backend for trajectories larger than RAM.
+
+    States are buffered in RAM and every ``buffer_size`` rows appended to one ``.npy`` file per state variable,
+    so the files can also be opened directly with ``np.load(path, mmap_mode='r')``.
+    Non-numeric values (e.g. the ``log`` strings) are dictionary-encoded: the file holds int32 codes,
+    only the distinct values are kept in memory, and the column reads back as a pandas Categorical.
+    The last ``cache_size`` states stay in RAM, so stop conditions looking back a few iterations
+    never touch the disk.
+
+    ``to_data_frame`` wraps read-only memory maps of the columns, and ``to_csv``, ``plot`` and ``to_latex``
+    only read the columns and rows they need. Without a ``directory`` the files go to a temporary
+    directory that is removed when the history is garbage collected; files in a given directory are kept.
+    When pickled (e.g. in a checkpoint) only the buffered rows are flushed and the file paths saved,
+    so give a ``directory`` if the history has to outlive the process.
+    """
+    directory: Optional[str | os.PathLike] = field(default=None)
+    buffer_size: int = field(default=1_024)
+    cache_size: int = field(default=16)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.buffer_size < 1:
+            raise ValueError(f'buffer_size must be at least 1, got {self.buffer_size}')
+        if self.cache_size < 1:
+            raise ValueError(f'cache_size must be at least 1, got {self.cache_size}')
+
+        self._finalizer = None
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='numerical_history_')
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+
+        # The data setter ran before the storage could be set up
+        states = self.__dict__.pop('_initial_states', [])
+        self._clear_stored()
+        for state in states:
+            self.record_state(state)
+
+    def __getstate__(self) -> dict:
+        # Pickled (e.g. in a checkpoint) as a reference to the column files, not their contents
+        self.flush()
+        state = self.__dict__.copy()
+        state['_finalizer'] = None
+        return state
+
+    @property
+    def data(self) -> _StateView:
+        """List-like view of the recorded states (for compatibility with the list backend)"""
+        return _StateView(self)
+
+    @data.setter
+    def data(self, states: Iterable[dict]) -> None:
+        states = list(states)
+        if '_columns' not in self.__dict__:
+            self._initial_states = states
+            return
+        self._clear_stored()
+        for state in states:
+            self.record_state(state)
+
+    @property
+    def columns(self) -> List[str]:
+        self.flush()
+        return list(self._columns)
+
+    def column_path(self, name: str) -> str:
+        """Path of the .npy file holding a column (the int32 codes for non-numeric columns)"""
+        self.flush()
+        column = self._columns[name]
+        return column.codes.path if isinstance(column, _ObjectColumn) else column.path
+
+    def column(self, name: str) -> np.ndarray | pd.Categorical:
+        """A single column, memory-mapped rather than loaded"""
+        self.flush()
+        return self._columns[name].array()
+
+    def flush(self) -> None:
+        """Append the buffered states to the column files"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        names = dict.fromkeys(name for state in pending for name in state)
+        for name in self._columns.keys() - names.keys():
+            names[name] = None
+
+        for name in names:
+            values = [state.get(name) for state in pending]
+            column = self._columns.get(name)
+            dtype = self._block_dtype(values)
+            if column is None:
+                column = self._add_column(name, dtype)
+            elif not isinstance(column, _ObjectColumn):
+                new_dtype = _promote(column.dtype, dtype)
+                if new_dtype.kind == 'O':
+                    column = self._to_object_column(name)
+                elif new_dtype != column.dtype:
+                    column.rewrite(new_dtype)
+            self._append(column, values)
+        self._flushed += len(pending)
+
+    @staticmethod
+    def _block_dtype(values: List[Any]) -> np.dtype:
+        """dtype needed to store a block of values, with None stored as missing"""
+        samples = {}
+        for value in values:
+            samples.setdefault(type(value), value)
+        has_missing = type(None) in samples
+        samples.pop(type(None), None)
+        if not samples:
+            return np.dtype(float)
+        dtype = None
+        for sample in samples.values():
+            value_dtype = _value_dtype(sample)
+            dtype = value_dtype if dtype is None else _promote(dtype, value_dtype)
+        if has_missing and dtype.kind in 'iub':
+            dtype = np.dtype(float) if dtype.kind in 'iu' else np.dtype(object)
+        return dtype
+
+    @staticmethod
+    def _append(column: _NpyColumn | _ObjectColumn, values: List[Any]) -> None:
+        if isinstance(column, _ObjectColumn):
+            column.append(values)
+            return
+        missing = _missing_value(column.dtype)
+        values = [missing if value is None else value for value in values]
+        try:
+            column.append(np.array(values, dtype=column.dtype))
+        except OverflowError:
+            # An int beyond the column's integer type that the sampled values did not reveal
+            column.rewrite(np.dtype(float))
+            column.append(np.array(values, dtype=float))
+
+    def _path(self, name: str) -> str:
+        safe_name = re.sub(r'[^0-9A-Za-z_.-]', '_', name)
+        return os.path.join(os.fspath(self.directory), f'{len(self._columns):03d}_{safe_name}.npy')
+
+    def _add_column(self, name: str, dtype: np.dtype) -> _NpyColumn | _ObjectColumn:
+        if self._flushed and dtype.kind in 'iub':
+            # Earlier rows are backfilled as missing, which integer/bool columns cannot hold
+            dtype = np.dtype(float) if dtype.kind in 'iu' else np.dtype(object)
+        if dtype.kind == 'O':
+            column = _ObjectColumn(self._path(name), [None] * self._flushed)
+        else:
+            column = _NpyColumn(self._path(name), dtype)
+            if self._flushed:
+                column.append(np.full(self._flushed, _missing_value(dtype), dtype=dtype))
+        self._columns[name] = column
+        return column
+
+    def _to_object_column(self, name: str) -> _ObjectColumn:
+        numeric = self._columns[name]
+        column = _ObjectColumn(f'{os.path.splitext(numeric.path)[0]}.codes.npy')
+        array = numeric.array()
+        for start in range(0, numeric.length, _CHUNK_ROWS):
+            column.append(array[start:start + _CHUNK_ROWS].tolist())
+        del array
+        numeric.remove()
+        self._columns[name] = column
+        return column
+
+    def _position(self, position: int) -> int:
+        count = self._stored_count()
+        absolute = position + count if position < 0 else position
+        if not 0 <= absolute < count:
+            raise IndexError(f'Iteration {position} out of range for history of length {count}')
+        return absolute
+
+    def _stored_count(self) -> int:
+        return self._flushed + len(self._pending)
+
+    def _stored_state(self, position: int) -> dict:
+        position = self._position(position)
+        recent_start = self._stored_count() - len(self._recent)
+        if position >= recent_start:
+            return self._recent[position - recent_start]
+        if position >= self._flushed:
+            return self._pending[position - self._flushed]
+        return {name: self._disk_value(column, position) for name, column in self._columns.items()}
+
+    def _stored_value(self, position: int, item: str) -> Any:
+        if position == -1 and self._recent:
+            return self._recent[-1][item]
+        position = self._position(position)
+        if position >= self._flushed:
+            return self._stored_state(position)[item]
+        return self._disk_value(self._columns[item], position)
+
+    @staticmethod
+    def _disk_value(column: _NpyColumn | _ObjectColumn, position: int) -> Any:
+        if isinstance(column, _ObjectColumn):
+            return column.value(position)
+        return column.array()[position]
+
+    def _store(self, state: dict) -> None:
+        self._pending.append(state)
+        self._recent.append(state)
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def _drop_stored(self, keep: List[bool]) -> None:
+        self.flush()
+        keep = np.asarray(keep, dtype=bool)
+        for column in self._columns.values():
+            column.rewrite(column.dtype, keep)
+        self._flushed = int(keep.sum())
+        # Cached states no longer line up with the compacted rows
+        self._recent.clear()
+
+    def _clear_stored(self) -> None:
+        for column in self.__dict__.get('_columns', {}).values():
+            column.remove()
+        self._columns: Dict[str, _NpyColumn | _ObjectColumn] = {}
+        self._flushed: int = 0
+        self._pending: List[dict] = []
+        self._recent: deque = deque(maxlen=self.cache_size)
+
+    def _frame(self, names: Optional[List[str]] = None, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """DataFrame over the flushed rows [start, stop) of the given columns, backed by the memory maps"""
+        names = list(self._columns) if names is None else names
+        stop = self._flushed if stop is None else stop
+        return pd.DataFrame(
+            {name: self._columns[name].array()[start:stop] for name in names},
+            index=pd.RangeIndex(start, stop),
+            copy=False
+        )
+
+    def _stored_frame(self) -> pd.DataFrame:
+        self.flush()
+        return self._frame()
+
+    def to_csv(self, filepath: str):
+        if self.retention is not None or not self._stored_count():
+            return super().to_csv(filepath)
+        self.flush()
+        with open(filepath, 'w', newline='') as file:
+            for start in range(0, self._flushed, _CHUNK_ROWS):
+                self._frame(start=start, stop=min(start + _CHUNK_ROWS, self._flushed)).to_csv(
+                    file, index=False, header=start == 0)
+
+    def to_latex(
+            self,
+            filepath: str,
+            variables: List[str] = None,
+            iterations: List[int] = None,
+            precision: int = 4,
+            caption: str = None,
+            label: str = None,
+            formatting: dict = None,
+            logger = None
+    ):
+        if self.retention is not None:
+            return super().to_latex(filepath, variables, iterations, precision, caption, label, formatting, logger)
+        self.flush()
+        df = self._frame(variables)
+        if iterations is not None:
+            df = df.loc[iterations]
+        df_to_latex(
+            df=df,
+            filepath=filepath,
+            variables=variables,
+            precision=precision,
+            caption=caption,
+            label=label,
+            formatting=formatting,
+            logger=logger
+        )
+
+    def plot(self,
+             x_var: Optional[str],
+             y_var: str,
+             ax: plt.Axes,
+             *args, **kwargs) -> plt.Axes:
+        if self.retention is not None:
+            return super().plot(x_var, y_var, ax, *args, **kwargs)
+        self.flush()
+        for name in (x_var, y_var):
+            if name is not None and name not in self._columns:
+                raise ValueError(f"Variable '{name}' not found in history. "
+                                 f"Available variables: {list(self._columns)}")
+
+        xdata = self._columns[x_var].array() if x_var is not None else np.arange(self._flushed)
+        ax.plot(xdata, self._columns[y_var].array(), *args, **kwargs)
+        return ax
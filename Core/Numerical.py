@@ -1,14 +1,24 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import os
+import time
 import traceback
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Generator, Set,Any, Dict
-
-import pandas as pd
+from typing import List, Generator, AsyncGenerator, Set,Any, Dict, Type, Optional, ClassVar, Tuple
 
+from Core.Checkpoint import Checkpoint, RowLog
+from Core.EvaluationCache import CachedFunction
+from Core.Instrumentation import CountedFunction, SolverMetrics
+from Core.HistoryRetention import HistoryRetention, KeepLast
 from Core.NumericalHistory import NumericalHistory
 from StopConditions.StopConditionBase import StopCondition
 from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
 
 
 @dataclass
@@ -24,11 +34,36 @@ class Numerical(ABC):
     patience: int = field(default=3)
     t_label: str = field(default='t')
     y_label: str = field(default='y')
+    history_backend: Type[NumericalHistory] = field(default=NumericalHistory)
+    history_retention: Optional[HistoryRetention] = field(default=None)
+    fast_run: bool = field(default=False)
+    stopped_by: Optional[StopCondition] = field(default=None, init=False, repr=False)
+    _parameters: Set[str] = field(default=None, init=False, repr=False)
+    checkpoint_path: Optional[str | os.PathLike] = field(default=None)
+    checkpoint_every: Optional[int] = field(default=None)
+    checkpoint_seconds: Optional[float] = field(default=None)
+    _last_checkpoint: float = field(default=0.0, init=False, repr=False)
+    _row_log: Optional[RowLog] = field(default=None, init=False, repr=False)
+    instrument: bool = field(default=False)
+    _metrics: Optional[SolverMetrics] = field(default=None, init=False, repr=False)
+
+    evaluation_cache_size: Optional[int] = field(default=None)
+
+    # User function attributes whose evaluations are counted when instrument=True
+    instrumented_functions: ClassVar[Tuple[str, ...]] = ('function', 'derivative_function')
+    # User function attributes memoized when evaluation_cache_size is set
+    cached_functions: ClassVar[Tuple[str, ...]] = ('function',)
+
+    def __getstate__(self) -> dict:
+        # Loggers are recreated lazily after unpickling
+        state = self.__dict__.copy()
+        state['_logger'] = None
+        return state
 
     @property
     def history(self) -> NumericalHistory:
         if self._history is None:
-            self._history = NumericalHistory(console_log_level=self.console_log_level)
+            self._history = self._new_history()
         return self._history
 
     @history.setter
@@ -50,9 +85,18 @@ class Numerical(ABC):
     # def logger(self, value):
     #     self._logger = value
 
+    def log_enabled(self, level: int = logging.INFO) -> bool:
+        """
+        Whether per-iteration messages at this level should be built at all.
+        Always False in fast_run mode, so the hot loop does no string formatting.
+        """
+        return not self.fast_run and self.logger.isEnabledFor(level)
+
     @property
     def parameters(self) -> Set[str]:
-        return set(self.initial_state.keys())
+        if self._parameters is None:
+            return set(self.initial_state.keys())
+        return self._parameters
 
     @property
     @abstractmethod
@@ -63,18 +107,47 @@ class Numerical(ABC):
         """Add a stop condition to the list of stop conditions"""
         self.stop_conditions.append(stop_condition)
 
-    def initialize(self) -> None:
-        self.history.data.clear()
+    def _new_history(self) -> NumericalHistory:
+        """Create an empty history using the configured backend"""
+        return self.history_backend(console_log_level=self.console_log_level, retention=self.history_retention)
+
+    async def ainitial_state(self) -> dict:
+        """
+        Async counterpart of initial_state, used by arun().
+        Computed in a worker thread by default, so the event loop is not blocked.
+        """
+        return await asyncio.to_thread(lambda: self.initial_state)
+
+    def initialize(self, initial_state: Optional[dict] = None) -> None:
+        self._start_checkpoint_clock()
+        self._row_log = None
+        self.history.clear()
         self._iteration = 0
-        self.record_state(self.initial_state)
-        self.logger.info(f"Initial state:{self.initial_state}")
+        if initial_state is None:
+            initial_state = self.initial_state
+        if self._metrics is not None:
+            initial_state = {**initial_state, **self._metrics.row()}
+        # Cached so record_state does not re-evaluate initial_state on every step
+        self._parameters = set(initial_state.keys())
+        self.record_state(initial_state)
+        for stop_cond in self.stop_conditions:
+            stop_cond.verbose = not self.fast_run
+        self.logger.info(f"Initial state:{initial_state}")
 
     @abstractmethod
     def step(self) -> Dict[str, Any]:
         pass
 
+    async def astep(self) -> Dict[str, Any]:
+        """
+        Async counterpart of step(), used by arun().
+        Runs step() in a worker thread by default, so the event loop is not blocked;
+        solvers whose user functions may be coroutine functions override it to await them.
+        """
+        return await asyncio.to_thread(self.step)
+
     def record_state(self, state: dict) -> None:
-        if set(state.keys()).difference(self.parameters).__len__() != 0:
+        if not self.parameters.issuperset(state.keys()):
             raise ValueError(f'Missing state parameters {set(state.keys()).difference(self.parameters)}'
                              f' in state :\n{state}\n'
                              f'Parameters: {self.parameters}\n'
@@ -82,64 +155,296 @@ class Numerical(ABC):
                              f'initial_state: {self.initial_state}')
         self.history.record_state(state)
 
-    def _check_stop_conditions(self) -> Generator[str, None, None]:
+    def _check_stop_conditions(self, first_iteration: int = 1) -> Generator[str, None, None]:
         """
         Checks if any of the specified stopping conditions are met
-        :yields: Always yields True until a stop condition is met
+        :param first_iteration: Iteration to start counting from (after the last recorded one when resuming)
+        :yields: The iteration status (an empty string when INFO messages are not consumed)
+            until a stop condition is met
         """
-        for iteration in range(1, self.max_iterations+1):
+        self.stopped_by = None
+        for iteration in range(first_iteration, self.max_iterations+1):
             self._iteration = iteration
             if iteration == 0:
                 yield f'Initial Iteration completed'
                 continue
 
+            verbose = self.log_enabled(logging.INFO)
+            should_stop = False
             met_stop_conditions = []
             unmet_stop_conditions = []
+            metrics = self._metrics
+            if metrics is not None:
+                checks_started = time.perf_counter()
             for stop_cond in self.stop_conditions:
-                stop_cond_met, reason = stop_cond.next(self.history)
+                stop_cond_met, _ = stop_cond.check(self.history)
+                if stop_cond_met and not should_stop:
+                    self.stopped_by = stop_cond
+                    should_stop = True
+                if not verbose:
+                    continue
                 condition_name = stop_cond.__str__()
                 if stop_cond_met:
-                    met_stop_conditions.append(  f"Stop condition [{condition_name:<20}] MET    : {reason}")
+                    met_stop_conditions.append(  f"Stop condition [{condition_name:<20}] MET    : {stop_cond.reason}")
                 else:
-                    unmet_stop_conditions.append(f"Stop condition [{condition_name:<20}] NOT met: {reason}")
+                    unmet_stop_conditions.append(f"Stop condition [{condition_name:<20}] NOT met: {stop_cond.reason}")
+            if metrics is not None:
+                metrics.add_stop_check(time.perf_counter() - checks_started)
 
-            status = '\n'.join(met_stop_conditions + unmet_stop_conditions)
-            should_stop = len(unmet_stop_conditions) != len(self.stop_conditions)
+            status = '\n'.join(met_stop_conditions + unmet_stop_conditions) if verbose else ''
             if should_stop:
                 yield status
                 break
-            yield f'Iteration {iteration} completed\n{status}'
+            yield f'Iteration {iteration} completed\n{status}' if verbose else ''
 
         else:
             self.logger.info(f"Stop condition max iterations reached ({self.max_iterations})")
 
-    def run(self) -> pd.DataFrame:
+    def _start(self, record: bool, look_back: int) -> List[bool]:
+        """Set up the history for iterate()/aiterate() and return the stop conditions' record_history flags"""
+        if record:
+            self.history = self._new_history()
+        else:
+            self.history = self.history_backend(console_log_level=self.console_log_level,
+                                                retention=KeepLast(look_back))
+        self.logger.info(f"Starting {self.__class__.__name__}")
+        self._start_evaluation_cache()
+        self._start_instrumentation()
+        return [stop_cond.record_history for stop_cond in self.stop_conditions]
+
+    def _start_evaluation_cache(self) -> None:
+        """Start each run with an empty cache, wrapping the user functions in a CachedFunction the first time"""
+        for name in self.cached_functions:
+            function = getattr(self, name, None)
+            if not callable(function):
+                continue
+            if self.evaluation_cache_size is None:
+                if isinstance(function, CachedFunction):
+                    setattr(self, name, function.function)
+                continue
+            if not isinstance(function, CachedFunction):
+                function = CachedFunction(function, maxsize=self.evaluation_cache_size)
+                setattr(self, name, function)
+            function.maxsize = self.evaluation_cache_size
+            function.cache_clear()
+
+    @property
+    def evaluation_cache_info(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss statistics of the evaluation cache of each cached function during the latest run"""
+        return {name: function.cache_info() for name in self.cached_functions
+                if isinstance(function := getattr(self, name, None), CachedFunction)}
+
+    def _start_instrumentation(self) -> None:
+        """Start fresh metrics, wrapping the user functions in call counters the first time"""
+        if not self.instrument:
+            self._metrics = None
+            return
+        self._metrics = SolverMetrics()
+        for name in self.instrumented_functions:
+            # Count the evaluations behind the evaluation cache, not the cache hits
+            owner, attribute = self, name
+            function = getattr(self, name, None)
+            if isinstance(function, CachedFunction):
+                owner, attribute, function = function, 'function', function.function
+            if not callable(function):
+                continue
+            if not isinstance(function, CountedFunction):
+                function = CountedFunction(function)
+                setattr(owner, attribute, function)
+            function.calls = 0
+            self._metrics.counters[name] = function
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
         """
-        Run the numerical method using a for-loop with the generator method
-        that checks stop conditions using StopIteration.
-        :returns: pd.DataFrame: Complete history of the computation
+        Cost of the latest run when instrument=True (empty otherwise): iterations, evaluations of each
+        user function, and the seconds spent in step(), in stop condition checks and in recording states.
+        The same figures are recorded per iteration in the history as `<function>_evals`, `step_time`
+        and `stop_check_time` columns.
         """
-        self.history = NumericalHistory()
+        return self._metrics.as_dict() if self._metrics is not None else {}
 
-        self.logger.info(f"Starting {self.__class__.__name__}")
+    def _begin_step(self, status: str) -> None:
+        if status:
+            self.logger.info(status)
+        if self.log_enabled(logging.DEBUG):
+            self.logger.debug(f"Starting step {self.iteration}")
+        assert len(self.history) > 0, 'history must be initialized before calling step()'
+        if self._metrics is not None:
+            self._metrics.start_step()
+
+    def _end_step(self, state: Dict[str, Any]) -> None:
+        metrics = self._metrics
+        if metrics is None:
+            self.record_state(state)
+        else:
+            state = {**state, **metrics.finish_step()}
+            recording_started = time.perf_counter()
+            self.record_state(state)
+            metrics.record_time += time.perf_counter() - recording_started
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f"State: \n{state}\n")
+        if self.checkpoint_path is not None and self._checkpoint_due():
+            self.checkpoint()
+
+    def _start_checkpoint_clock(self) -> None:
+        if self.checkpoint_path is not None and self.checkpoint_every is None and self.checkpoint_seconds is None:
+            raise ValueError('checkpoint_path requires checkpoint_every or checkpoint_seconds')
+        self._last_checkpoint = time.monotonic()
+
+    def _checkpoint_due(self) -> bool:
+        if self.checkpoint_every is not None and self.iteration % self.checkpoint_every == 0:
+            return True
+        return (self.checkpoint_seconds is not None
+                and time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds)
+
+    def checkpoint(self, path: Optional[str | os.PathLike] = None) -> None:
+        """
+        Write a Checkpoint of the current run (defaults to checkpoint_path).
+        Called automatically every checkpoint_every iterations and/or checkpoint_seconds seconds.
+        """
+        path = path if path is not None else self.checkpoint_path
+        if path is None:
+            raise ValueError('No checkpoint path given')
+        row_log = RowLog.next_to(path)
+        if self._row_log is not None and self._row_log.path == row_log.path:
+            # Only the rows recorded since the last checkpoint are written
+            row_log = self._row_log
+        checkpoint = Checkpoint.capture(self, row_log)
+        checkpoint.save(path)
+        self._row_log = checkpoint.row_log
+        self._last_checkpoint = time.monotonic()
+        if self.log_enabled(logging.DEBUG):
+            self.logger.debug(f"Checkpoint written to {path} at iteration {self.iteration}")
+
+    def _pause_stop_condition_recording(self, record: bool) -> None:
+        if not record:
+            for stop_cond in self.stop_conditions:
+                stop_cond.record_history = False
+
+    def _restore_stop_condition_recording(self, record_history: List[bool]) -> None:
+        for stop_cond, recorded in zip(self.stop_conditions, record_history):
+            stop_cond.record_history = recorded
+
+    def iterate(self, record: bool = True, look_back: int = 10) -> Generator[Dict[str, Any], None, None]:
+        """
+        Run the numerical method lazily, yielding the initial state and then each new state as it is produced.
+
+        :param record: Record every state in the history (as run() does). With record=False the history
+            only keeps the last `look_back` states, which is all the steps and stop conditions read,
+            and stop condition diagnostics are not recorded, so memory stays flat for any run length.
+        :param look_back: Number of recent states kept when record=False.
+        :yields: Each state dict, starting with the initial state
+        """
+        record_history = self._start(record, look_back)
         self.initialize()
+        yield self.history.last_state
+        yield from self._steps(record, record_history)
 
+    def _steps(self, record: bool, record_history: List[bool],
+               first_iteration: int = 1) -> Generator[Dict[str, Any], None, None]:
         try:
-            for status in self._check_stop_conditions():
-                self.logger.info(f"{status}")
-                self.logger.debug(f"Starting step {self.iteration}")
-                assert len(self.history) > 0, 'history must be initialized before calling step()'
+            self._pause_stop_condition_recording(record)
+            for status in self._check_stop_conditions(first_iteration):
+                self._begin_step(status)
                 state = self.step()
-                self.record_state(state)
-                self.logger.info(f"State: \n{state}\n")
+                self._end_step(state)
+                yield state
         except Exception as e:
             self.logger.error(f"Exception occurred: {e}", exc_info=True)
             # self.logger.error(f"Traceback:\n{traceback.format_exc()}")
             raise e
         finally:
-            df = self.history.to_data_frame
-            df.rename(columns={'t': self.t_label, 'y': self.y_label}, inplace=True)
-            return df
+            self._restore_stop_condition_recording(record_history)
+
+    async def aiterate(self, record: bool = True, look_back: int = 10) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Async counterpart of iterate(): the initial state and every step are produced by
+        ainitial_state() and astep(), so awaitable user functions are awaited instead of blocking the event loop.
+        See iterate() for the arguments.
+        """
+        record_history = self._start(record, look_back)
+        self.initialize(await self.ainitial_state())
+        yield self.history.last_state
+
+        try:
+            self._pause_stop_condition_recording(record)
+            for status in self._check_stop_conditions():
+                self._begin_step(status)
+                state = await self.astep()
+                self._end_step(state)
+                yield state
+        except Exception as e:
+            self.logger.error(f"Exception occurred: {e}", exc_info=True)
+            raise e
+        finally:
+            self._restore_stop_condition_recording(record_history)
+
+    def run(self) -> pd.DataFrame:
+        """
+        Run the numerical method using a for-loop with the generator method
+        that checks stop conditions using StopIteration.
+        :returns: pd.DataFrame: Complete history of the computation
+        """
+        states = self.iterate(record=True)
+        next(states)
+
+        try:
+            for _ in states:
+                pass
+        finally:
+            return self._history_frame()
+
+    def resume(self, path: Optional[str | os.PathLike] = None) -> pd.DataFrame:
+        """
+        Continue a run from a checkpoint (defaults to checkpoint_path) as if it had never been interrupted.
+
+        The solver must be built with the same arguments as the one that wrote the checkpoint,
+        since functions are not saved. History, iteration counter, stop condition state and
+        RNG state are restored, and checkpointing continues as configured on this solver.
+        :returns: pd.DataFrame: Complete history of the computation, as run() would return it
+        """
+        path = path if path is not None else self.checkpoint_path
+        if path is None:
+            raise ValueError('No checkpoint path given')
+        checkpoint = Checkpoint.load(path)
+        if checkpoint.solver != type(self).__qualname__:
+            raise ValueError(f'Checkpoint {path} was written by {checkpoint.solver}, not {type(self).__qualname__}')
+        if len(checkpoint.stop_conditions) != len(self.stop_conditions):
+            raise ValueError(f'Checkpoint {path} has {len(checkpoint.stop_conditions)} stop conditions, '
+                             f'the solver has {len(self.stop_conditions)}')
+
+        self.history = checkpoint.restore_history(self._new_history())
+        self._row_log = checkpoint.row_log
+        self._iteration = checkpoint.iteration
+        self._parameters = set(checkpoint.parameters)
+        for stop_cond, run_state in zip(self.stop_conditions, checkpoint.stop_conditions):
+            stop_cond.restore_run_state(run_state)
+            stop_cond.verbose = not self.fast_run
+        checkpoint.restore_random_state()
+        self._start_checkpoint_clock()
+        self._start_instrumentation()
+        self.logger.info(f"Resuming {self.__class__.__name__} from iteration {checkpoint.iteration}")
+
+        record_history = [stop_cond.record_history for stop_cond in self.stop_conditions]
+        for _ in self._steps(True, record_history, checkpoint.iteration + 1):
+            pass
+        return self._history_frame()
+
+    async def arun(self) -> pd.DataFrame:
+        """
+        Run the numerical method on the running event loop, awaiting user coroutine functions.
+        Many solvers can run concurrently on one loop, e.g. with arun_many() or asyncio.gather.
+        :returns: pd.DataFrame: Complete history of the computation
+        """
+        async for _ in self.aiterate(record=True):
+            pass
+        return self._history_frame()
+
+    def _history_frame(self) -> pd.DataFrame:
+        df = self.history.to_data_frame
+        df.rename(columns={'t': self.t_label, 'y': self.y_label}, inplace=True)
+        return df
 
     @property
     def iteration(self) -> int:
@@ -1,12 +1,18 @@
+from __future__ import annotations
+
 import logging
+from bisect import bisect_left
+from collections import deque
 from dataclasses import field, dataclass
 from typing import List, Any, Optional, Set
 
-import pandas as pd
-from matplotlib import pyplot as plt
-
+from Core.HistoryRetention import HistoryRetention
 from utils.LaTeXTools import df_to_latex
 from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
 
 
 @dataclass
@@ -15,17 +21,81 @@ class NumericalHistory:
     data: List[dict] = field(default_factory=list)
     console_log_level: int|str = field(default='OFF')
     _logger: logging.Logger = field(default=None, init=False)
+    retention: Optional[HistoryRetention] = field(default=None)
+    iterations: List[int] = field(default_factory=list, init=False, repr=False)
+    _recorded: int = field(default=0, init=False, repr=False)
+    _tail: Optional[deque] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.retention is not None:
+            self._tail = deque(maxlen=self.retention.look_back)
 
     def __len__(self):
-        return len(self.data)
+        if self.retention is not None:
+            return self._recorded
+        return self._stored_count()
 
     def __getitem__(self, item) -> Any:
         """Get the last state of an item"""
-        return self.data[-1][item] if self.data else None
+        if self.retention is not None:
+            return self._tail[-1][item] if self._tail else None
+        return self._stored_value(-1, item) if self._stored_count() else None
 
     def __call__(self, iteration: int, item: str) -> Any:
         """Get the state of an item at a given iteration"""
-        return self.data[iteration][item] if self.data else None
+        if self.retention is not None:
+            return self.state(iteration)[item] if self._recorded else None
+        return self._stored_value(iteration, item) if self._stored_count() else None
+
+    def state(self, iteration: int) -> dict:
+        """Get the full state at a given iteration"""
+        if self.retention is None:
+            return self._stored_state(iteration)
+
+        absolute = iteration + self._recorded if iteration < 0 else iteration
+        if not 0 <= absolute < self._recorded:
+            raise IndexError(f'Iteration {iteration} out of range for history of length {self._recorded}')
+
+        tail_offset = absolute - (self._recorded - len(self._tail))
+        if tail_offset >= 0:
+            return self._tail[tail_offset]
+
+        position = bisect_left(self.iterations, absolute)
+        if position < len(self.iterations) and self.iterations[position] == absolute:
+            return self._stored_state(position)
+        raise IndexError(f'Iteration {absolute} was not retained by {self.retention}')
+
+    def clear(self) -> None:
+        """Remove all recorded states"""
+        self._clear_stored()
+        self.iterations.clear()
+        self._recorded = 0
+        if self._tail is not None:
+            self._tail.clear()
+        if self.retention is not None:
+            self.retention.reset()
+
+    # Storage primitives, overridden by other backends
+    def _store(self, state: dict) -> None:
+        self.data.append(state)
+
+    def _stored_count(self) -> int:
+        return len(self.data)
+
+    def _stored_state(self, position: int) -> dict:
+        return self.data[position]
+
+    def _stored_value(self, position: int, item: str) -> Any:
+        return self.data[position][item]
+
+    def _drop_stored(self, keep: List[bool]) -> None:
+        self.data[:] = [state for state, kept in zip(self.data, keep) if kept]
+
+    def _clear_stored(self) -> None:
+        self.data.clear()
+
+    def _stored_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(data=[iteration for iteration in self.data])
 
     @property
     def logger(self):
@@ -40,18 +110,51 @@ class NumericalHistory:
 
     @property
     def last_iteration(self) -> int:
-        return len(self.data) - 1 if self.data else -1
+        return len(self) - 1
 
     @property
     def last_state(self) -> dict:
-        return self.data[-1] if self.data else None
+        return self.state(-1) if len(self) else None
 
     def record_state(self, state: dict) -> None:
-        self.data.append(state)
+        if self.retention is None:
+            self._store(state)
+            return
+
+        iteration = self._recorded
+        self._recorded += 1
+        self._tail.append(state)
+        if not self.retention.keep(iteration):
+            return
+
+        self._store(state)
+        self.iterations.append(iteration)
+        keep = self.retention.compact(self.iterations)
+        if keep is not None:
+            self._drop_stored(keep)
+            self.iterations = [i for i, kept in zip(self.iterations, keep) if kept]
 
     @property
     def to_data_frame(self) -> pd.DataFrame:
-        return pd.DataFrame(data=[iteration for iteration in self.data])
+        """
+        All states as a DataFrame. With a retention policy only the retained states and the
+        look-back tail are included, indexed by the iteration they were recorded at.
+        """
+        if self.retention is None:
+            return self._stored_frame()
+
+        stored = self._stored_frame()
+        stored.index = pd.Index(self.iterations)
+        tail_start = self._recorded - len(self._tail)
+        stored_recent = set(self.iterations[-len(self._tail):])
+        tail_iterations = [i for i in range(tail_start, self._recorded) if i not in stored_recent]
+        if not tail_iterations:
+            return stored
+        tail = pd.DataFrame(
+            data=[self._tail[i - tail_start] for i in tail_iterations],
+            index=pd.Index(tail_iterations)
+        )
+        return tail if stored.empty else pd.concat([stored, tail]).sort_index()
 
     def to_latex(
             self,
@@ -62,7 +165,7 @@ class NumericalHistory:
             caption: str = None,
             label: str = None,
             formatting: dict = None,
-            logger = get_logger(__name__)
+            logger = None
     ):
         df_to_latex(
             df=self.to_data_frame,
@@ -1,9 +1,29 @@
 from Core.NumericalHistory import NumericalHistory
+from Core.ColumnarNumericalHistory import ColumnarNumericalHistory
+from Core.MemoryMappedNumericalHistory import MemoryMappedNumericalHistory
+from Core.HistoryRetention import HistoryRetention, KeepLast, KeepEvery, KeepLogSpaced
 from StopConditions.StopConditionBase import StopCondition
+from Core.Checkpoint import Checkpoint
+from Core.EvaluationCache import CachedFunction, impure
 from Core.Numerical import Numerical
+from Core.BatchRunner import RunSummary, run_many, sweep, arun_many, summaries_to_data_frame
 
 __all__ = [
     'NumericalHistory',
+    'ColumnarNumericalHistory',
+    'MemoryMappedNumericalHistory',
+    'HistoryRetention',
+    'KeepLast',
+    'KeepEvery',
+    'KeepLogSpaced',
     'StopCondition',
-    'Numerical'
+    'Checkpoint',
+    'CachedFunction',
+    'impure',
+    'Numerical',
+    'RunSummary',
+    'run_many',
+    'sweep',
+    'arun_many',
+    'summaries_to_data_frame',
 ]
\ No newline at end of file
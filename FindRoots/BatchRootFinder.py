@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Sequence
+
+import numpy as np
+
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+
+
+class RootStatus(IntEnum):
+    """Outcome of one lane of a batch root finder, stored as small integer codes in BatchRootResult.status"""
+    CONVERGED = 0
+    MAX_ITERATIONS = 1
+    NOT_BRACKETED = 2
+    NAN = 3
+    DIVERGED = 4
+    ZERO_DERIVATIVE = 5
+
+
+@dataclass
+class BatchRootResult:
+    """Per-lane results of a batch root finder, all arrays of the batch shape"""
+    roots: np.ndarray
+    function_values: np.ndarray
+    iterations: np.ndarray
+    evaluations: np.ndarray
+    status: np.ndarray
+
+    @property
+    def converged(self) -> np.ndarray:
+        return self.status == RootStatus.CONVERGED
+
+    def __len__(self) -> int:
+        return self.roots.size
+
+    @property
+    def to_data_frame(self) -> pd.DataFrame:
+        """One row per lane, with the status codes as names"""
+        return pd.DataFrame(dict(
+            root=self.roots.ravel(),
+            f_root=self.function_values.ravel(),
+            iterations=self.iterations.ravel(),
+            evaluations=self.evaluations.ravel(),
+            status=[RootStatus(code).name for code in self.status.ravel()],
+        ))
+
+
+@dataclass
+class BatchRootFinder(ABC):
+    """
+    Finds the roots of many scalar problems at once, one per lane.
+
+    ``function`` is called on whole arrays: ``function(x, *args)`` with ``x`` holding one value per active
+    lane and each of ``args`` the matching per-lane parameters, so it must be written with NumPy operations.
+    Lanes that converge (or fail) drop out and are no longer evaluated.
+    """
+    function: callable = field(default=None)
+    args: Sequence = field(default=())
+    absolute_tolerance: float = 1e-6
+    relative_tolerance: float = 1e-6
+    max_iterations: int = 100
+
+    def _validate(self) -> None:
+        if self.function is None:
+            raise ValueError("Function must be specified")
+        if self.max_iterations < 1:
+            raise ValueError(f'max_iterations must be at least 1, got {self.max_iterations}')
+
+    def _broadcast(self, *arrays, dtype: type = float) -> tuple:
+        """Broadcast the per-lane inputs and the args to the batch shape, as flat ``dtype`` / parameter arrays"""
+        broadcast = np.broadcast_arrays(*(np.asarray(array, dtype=dtype) for array in arrays),
+                                        *(np.asarray(arg) for arg in self.args))
+        shape = broadcast[0].shape
+        flat = [array.ravel() for array in broadcast]
+        return shape, flat[:len(arrays)], flat[len(arrays):]
+
+    def _evaluate(self, x: np.ndarray, args: Sequence[np.ndarray], dtype: type = float) -> np.ndarray:
+        # Overflow and undefined values in some lanes are reported through their status, not as warnings
+        with np.errstate(all='ignore'):
+            return np.asarray(self.function(x, *args), dtype=dtype)
+
+    def _within_tolerance(self, width: np.ndarray, x: np.ndarray) -> np.ndarray:
+        return width <= self.absolute_tolerance + self.relative_tolerance * np.abs(x)
+
+    @abstractmethod
+    def solve(self) -> BatchRootResult:
+        pass
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple, Type
+
+import numpy as np
+
+from Core.BatchRunner import RunSummary, run_many
+from FindRoots.BracketingMethods.BatchBiSectionMethod import BatchBiSectionMethod
+from StopConditions.StopIfNaN import StopIfNaN
+
+
+def _as_array_function(function: Callable, x_min: float, x_max: float) -> Callable:
+    """The function itself if it takes arrays, otherwise a np.vectorize wrapper calling it point by point"""
+    x = np.linspace(x_min, x_max, 3)
+    try:
+        if np.shape(function(x)) == x.shape:
+            return function
+    except (TypeError, ValueError):
+        pass
+    return np.vectorize(function, otypes=[float])
+
+
+def _sign_changes(x: np.ndarray, f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Brackets [x_i, x_i+1] around every sign change, and the grid points where f is exactly zero"""
+    sign = np.sign(f)
+    change = sign[:-1] * sign[1:] < 0
+    brackets = np.column_stack((x[:-1][change], x[1:][change]))
+    return brackets, x[f == 0]
+
+
+def _flat_minima(f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interior local minima of |f| with no sign change around them, as runs [start, stop] of equal values
+    (a single point for a strict minimum) lower than the points on either side. A flat stretch is one candidate,
+    not one per point.
+    """
+    magnitude = np.abs(f)
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(magnitude) != 0) + 1))
+    run_stops = np.concatenate((run_starts[1:], [len(f)])) - 1
+    values = magnitude[run_starts]
+    minimum = np.zeros(len(run_starts), dtype=bool)
+    minimum[1:-1] = (values[1:-1] < values[:-2]) & (values[1:-1] < values[2:]) & (values[1:-1] != 0)
+    starts, stops = run_starts[minimum], run_stops[minimum]
+
+    # Sign changes up to each point: none between the neighbours of the run
+    changes = np.concatenate(([0], np.cumsum(np.sign(f[:-1]) * np.sign(f[1:]) < 0)))
+    same_sign = changes[stops + 1] == changes[starts - 1]
+    return starts[same_sign], stops[same_sign]
+
+
+def _merge_windows(windows: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Union of overlapping [lower, upper] windows, sorted by position"""
+    merged = []
+    for lower, upper in sorted(windows):
+        if merged and lower < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], upper))
+        else:
+            merged.append((lower, upper))
+    return merged
+
+
+def find_brackets(
+        function: Callable,
+        x_min: float,
+        x_max: float,
+        resolution: int = 1_000,
+        refinement: int = 16,
+        max_depth: int = 4,
+        function_tolerance: float = 1e-10,
+        max_refinements: int = 1_000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scan [x_min, x_max] for roots of ``function``.
+
+    The function is evaluated on a grid of ``resolution`` points and every sign change gives a bracket.
+    Roots that a coarse grid misses (a pair of roots within one cell, or a root of even multiplicity that only
+    touches zero) show up as local minima of |f| without a sign change. Around each such minimum (a flat
+    stretch of |f| counts as one) the grid is refined ``refinement``-fold, up to ``max_depth`` times and
+    ``max_refinements`` times in total, looking for sign changes. A minimum that still has none but gets within
+    ``function_tolerance`` of zero is reported as a root.
+
+    :returns: The brackets as an (n, 2) array sorted by position, and the roots already found exactly
+    """
+    if x_min >= x_max:
+        raise ValueError(f'x_min must be smaller than x_max, got [{x_min}, {x_max}]')
+    if resolution < 3:
+        raise ValueError(f'resolution must be at least 3, got {resolution}')
+
+    function = _as_array_function(function, x_min, x_max)
+    brackets, roots = [], []
+    # Intervals still to scan with their grid resolution, and how often they have been refined
+    intervals = [(x_min, x_max, resolution, 0)]
+    refinements = 0
+    while intervals:
+        lower, upper, points, depth = intervals.pop()
+        x = np.linspace(lower, upper, points)
+        f = np.asarray(function(x), dtype=float)
+        interval_brackets, exact_roots = _sign_changes(x, f)
+        brackets.append(interval_brackets)
+        roots.append(exact_roots)
+
+        starts, stops = _flat_minima(f)
+        if depth < max_depth and refinements < max_refinements:
+            windows = _merge_windows([(x[start - 1], x[stop + 1]) for start, stop in zip(starts, stops)])
+            windows = windows[:max_refinements - refinements]
+            refinements += len(windows)
+            intervals.extend((window_lower, window_upper, 2 * refinement + 1, depth + 1)
+                             for window_lower, window_upper in windows)
+        else:
+            middle = (starts + stops) // 2
+            roots.append(x[middle[np.abs(f[middle]) <= function_tolerance]])
+
+    brackets = np.concatenate(brackets) if brackets else np.empty((0, 2))
+    brackets = brackets[np.argsort(brackets[:, 0])]
+    return brackets, np.unique(np.concatenate(roots)) if roots else np.empty(0)
+
+
+def _converged(summary: RunSummary) -> bool:
+    """Whether a run_many solver stopped on one of its convergence conditions, not at max_iterations or on NaN"""
+    return summary.succeeded and summary.stop_condition is not None \
+        and not summary.stop_condition.startswith(StopIfNaN.__name__)
+
+
+def find_roots(
+        function: Callable,
+        x_min: float,
+        x_max: float,
+        resolution: int = 1_000,
+        absolute_tolerance: float = 1e-10,
+        solver_class: Optional[Type] = None,
+        max_workers: Optional[int] = None,
+        **scan_kwargs
+) -> np.ndarray:
+    """
+    Find every root of ``function`` on [x_min, x_max]: scan for brackets with find_brackets, then refine them all.
+
+    By default the brackets are refined together by BatchBiSectionMethod, calling ``function`` on arrays
+    (functions that only take scalars are wrapped with np.vectorize). With ``solver_class`` (e.g. BrentMethod)
+    each bracket is instead solved by its own solver instance in a process pool through run_many, which suits
+    expensive scalar functions. The root is read from the solver's ``root_variable`` (see RootFinder), and
+    only the runs that converged are kept.
+
+    :returns: The sorted roots
+    """
+    if solver_class is None:
+        function = _as_array_function(function, x_min, x_max)
+    brackets, exact_roots = find_brackets(function, x_min, x_max, resolution=resolution, **scan_kwargs)
+    if not len(brackets):
+        return exact_roots
+
+    if solver_class is None:
+        result = BatchBiSectionMethod(function=function, a=brackets[:, 0], b=brackets[:, 1],
+                                      absolute_tolerance=absolute_tolerance, relative_tolerance=0.0,
+                                      max_iterations=200).solve()
+        refined = result.roots[result.converged]
+    else:
+        summaries = run_many(solver_class, [dict(a=a, b=b) for a, b in brackets], max_workers=max_workers,
+                             function=function, absolute_tolerance=absolute_tolerance)
+        refined = np.array([summary.final_state[solver_class.root_variable] for summary in summaries
+                            if _converged(summary)], dtype=float)
+
+    return np.unique(np.concatenate((refined, exact_roots)))
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from FindRoots.BatchRootFinder import BatchRootFinder, BatchRootResult, RootStatus
+
+
+@dataclass
+class BatchBiSectionMethod(BatchRootFinder):
+    """
+    Bisection over arrays of brackets ``[a, b]``, e.g. the root of one parameterized function for many parameters:
+
+        c = np.linspace(1, 100, 10 ** 5)
+        result = BatchBiSectionMethod(function=lambda x, c: x ** 3 - c, a=0.0, b=10.0, args=(c,)).solve()
+
+    ``a``, ``b`` and the args broadcast against each other. A lane has converged when its bracket is narrower than
+    ``absolute_tolerance + relative_tolerance * |x|`` or when ``|f(x)| <= function_tolerance`` (exact zeros only
+    by default). Lanes whose endpoints do not bracket a sign change get status NOT_BRACKETED.
+    """
+    a: np.ndarray = field(default=None)
+    b: np.ndarray = field(default=None)
+    function_tolerance: float = 0.0
+
+    def _validate(self) -> None:
+        super()._validate()
+        if self.a is None:
+            raise ValueError('Initial state must include a')
+        if self.b is None:
+            raise ValueError('Initial state must include b')
+
+    def solve(self) -> BatchRootResult:
+        self._validate()
+        shape, (a, b), args = self._broadcast(self.a, self.b)
+        lower, upper = np.minimum(a, b), np.maximum(a, b)
+        f_lower, f_upper = self._evaluate(lower, args), self._evaluate(upper, args)
+        return self._bisect(shape, lower, upper, f_lower, f_upper, args)
+
+    def _bisect(self, shape, lower, upper, f_lower, f_upper, args) -> BatchRootResult:
+        """Bisect every lane, given the function values at its bracket ends"""
+        lanes = lower.size
+        roots = (lower + upper) / 2
+        function_values = np.full(lanes, np.nan)
+        iterations = np.zeros(lanes, dtype=int)
+        status = np.full(lanes, RootStatus.MAX_ITERATIONS, dtype=np.int8)
+
+        nan = np.isnan(f_lower) | np.isnan(f_upper)
+        status[nan] = RootStatus.NAN
+        status[~nan & (np.sign(f_lower) * np.sign(f_upper) > 0)] = RootStatus.NOT_BRACKETED
+        for x, f in ((upper, f_upper), (lower, f_lower)):
+            exact = ~nan & (np.abs(f) <= self.function_tolerance)
+            roots[exact], function_values[exact], status[exact] = x[exact], f[exact], RootStatus.CONVERGED
+
+        # Compacted state of the lanes still running
+        active = np.flatnonzero(status == RootStatus.MAX_ITERATIONS)
+        lower, upper, f_lower = lower[active], upper[active], f_lower[active]
+        active_args = [arg[active] for arg in args]
+
+        for _ in range(self.max_iterations):
+            if not active.size:
+                break
+            middle = (lower + upper) / 2
+            f_middle = self._evaluate(middle, active_args)
+            iterations[active] += 1
+
+            in_lower_half = np.sign(f_lower) * np.sign(f_middle) < 0
+            upper = np.where(in_lower_half, middle, upper)
+            lower = np.where(in_lower_half, lower, middle)
+            f_lower = np.where(in_lower_half, f_lower, f_middle)
+
+            roots[active], function_values[active] = middle, f_middle
+            nan = np.isnan(f_middle)
+            converged = ~nan & ((np.abs(f_middle) <= self.function_tolerance)
+                                | self._within_tolerance(upper - lower, middle))
+            status[active[nan]] = RootStatus.NAN
+            status[active[converged]] = RootStatus.CONVERGED
+
+            running = ~(nan | converged)
+            if not running.all():
+                active, lower, upper, f_lower = active[running], lower[running], upper[running], f_lower[running]
+                active_args = [arg[running] for arg in active_args]
+
+        # Bracket ends are evaluated once up front, then one midpoint per iteration
+        evaluations = iterations + 2
+        return BatchRootResult(
+            roots=roots.reshape(shape),
+            function_values=function_values.reshape(shape),
+            iterations=iterations.reshape(shape),
+            evaluations=evaluations.reshape(shape),
+            status=status.reshape(shape),
+        )
@@ -1,51 +1,41 @@
+import logging
 from dataclasses import dataclass
 
 from FindRoots.BracketingMethods.BracketingMethods import BracketingMethods
 from StopConditions.StopIfEqual import StopIfZero
-from StopConditions.StopIfNaN import StopIfNaN
+from utils.AsyncTools import evaluate_many
 from utils.ValidationTools import is_nan
-from utils.log_config import get_logger
-
-logger = get_logger(__name__)
 
 
 @dataclass
 class BiSectionMethod(BracketingMethods):
 
     def __post_init__(self) -> None:
+        super().__post_init__()
         self.add_stop_condition(StopIfZero(tracking='f_root', patience=3,
                                            absolute_tolerance=1e-6, relative_tolerance=1e-6))
-        self.add_stop_condition(StopIfZero(tracking='bracket_size', patience=1,
-                                           absolute_tolerance=1e-6, relative_tolerance=1e-6))
-        self.add_stop_condition(StopIfNaN(track_variables=['f_lower', 'f_upper', 'f_root']))
+        self._add_bracket_stop_conditions('f_lower', 'f_upper', 'f_root')
 
     @property
     def initial_state(self) -> dict:
+        return self._bracket_state(*map(self.function, (self.a, (self.b + self.a) / 2.0, self.b)))
+
+    async def ainitial_state(self) -> dict:
+        return self._bracket_state(*await evaluate_many(self.function, (self.a, (self.b + self.a) / 2.0, self.b)))
+
+    def _bracket_state(self, f_lower, f_root, f_upper) -> dict:
+        self._validate_endpoints(f_lower, f_upper)
         return dict(
             x_lower=self.a,
             x_upper=self.b,
             x_root=(self.b + self.a) / 2.0,
-            f_lower=self.function(self.a),
-            f_root=self.function((self.b + self.a) / 2.0),
-            f_upper=self.function(self.b),
+            f_lower=f_lower,
+            f_root=f_root,
+            f_upper=f_upper,
             bracket_size=abs(self.b - self.a),
             log='Initial state'
         )
 
-    def _validate_initial_state(self) -> None:
-        # Validate that function has opposite signs at bounds
-        f_lower = self.function(self.a)
-        f_upper = self.function(self.b)
-
-        if any([is_nan(b) for b in [f_lower, f_upper]]):
-            raise ValueError(f"Function is not defined at bracket endpoints. "
-                             f"f({self.a}) = {f_lower}, f({self.b}) = {f_upper}")
-        elif f_lower * f_upper > 0:
-            raise ValueError(
-                f"Function must have opposite signs at bracket endpoints. "
-                f"f({self.a}) = {f_lower}, f({self.b}) = {f_upper}"
-            )
-
     def step(self) -> dict:
         """
         Perform one iteration of the bisection method.
@@ -63,6 +53,19 @@ class BiSectionMethod(BracketingMethods):
         f_lower = self.function(x_lower)
         f_root = self.function(x_root)
 
+        return self._bisect(x_lower, x_upper, x_root, f_lower, f_upper, f_root)
+
+    async def astep(self) -> dict:
+        """Perform one iteration of the bisection method, evaluating the three points concurrently"""
+        x_upper = self.history['x_upper']
+        x_lower = self.history['x_lower']
+        x_root = self.history['x_root']
+
+        f_lower, f_upper, f_root = await evaluate_many(self.function, (x_lower, x_upper, x_root))
+        return self._bisect(x_lower, x_upper, x_root, f_lower, f_upper, f_root)
+
+    def _bisect(self, x_lower, x_upper, x_root, f_lower, f_upper, f_root) -> dict:
+        """Halve the bracket given the function values at its ends and midpoint"""
         # Check for undefined function values
         for t, f in [(x_lower, f_lower), (x_upper, f_upper), (x_root, f_root)]:
             if is_nan(f):
@@ -90,8 +93,9 @@ class BiSectionMethod(BracketingMethods):
         # Calculate new root approximation
         x_root_new = (x_lower_new + x_upper_new) / 2
         # Log current state
-        logger.info(log)
-        logger.info(f'f({x_root_new:0.3e}) = {f_root:0.3e}')
+        if self.log_enabled(logging.INFO):
+            self.logger.info(log)
+            self.logger.info(f'f({x_root_new:0.3e}) = {f_root:0.3e}')
 
         # Return new state
         return dict(
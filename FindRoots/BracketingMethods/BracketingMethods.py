@@ -1,8 +1,11 @@
 from abc import ABC
 from dataclasses import dataclass, field
-from typing import Tuple
+from typing import ClassVar, Tuple
 
 from FindRoots.RootFinder import RootFinder
+from StopConditions.StopIfEqual import StopIfZero
+from StopConditions.StopIfNaN import StopIfNaN
+from utils.ValidationTools import is_nan
 
 
 @dataclass
@@ -10,15 +13,29 @@ class BracketingMethods(RootFinder, ABC):
     a: float = field(default=None)
     b: float = field(default=None)
 
+    root_variable: ClassVar[str] = 'x_root'
+
+    def __post_init__(self) -> None:
+        if self.a is None:
+            raise ValueError('Initial state must include a')
+        if self.b is None:
+            raise ValueError('Initial state must include b')
+
     @classmethod
     def initial_range(cls, initial_range: Tuple[float,float], *args, **kwargs) -> 'BracketingMethods':
         return cls(b=max(initial_range), a=min(initial_range), *args, **kwargs)
 
-    def _validate_initial_state(self) -> None:
-        super()._validate_initial_state()
-        if self.b is None:
-            raise ValueError('Initial state must include t_upper0')
-        if self.a is None:
-            raise ValueError('Initial state must include t_lower0')
+    def _add_bracket_stop_conditions(self, *nan_variables: str) -> None:
+        """Stop once the bracket is narrower than absolute_tolerance, or when any of nan_variables is NaN"""
+        self.add_stop_condition(StopIfZero(tracking='bracket_size', patience=1,
+                                           absolute_tolerance=self.absolute_tolerance))
+        self.add_stop_condition(StopIfNaN(track_variables=list(nan_variables)))
 
-        self.t_upper, self.t_lower = max(self.b, self.a), min(self.b, self.a)
+    def _validate_endpoints(self, fa, fb) -> None:
+        """Check that f(a) and f(b) are defined and do not have the same sign"""
+        if is_nan(fa) or is_nan(fb):
+            raise ValueError(f"Function is not defined at bracket endpoints. "
+                             f"f({self.a}) = {fa}, f({self.b}) = {fb}")
+        if fa * fb > 0:
+            raise ValueError(f"Function must have opposite signs at bracket endpoints. "
+                             f"f({self.a}) = {fa}, f({self.b}) = {fb}")
@@ -0,0 +1,130 @@
+import logging
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from FindRoots.BracketingMethods.BracketingMethods import BracketingMethods
+from utils.AsyncTools import evaluate, evaluate_many
+from utils.ValidationTools import is_nan
+
+
+@dataclass
+class BrentMethod(BracketingMethods):
+    """
+    Brent's method: inverse quadratic interpolation or secant steps, falling back to bisection whenever the
+    interpolated point leaves the bracket or does not shrink it fast enough.
+
+    The root stays bracketed between ``x_root`` (the best estimate, ``|f_root| <= |f_contra|``) and ``x_contra``,
+    and each iteration costs a single function evaluation. The run stops when the bracket is narrower than
+    ``absolute_tolerance`` or ``f_root`` is exactly zero.
+    """
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._add_bracket_stop_conditions('f_root')
+
+    @property
+    def initial_state(self) -> dict:
+        return self._initial_state(self.function(self.a), self.function(self.b))
+
+    async def ainitial_state(self) -> dict:
+        return self._initial_state(*await evaluate_many(self.function, (self.a, self.b)))
+
+    def _initial_state(self, fa, fb) -> dict:
+        self._validate_endpoints(fa, fb)
+        # Start from b with a as contrapoint, as if the last step went from a to b
+        return self._state(a=self.a, fa=fa, b=self.b, fb=fb, c=self.a, fc=fa,
+                           d=self.b - self.a, e=self.b - self.a, log='Initial state')
+
+    def _tolerance(self, b: float) -> float:
+        """Half the smallest step worth taking around b"""
+        x_tolerance = self.absolute_tolerance + (self.relative_tolerance or 0.0) * abs(b)
+        return 2 * sys.float_info.epsilon * abs(b) + 0.5 * x_tolerance
+
+    def step(self) -> Dict[str, Any]:
+        """
+        Perform one iteration of Brent's method.
+
+        Returns:
+            dict: State variables for current iteration
+        """
+        b, d, e, log = self._propose()
+        return self._update(b, self.function(b), d, e, log)
+
+    async def astep(self) -> Dict[str, Any]:
+        b, d, e, log = self._propose()
+        return self._update(b, await evaluate(self.function, b), d, e, log)
+
+    def _propose(self) -> Tuple[float, float, float, str]:
+        """Next point to evaluate, with the step taken and the step before it"""
+        a, fa = self.history['x_previous'], self.history['f_previous']
+        b, fb = self.history['x_root'], self.history['f_root']
+        c, fc = self.history['x_contra'], self.history['f_contra']
+        d, e = self.history['step'], self.history['previous_step']
+
+        tolerance = self._tolerance(b)
+        middle = 0.5 * (c - b)
+
+        if abs(e) >= tolerance and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * middle * s, 1 - s
+                log = 'Secant step'
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+                log = 'Inverse quadratic interpolation step'
+            if p > 0:
+                q = -q
+            p = abs(p)
+            # Accept the interpolation only if it falls inside the bracket and shrinks the steps fast enough
+            if 2 * p < min(3 * middle * q - abs(tolerance * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = middle
+                log = 'Bisection step (interpolation rejected)'
+        else:
+            d = e = middle
+            log = 'Bisection step'
+
+        b += d if abs(d) > tolerance else math.copysign(tolerance, middle)
+        return b, d, e, log
+
+    def _update(self, b_new, fb_new, d, e, log) -> Dict[str, Any]:
+        """Bracket the root again around the new point and make it the best estimate if it is"""
+        if is_nan(fb_new):
+            raise ValueError(f"The function is not defined at x = {b_new:0.3e}")
+
+        a, fa = self.history['x_root'], self.history['f_root']
+        c, fc = self.history['x_contra'], self.history['f_contra']
+        if fb_new == 0:
+            c, fc = b_new, fb_new
+        elif (fb_new > 0) == (fc > 0):
+            # The old best estimate is now on the other side of the root
+            c, fc = a, fa
+            d = e = b_new - a
+
+        if self.log_enabled(logging.INFO):
+            self.logger.info(log)
+            self.logger.info(f'f({b_new:0.3e}) = {fb_new:0.3e}')
+        return self._state(a=a, fa=fa, b=b_new, fb=fb_new, c=c, fc=fc, d=d, e=e, log=log)
+
+    @staticmethod
+    def _state(a, fa, b, fb, c, fc, d, e, log) -> Dict[str, Any]:
+        if abs(fc) < abs(fb):
+            # Keep the best estimate in b; the previous point follows the old b as in Brent's zeroin
+            a, fa, b, fb, c, fc = b, fb, c, fc, b, fb
+        return dict(
+            x_root=b,
+            f_root=fb,
+            x_contra=c,
+            f_contra=fc,
+            x_previous=a,
+            f_previous=fa,
+            step=d,
+            previous_step=e,
+            bracket_size=abs(c - b),
+            log=log
+        )
@@ -1,63 +1,118 @@
-from functools import partial
-from typing import Dict, Any
-
-import numpy as np
+import logging
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, Any, Tuple
 
 from FindRoots.BracketingMethods.BracketingMethods import BracketingMethods
+from StopConditions.StopIfEqual import StopIfZero
+from utils.AsyncTools import evaluate, evaluate_many
+
+FALSE_POSITION_MODES = ('regula_falsi', 'illinois', 'pegasus', 'anderson_bjorck')
 
 
+@dataclass
 class FalsePositionMethod(BracketingMethods):
+    """
+    Regula falsi: the next point c is where the chord through (a, f(a)) and (b, f(b)) crosses zero.
+
+    b is the latest point and a the end of the bracket on the other side of the root. When the new point lands
+    on the same side as b, a is kept and, except in the plain 'regula_falsi' mode, its stored function value is
+    scaled down so that a cannot stay fixed for long (the cause of linear convergence):
+    'illinois' halves it, 'pegasus' scales it by f(b) / (f(b) + f(c)) and 'anderson_bjorck' by 1 - f(c) / f(b).
+    Function values are kept in the state, so every iteration costs one evaluation.
+    """
+    mode: str = field(default='regula_falsi')
+
+    root_variable: ClassVar[str] = 'c'
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        if self.mode not in FALSE_POSITION_MODES:
+            raise ValueError(f'Unknown mode {self.mode!r}, expected one of {FALSE_POSITION_MODES}')
+        self.add_stop_condition(StopIfZero(tracking='fc', patience=1, absolute_tolerance=self.absolute_tolerance))
+        self._add_bracket_stop_conditions('fa', 'fb', 'fc')
+
     @property
     def initial_state(self) -> dict:
         a, b = self.a, self.b
         fa, fb = self.function(a), self.function(b)
-        c = a - fb * (a - b) / (fa - fb)
+        c = self._first_point(fa, fb)
+        return self._initial_state(a, b, c, fa, fb, self.function(c))
+
+    async def ainitial_state(self) -> dict:
+        a, b = self.a, self.b
+        fa, fb = await evaluate_many(self.function, (a, b))
+        c = self._first_point(fa, fb)
+        return self._initial_state(a, b, c, fa, fb, await evaluate(self.function, c))
+
+    def _first_point(self, fa, fb) -> float:
+        """Root of the chord through the endpoints, once they are known to bracket a root"""
+        self._validate_endpoints(fa, fb)
+        if fa == 0:
+            return self.a
+        if fb == 0:
+            return self.b
+        return self._chord_root(self.a, self.b, fa, fb)
+
+    @staticmethod
+    def _initial_state(a, b, c, fa, fb, fc) -> dict:
         return dict(
             a=a,
             b=b,
             c=c,
             fa=fa,
             fb=fb,
-            fc=self.function(c),
+            fc=fc,
+            bracket_size=abs(b - a),
             log='Initial state'
         )
 
-    def step(self) -> Dict[str, Any]:
-        a = self.history['a']
-        b = self.history['c']
-
-        fa, fb = self.function(a), self.function(b)
+    @staticmethod
+    def _chord_root(a, b, fa, fb) -> float:
+        return a - fa * (a - b) / (fa - fb)
 
-        c = a - fb * (a - b) / (fa - fb)
-        fc = self.function(c)
+    def step(self) -> Dict[str, Any]:
+        a, b, fa, fb, log = self._update_bracket()
+        if a == b:
+            return self._state(a, b, b, fa, fb, fb, log)
+        c = self._chord_root(a, b, fa, fb)
+        return self._state(a, b, c, fa, fb, self.function(c), log)
 
-        self.logger.info(f'f({c:0.3e}) = {fc:0.3e}')
+    async def astep(self) -> Dict[str, Any]:
+        a, b, fa, fb, log = self._update_bracket()
+        if a == b:
+            return self._state(a, b, b, fa, fb, fb, log)
+        c = self._chord_root(a, b, fa, fb)
+        return self._state(a, b, c, fa, fb, await evaluate(self.function, c), log)
 
-        tol_kwargs= dict(b=0.0)
-        if self.absolute_tolerance is not None:
-            tol_kwargs['atol'] = self.absolute_tolerance
-        if self.relative_tolerance is not None:
-            tol_kwargs['rtol'] = self.relative_tolerance
-        is_close = partial(np.isclose, **tol_kwargs)
+    def _update_bracket(self) -> Tuple[float, float, float, float, str]:
+        """Make the last point c the new b, keeping a or the old b on the other side of the root"""
+        a, b, c = self.history['a'], self.history['b'], self.history['c']
+        fa, fb, fc = self.history['fa'], self.history['fb'], self.history['fc']
 
-        if fa * fc < 0:
-            a, b = a, c
-            log = 'Root in [a,c]'
-        elif fb * fc < 0:
-            a, b = c, b
-            log = 'Root in [c,b]'
-        elif is_close(fa):
-            a, b = a, a
-            log = 'Root found at a'
-        elif is_close(fb):
-            a, b = b, b
-            log = 'Root found at b'
-        elif is_close(fc):
-            a, b = c, c
-            log = 'Root found at c'
+        if fc == 0:
+            return c, c, fc, fc, 'Root found at c'
+        if (fc > 0) != (fb > 0):
+            a, fa = b, fb
+            log = 'Root in [b,c]'
         else:
-            raise ValueError("False position method failed to converge")
+            fa *= self._scale(fb, fc)
+            log = 'Root in [a,c]'
+        return a, c, fa, fc, log
+
+    def _scale(self, fb, fc) -> float:
+        """Factor applied to the stored f(a) when a is kept for another iteration"""
+        if self.mode == 'illinois':
+            return 0.5
+        if self.mode == 'pegasus':
+            return fb / (fb + fc)
+        if self.mode == 'anderson_bjorck':
+            m = 1 - fc / fb
+            return m if m > 0 else 0.5
+        return 1.0
 
+    def _state(self, a, b, c, fa, fb, fc, log) -> Dict[str, Any]:
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'f({c:0.3e}) = {fc:0.3e}')
         return dict(
             a=a,
             b=b,
@@ -65,8 +120,6 @@ class FalsePositionMethod(BracketingMethods):
             fa=fa,
             fb=fb,
             fc=fc,
+            bracket_size=abs(b - a),
             log=log
         )
-
-
-
@@ -0,0 +1,130 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+from FindRoots.BracketingMethods.BracketingMethods import BracketingMethods
+from StopConditions.StopIfEqual import StopIfZero
+from utils.AsyncTools import evaluate, evaluate_many
+from utils.DerivativeTools import compile_derivatives
+from utils.ValidationTools import is_nan
+
+
+@dataclass
+class SafeguardedNewtonMethod(BracketingMethods):
+    """
+    Newton-Raphson kept inside a bracket, as rtsafe in Numerical Recipes.
+
+    A Newton step is taken when it lands inside the bracket and is less than half the step before last,
+    otherwise the bracket is bisected. Every new point replaces the end of the bracket with the same sign,
+    so the root stays bracketed: the method converges whenever bisection does, quadratically near simple roots.
+
+    Without ``derivative_function`` f' is compiled from SymPy or approximated numerically as in
+    NewtonRaphsonMethod (see utils.DerivativeTools.compile_derivatives). With instrument=True,
+    ``metrics`` counts the evaluations of the function and of its derivative.
+    """
+    derivative_function: callable = field(default=None)
+    derivative_method: str = field(default='auto')
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        if self.derivative_function is None:
+            (self.function, self.derivative_function), _ = compile_derivatives(
+                self.function, (self.a + self.b) / 2, order=1, method=self.derivative_method)
+        self.add_stop_condition(StopIfZero(tracking='step', patience=1,
+                                           absolute_tolerance=self.absolute_tolerance))
+        self._add_bracket_stop_conditions('f_root', 'df_root')
+
+    @property
+    def initial_state(self) -> dict:
+        fa, fb = self.function(self.a), self.function(self.b)
+        x = self._initial_point(fa, fb)
+        return self._initial_state(fa, fb, x, self.function(x), self.derivative_function(x))
+
+    async def ainitial_state(self) -> dict:
+        fa, fb = await evaluate_many(self.function, (self.a, self.b))
+        x = self._initial_point(fa, fb)
+        return self._initial_state(fa, fb, x, await evaluate(self.function, x),
+                                   await evaluate(self.derivative_function, x))
+
+    def _initial_point(self, fa, fb) -> float:
+        self._validate_endpoints(fa, fb)
+        if fa == 0:
+            return self.a
+        if fb == 0:
+            return self.b
+        return (self.a + self.b) / 2
+
+    def _initial_state(self, fa, fb, x, fx, dfx) -> dict:
+        width = abs(self.b - self.a)
+        state = self._state(self.a, self.b, fa, fb, x, fx, dfx, step=width, previous_step=width,
+                            log='Initial state')
+        return self._update_bracket(state)
+
+    def step(self) -> Dict[str, Any]:
+        """
+        Newton step x_n+1 = x_n - f(x_n)/f'(x_n) if it is safe, bisection of the bracket otherwise.
+
+        Returns:
+            dict: State variables for current iteration
+        """
+        x, step, previous_step, log = self._propose()
+        return self._update(x, self.function(x), self.derivative_function(x), step, previous_step, log)
+
+    async def astep(self) -> Dict[str, Any]:
+        x, step, previous_step, log = self._propose()
+        return self._update(x, await evaluate(self.function, x), await evaluate(self.derivative_function, x),
+                            step, previous_step, log)
+
+    def _propose(self) -> Tuple[float, float, float, str]:
+        """Next point, with the step taken and the step before it"""
+        lower, upper = self.history['x_lower'], self.history['x_upper']
+        x, f, df = self.history['x_root'], self.history['f_root'], self.history['df_root']
+        step = self.history['step']
+
+        # Newton's point must fall inside the bracket: (x - lower) f' - f and (x - upper) f' - f differ in sign
+        outside = ((x - lower) * df - f) * ((x - upper) * df - f) > 0
+        if df == 0 or outside or abs(2 * f) > abs(self.history['previous_step'] * df):
+            new_step = (upper - lower) / 2
+            return lower + new_step, new_step, step, 'Bisection step'
+        new_step = f / df
+        return x - new_step, new_step, step, 'Newton step'
+
+    def _update(self, x, fx, dfx, step, previous_step, log) -> Dict[str, Any]:
+        if is_nan(fx):
+            raise ValueError(f"The function is not defined at x = {x:0.3e}")
+        if self.log_enabled(logging.INFO):
+            self.logger.info(log)
+            self.logger.info(f'f({x:0.3e}) = {fx:0.3e}')
+        state = self._state(self.history['x_lower'], self.history['x_upper'],
+                            self.history['f_lower'], self.history['f_upper'],
+                            x, fx, dfx, step, previous_step, log)
+        return self._update_bracket(state)
+
+    @staticmethod
+    def _update_bracket(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the end of the bracket where f has the sign of f(x_root)"""
+        x, fx = state['x_root'], state['f_root']
+        if fx == 0:
+            state.update(x_lower=x, x_upper=x, f_lower=fx, f_upper=fx)
+        elif (fx > 0) == (state['f_lower'] > 0):
+            state.update(x_lower=x, f_lower=fx)
+        else:
+            state.update(x_upper=x, f_upper=fx)
+        state['bracket_size'] = abs(state['x_upper'] - state['x_lower'])
+        return state
+
+    @staticmethod
+    def _state(lower, upper, f_lower, f_upper, x, fx, dfx, step, previous_step, log) -> Dict[str, Any]:
+        return dict(
+            x_lower=lower,
+            x_upper=upper,
+            f_lower=f_lower,
+            f_upper=f_upper,
+            x_root=x,
+            f_root=fx,
+            df_root=dfx,
+            step=step,
+            previous_step=previous_step,
+            bracket_size=abs(upper - lower),
+            log=log
+        )
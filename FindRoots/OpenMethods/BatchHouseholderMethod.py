@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from FindRoots.BatchRootFinder import BatchRootFinder, BatchRootResult, RootStatus
+from FindRoots.OpenMethods.HouseholderMethod import householder_step
+from utils.DerivativeTools import accepts_complex, compile_fused_derivatives
+
+
+@dataclass
+class BatchHouseholderMethod(BatchRootFinder):
+    """
+    Householder's method of order ``order`` (2 is Halley's, see HouseholderMethod) from an array of starting
+    points ``x0``, updating all the running lanes with array operations.
+
+    ``derivatives_function(x, *args)`` returns [f, f', ..., f^(order)] for all lanes at once. Without it,
+    the fused callable is compiled from SymPy when the function allows it (see utils.DerivativeTools),
+    otherwise the derivatives (up to order 2) are numeric. ``evaluations`` counts fused evaluations.
+
+    Convergence and statuses are those of BatchNewtonRaphsonMethod, except that a small step only counts as
+    convergence when the Newton step f / f' is small too: Halley's step also vanishes at critical points of f.
+    Lanes stop with ZERO_DERIVATIVE when the denominator of the Householder step vanishes or the step is
+    negligible away from a root.
+    """
+    x0: np.ndarray = field(default=None)
+    order: int = field(default=2)
+    derivatives_function: Callable = field(default=None)
+    derivative_method: str = field(default='auto')
+    function_tolerance: float = 0.0
+    divergence_threshold: float = 1e12
+
+    def __post_init__(self) -> None:
+        self._validate()
+        if self.derivatives_function is not None:
+            return
+        sample = float(np.ravel(self.x0)[0]) if np.size(self.x0) else 0.0
+        if not self.args:
+            self.derivatives_function, _ = compile_fused_derivatives(
+                self.function, sample, order=self.order, method=self.derivative_method)
+            return
+
+        # Per-lane parameters: differentiate numerically, with the parameters of the running lanes bound
+        if self.order > 2:
+            raise ValueError(f'Numeric derivatives are only available up to order 2, got order {self.order}. '
+                             f'Pass derivatives_function for higher orders')
+        function = self.function
+        method = self.derivative_method
+        if method in ('auto', 'symbolic'):
+            first_lane = [np.ravel(arg)[0] for arg in self.args]
+            method = 'complex_step' if accepts_complex(lambda x: function(x, *first_lane), sample) \
+                else 'finite_difference'
+        order = self.order
+
+        def derivatives(x, *args):
+            fused, _ = compile_fused_derivatives(lambda x_n: function(x_n, *args), sample, order=order,
+                                                 method=method)
+            return fused(x)
+        self.derivatives_function = derivatives
+
+    def _validate(self) -> None:
+        super()._validate()
+        if self.x0 is None:
+            raise ValueError('Initial state must include x0')
+        if self.order < 1:
+            raise ValueError(f'Order must be at least 1, got {self.order}')
+
+    def _derivatives(self, x: np.ndarray, args) -> np.ndarray:
+        """[f, f', ..., f^(order)] of the lanes as an (order + 1, lanes) array"""
+        with np.errstate(all='ignore'):
+            return np.array(np.broadcast_arrays(*self.derivatives_function(x, *args)), dtype=float)
+
+    def solve(self) -> BatchRootResult:
+        shape, (x,), args = self._broadcast(self.x0)
+        lanes = x.size
+
+        derivatives = self._derivatives(x, args)
+        roots, function_values = x.copy(), derivatives[0].copy()
+        iterations = np.zeros(lanes, dtype=int)
+        evaluations = np.ones(lanes, dtype=int)
+        status = np.full(lanes, RootStatus.MAX_ITERATIONS, dtype=np.int8)
+        status[np.isnan(derivatives).any(axis=0)] = RootStatus.NAN
+        status[np.abs(derivatives[0]) <= self.function_tolerance] = RootStatus.CONVERGED
+
+        # Compacted state of the lanes still running
+        active = np.flatnonzero(status == RootStatus.MAX_ITERATIONS)
+        x, derivatives = x[active], derivatives[:, active]
+        active_args = [arg[active] for arg in args]
+
+        for _ in range(self.max_iterations):
+            if not active.size:
+                break
+            with np.errstate(all='ignore'):
+                step = householder_step(derivatives, self.order)
+            # Lanes where the step is undefined, or vanishes away from a root (Halley at f' = 0), stay put
+            zero_derivative = (~np.isfinite(step) | ((step == 0) & (derivatives[0] != 0))) \
+                & ~np.isnan(derivatives).any(axis=0)
+            step = np.where(zero_derivative, 0.0, step)
+            x = x + step
+            derivatives = self._derivatives(x, active_args)
+            iterations[active] += 1
+            evaluations[active] += 1
+
+            nan = np.isnan(derivatives).any(axis=0) | np.isnan(step)
+            diverged = ~np.isfinite(x) | (np.abs(x) > self.divergence_threshold)
+            with np.errstate(all='ignore'):
+                newton_step = np.where(derivatives[0] == 0, 0.0, np.abs(derivatives[0] / derivatives[1]))
+            small_step = self._within_tolerance(np.abs(step), x)
+            converged = (np.abs(derivatives[0]) <= self.function_tolerance) \
+                | (small_step & self._within_tolerance(newton_step, x))
+            # Stalled away from a root, e.g. Halley's step near a critical point of f
+            zero_derivative |= small_step & ~converged & ~nan
+            roots[active], function_values[active] = x, derivatives[0]
+
+            # Checked in order of precedence, later assignments win
+            status[active[converged]] = RootStatus.CONVERGED
+            status[active[nan]] = RootStatus.NAN
+            status[active[diverged]] = RootStatus.DIVERGED
+            status[active[zero_derivative]] = RootStatus.ZERO_DERIVATIVE
+
+            running = ~(converged | nan | diverged | zero_derivative)
+            if not running.all():
+                active, x, derivatives = active[running], x[running], derivatives[:, running]
+                active_args = [arg[running] for arg in active_args]
+
+        return BatchRootResult(
+            roots=roots.reshape(shape),
+            function_values=function_values.reshape(shape),
+            iterations=iterations.reshape(shape),
+            evaluations=evaluations.reshape(shape),
+            status=status.reshape(shape),
+        )
+
+
+@dataclass
+class BatchHalleyMethod(BatchHouseholderMethod):
+    """Halley's method from an array of starting points, see BatchHouseholderMethod"""
+    order: int = field(default=2, init=False)
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from FindRoots.BatchRootFinder import BatchRootFinder, BatchRootResult, RootStatus
+from FindRoots.OpenMethods.MullerMethod import muller_step
+
+
+@dataclass
+class BatchMullerMethod(BatchRootFinder):
+    """
+    Muller's method (see MullerMethod) from an array of complex starting points ``x0``, e.g. to find the
+    complex zeros of an analytic function from a grid over a region of the plane:
+
+        x0 = (np.linspace(-5, 5, 100)[:, None] + 1j * np.linspace(-5, 5, 100)).ravel()
+        result = BatchMullerMethod(function=lambda z: np.cosh(z) + 1 / z, x0=x0).solve()
+
+    ``function(z, *args)`` is called on complex arrays. The first three points of each lane are x0 - dx,
+    x0 + dx and x0, and ``roots`` and ``function_values`` are complex.
+
+    A lane has converged when its step is below ``absolute_tolerance + relative_tolerance * |x|``
+    or ``|f(x)| <= function_tolerance``. It stops with status ZERO_DERIVATIVE when the parabola through its
+    last three points is a constant, DIVERGED when |x| exceeds ``divergence_threshold`` and NAN on
+    undefined values.
+    """
+    x0: np.ndarray = field(default=None)
+    dx: complex = field(default=0.5)
+    function_tolerance: float = 0.0
+    divergence_threshold: float = 1e12
+
+    def __post_init__(self) -> None:
+        self._validate()
+
+    def _validate(self) -> None:
+        super()._validate()
+        if self.x0 is None:
+            raise ValueError('Initial state must include x0')
+        if self.dx == 0:
+            raise ValueError('dx must be non-zero')
+
+    def solve(self) -> BatchRootResult:
+        shape, (x,), args = self._broadcast(self.x0, dtype=complex)
+        lanes = x.size
+
+        points = [x - self.dx, x + self.dx, x]
+        values = [self._evaluate(point, args, dtype=complex) for point in points]
+        roots, function_values = x.copy(), values[2].copy()
+        iterations = np.zeros(lanes, dtype=int)
+        evaluations = np.full(lanes, 3, dtype=int)
+        status = np.full(lanes, RootStatus.MAX_ITERATIONS, dtype=np.int8)
+        status[np.isnan(np.column_stack(values)).any(axis=1)] = RootStatus.NAN
+        status[np.abs(values[2]) <= self.function_tolerance] = RootStatus.CONVERGED
+
+        # Compacted state of the lanes still running: the last three points and their values
+        active = np.flatnonzero(status == RootStatus.MAX_ITERATIONS)
+        points = [point[active] for point in points]
+        values = [value[active] for value in values]
+        active_args = [arg[active] for arg in args]
+
+        for _ in range(self.max_iterations):
+            if not active.size:
+                break
+            step = np.asarray(muller_step(*points, *values), dtype=complex)
+            degenerate = np.isnan(step) & np.isfinite(values[2])
+            x = points[2] + np.where(degenerate, 0, step)
+            f = self._evaluate(x, active_args, dtype=complex)
+            points, values = [points[1], points[2], x], [values[1], values[2], f]
+            iterations[active] += 1
+            evaluations[active] += 1
+
+            nan = np.isnan(f) | (np.isnan(step) & ~degenerate)
+            diverged = ~np.isfinite(x) | (np.abs(x) > self.divergence_threshold)
+            converged = (np.abs(f) <= self.function_tolerance) | self._within_tolerance(np.abs(step), x)
+            roots[active], function_values[active] = x, f
+
+            # Checked in order of precedence, later assignments win
+            status[active[converged]] = RootStatus.CONVERGED
+            status[active[nan]] = RootStatus.NAN
+            status[active[diverged]] = RootStatus.DIVERGED
+            status[active[degenerate]] = RootStatus.ZERO_DERIVATIVE
+
+            running = ~(converged | nan | diverged | degenerate)
+            if not running.all():
+                active = active[running]
+                points = [point[running] for point in points]
+                values = [value[running] for value in values]
+                active_args = [arg[running] for arg in active_args]
+
+        return BatchRootResult(
+            roots=roots.reshape(shape),
+            function_values=function_values.reshape(shape),
+            iterations=iterations.reshape(shape),
+            evaluations=evaluations.reshape(shape),
+            status=status.reshape(shape),
+        )
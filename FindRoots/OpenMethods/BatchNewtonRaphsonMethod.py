@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from FindRoots.BatchRootFinder import BatchRootFinder, BatchRootResult, RootStatus
+from utils.DerivativeTools import accepts_complex, compile_derivatives, numeric_derivatives
+
+
+@dataclass
+class BatchNewtonRaphsonMethod(BatchRootFinder):
+    """
+    Newton-Raphson from an array of starting points ``x0``, e.g. to map basins of attraction:
+
+        x0 = np.linspace(-3, 3, 10 ** 6)
+        result = BatchNewtonRaphsonMethod(function=lambda x: x ** 3 - 2 * x + 2, x0=x0).solve()
+
+    Every iteration updates all the running lanes with array operations, no history is kept.
+    Without ``derivative_function(x, *args)``, f and f' are compiled from SymPy when the function allows it
+    (see utils.DerivativeTools), otherwise f' is a complex step or central difference.
+
+    A lane has converged when its Newton step is below ``absolute_tolerance + relative_tolerance * |x|``
+    or ``|f(x)| <= function_tolerance``. It stops with status ZERO_DERIVATIVE when f'(x) is zero,
+    DIVERGED when x leaves ``[-divergence_threshold, divergence_threshold]`` and NAN on undefined values.
+    """
+    x0: np.ndarray = field(default=None)
+    derivative_function: Callable = field(default=None)
+    derivative_method: str = field(default='auto')
+    function_tolerance: float = 0.0
+    divergence_threshold: float = 1e12
+
+    def __post_init__(self) -> None:
+        self._validate()
+        if self.derivative_function is not None:
+            return
+        sample = float(np.ravel(self.x0)[0]) if np.size(self.x0) else 0.0
+        if not self.args:
+            (self.function, self.derivative_function), _ = compile_derivatives(
+                self.function, sample, method=self.derivative_method)
+            return
+
+        # Per-lane parameters: differentiate numerically, with the parameters of the running lanes bound
+        function = self.function
+        method = self.derivative_method
+        if method in ('auto', 'symbolic'):
+            first_lane = [np.ravel(arg)[0] for arg in self.args]
+            method = 'complex_step' if accepts_complex(lambda x: function(x, *first_lane), sample) \
+                else 'finite_difference'
+
+        def derivative(x, *args):
+            return numeric_derivatives(lambda x_n: function(x_n, *args), sample, method=method)[0](x)
+        self.derivative_function = derivative
+
+    def _validate(self) -> None:
+        super()._validate()
+        if self.x0 is None:
+            raise ValueError('Initial state must include x0')
+
+    def solve(self) -> BatchRootResult:
+        shape, (x,), args = self._broadcast(self.x0)
+        derivative = self.derivative_function
+        lanes = x.size
+
+        f = self._evaluate(x, args)
+        roots, function_values = x.copy(), f.copy()
+        iterations = np.zeros(lanes, dtype=int)
+        evaluations = np.ones(lanes, dtype=int)
+        status = np.full(lanes, RootStatus.MAX_ITERATIONS, dtype=np.int8)
+        status[np.isnan(f)] = RootStatus.NAN
+        status[np.abs(f) <= self.function_tolerance] = RootStatus.CONVERGED
+
+        # Compacted state of the lanes still running
+        active = np.flatnonzero(status == RootStatus.MAX_ITERATIONS)
+        x, f = x[active], f[active]
+        active_args = [arg[active] for arg in args]
+
+        for _ in range(self.max_iterations):
+            if not active.size:
+                break
+            with np.errstate(all='ignore'):
+                fp = np.asarray(derivative(x, *active_args), dtype=float)
+            # Lanes with a zero derivative stay where it vanished
+            zero_derivative = fp == 0
+            step = f / np.where(zero_derivative, 1.0, fp) * ~zero_derivative
+            x = x - step
+            f = self._evaluate(x, active_args)
+            iterations[active] += 1
+            evaluations[active] += 2
+
+            nan = np.isnan(f) | np.isnan(fp)
+            diverged = ~np.isfinite(x) | (np.abs(x) > self.divergence_threshold)
+            converged = (np.abs(f) <= self.function_tolerance) | self._within_tolerance(np.abs(step), x)
+            roots[active], function_values[active] = x, f
+
+            # Checked in order of precedence, later assignments win
+            status[active[converged]] = RootStatus.CONVERGED
+            status[active[nan]] = RootStatus.NAN
+            status[active[diverged]] = RootStatus.DIVERGED
+            status[active[zero_derivative]] = RootStatus.ZERO_DERIVATIVE
+
+            running = ~(converged | nan | diverged | zero_derivative)
+            if not running.all():
+                active, x, f = active[running], x[running], f[running]
+                active_args = [arg[running] for arg in active_args]
+
+        return BatchRootResult(
+            roots=roots.reshape(shape),
+            function_values=function_values.reshape(shape),
+            iterations=iterations.reshape(shape),
+            evaluations=evaluations.reshape(shape),
+            status=status.reshape(shape),
+        )
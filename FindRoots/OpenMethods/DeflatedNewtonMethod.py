@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import field, dataclass
+from typing import ClassVar, List, Tuple
+
+import numpy as np
+
+from FindRoots.RootFinder import RootFinder
+from StopConditions.StopIfGreaterThan import StopIfGreaterThan
+from StopConditions.StopIfNaN import StopIfNaN
+from utils.DerivativeTools import compile_expression, compile_fused_derivatives
+from utils.ExceptionTools import LogAndReraise
+from utils.ValidationTools import function_arg_count
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
+
+
+@dataclass
+class DeflatedNewtonMethod(RootFinder):
+    """
+    Finds up to ``max_roots`` distinct roots from a single initial guess. Each search is a Newton iteration
+    from x0; once it converges to r, the root is deflated and the search restarts on
+
+        g(x) = f(x) prod_i (|x - r_i|^-p_i + shift)
+
+    which has the same roots as f but the ones already found. The shift keeps g close to f away from the
+    found roots, so the deflated iteration neither blows up nor stalls far from them. The Newton step on g
+    only needs f and f': g / g' = f / (f' + eta f), eta = sum_i -p_i / ((x - r_i) (1 + shift |x - r_i|^p_i)).
+
+    Roots of multiplicity m make Newton converge linearly. With ``estimate_multiplicity`` the multiplicity is
+    estimated as m = f'^2 / (f'^2 - f f'') (exact for (x - r)^m) and the modified update x - m g / g' restores
+    quadratic convergence. Far from a root the estimate means nothing, so it is only applied once two successive
+    iterates agree on it while |f| decreases. A root of multiplicity m is deflated with power
+    p_i = deflation_power * m.
+
+    A search converging to a root already found means its multiplicity was underestimated (e.g. when an
+    iterate lands exactly on it): the multiplicity is raised, by one or to the estimate of this search,
+    and the search restarts.
+    The method stops when ``max_roots`` roots are found, or when a search fails to converge within
+    ``max_search_iterations`` or reaches a non-finite iterate.
+    The roots and their multiplicities are in ``roots`` and ``multiplicities``, in the order they were found.
+    They are carried in the state, so a run resumed from a checkpoint continues with the roots already found.
+    """
+    x0: float = field(default=0)
+    max_roots: int = field(default=10)
+    deflation_power: float = field(default=2.0)
+    deflation_shift: float = field(default=1.0)
+    estimate_multiplicity: bool = field(default=True)
+    max_search_iterations: int = field(default=100)
+    derivative_method: str = field(default='auto')
+    derivatives_function: callable = field(default=None, init=False)
+    function_sym: sympy.Function = field(default=None, init=False)
+
+    # Iterations only call the fused callable, counted as one evaluation of f and its derivatives
+    instrumented_functions: ClassVar[Tuple[str, ...]] = ('function', 'derivatives_function')
+
+    def __post_init__(self) -> None:
+        if function_arg_count(self.function) != 1:
+            raise ValueError(f'Function must take 1 argument, not {function_arg_count(self.function)}')
+        if self.max_roots < 1:
+            raise ValueError(f'max_roots must be at least 1, got {self.max_roots}')
+        if self.deflation_power <= 0 or self.deflation_shift < 0:
+            raise ValueError(f'Deflation needs a positive power and a non-negative shift, '
+                             f'got {self.deflation_power} and {self.deflation_shift}')
+
+        order = 2 if self.estimate_multiplicity else 1
+        with LogAndReraise(
+                logger=self.logger,
+                message=f'The Function must be differentiable {order} times. '
+                        f'Use SymPy functions.'):
+            self.derivatives_function, expressions = compile_fused_derivatives(
+                self.function, self.x0, order=order, method=self.derivative_method)
+        if expressions is not None:
+            self.function_sym = expressions[0]
+            self.function = compile_expression(self.function_sym)
+
+        self.add_stop_condition(StopIfGreaterThan(tracking='roots_found', threshold=self.max_roots,
+                                                  include_equal=True))
+        self.add_stop_condition(StopIfGreaterThan(tracking='search_failed', threshold=0))
+        self.add_stop_condition(StopIfNaN(track_variables=['x']))
+
+    @property
+    def initial_state(self) -> dict:
+        return self._state(self.x0, search_iteration=0, roots=(), multiplicities=(), log='Initial state')
+
+    @property
+    def roots(self) -> List[float]:
+        """Roots found so far, in the order they were found"""
+        return list(self.history['roots'] or ())
+
+    @property
+    def multiplicities(self) -> List[int]:
+        """Multiplicities of the roots found so far"""
+        return list(self.history['multiplicities'] or ())
+
+    def _state(self, x, search_iteration: int, roots: Tuple[float, ...], multiplicities: Tuple[int, ...],
+               search_failed: bool = False, step_multiplicity: int = 1, log: str = '') -> dict:
+        derivatives = self.derivatives_function(x)
+        return dict(
+            x=x,
+            f=derivatives[0],
+            df_dx=derivatives[1],
+            multiplicity=self._multiplicity(derivatives),
+            step_multiplicity=step_multiplicity,
+            roots_found=len(roots),
+            search_iteration=search_iteration,
+            search_failed=search_failed,
+            roots=tuple(roots),
+            multiplicities=tuple(multiplicities),
+            log=log,
+        )
+
+    def _multiplicity(self, derivatives) -> int:
+        """Nearest integer to f'^2 / (f'^2 - f f''), 1 when it is not defined"""
+        if not self.estimate_multiplicity:
+            return 1
+        f, fp, fpp = derivatives
+        if f == 0:
+            # At an exact root, the first non-zero derivative (at least 3 when f' and f'' vanish)
+            return 1 if fp != 0 else 2 if fpp != 0 else 3
+        denominator = fp ** 2 - f * fpp
+        if denominator == 0 or not np.isfinite(denominator):
+            return 1
+        estimate = fp ** 2 / denominator
+        return max(1, int(round(estimate))) if np.isfinite(estimate) else 1
+
+    def _trusted_multiplicity(self, search_iteration: int) -> int:
+        """The multiplicity estimate at x_n, when it matches the one at x_n-1 of the same search and |f| decreased"""
+        m = self.history['multiplicity']
+        if m == 1 or search_iteration < 2:
+            return 1
+        previous = self.history.state(-2)
+        if previous['multiplicity'] == m and abs(self.history['f']) < abs(previous['f']):
+            return m
+        return 1
+
+    def _deflation_rate(self, x: float, roots: Tuple[float, ...], multiplicities: Tuple[int, ...]) -> float:
+        """eta = g'/g - f'/f, the logarithmic derivative of the deflation factor"""
+        eta = 0.0
+        for root, multiplicity in zip(roots, multiplicities):
+            distance = x - root
+            power = self.deflation_power * multiplicity
+            eta -= power / (distance * (1 + self.deflation_shift * abs(distance) ** power))
+        return eta
+
+    def step(self) -> dict:
+        """
+        x_n+1 = x_n - m f / (f' + eta f), restarting from x0 when a root is found
+        """
+        x_n = self.history['x']
+        roots, multiplicities = self.history['roots'], self.history['multiplicities']
+        search_iteration = self.history['search_iteration'] + 1
+        # Only reached by the step taken after a stop condition is met
+        if len(roots) >= self.max_roots or self.history['search_failed']:
+            return self._state(x_n, search_iteration, roots, multiplicities,
+                               search_failed=self.history['search_failed'], log='Stopped')
+
+        f, fp = self.history['f'], self.history['df_dx']
+        m = self._trusted_multiplicity(search_iteration)
+        with np.errstate(all='ignore'):
+            step = m * f / (fp + self._deflation_rate(x_n, roots, multiplicities) * f) if f != 0 else 0.0
+        x_np1 = x_n - step
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'x_root = {x_np1:0.3e}')
+
+        if not np.isfinite(x_np1):
+            return self._state(x_n, search_iteration, roots, multiplicities, search_failed=True,
+                               log='Search diverged')
+        if f != 0 and abs(step) > self.absolute_tolerance + (self.relative_tolerance or 0) * abs(x_np1):
+            failed = search_iteration >= self.max_search_iterations
+            return self._state(x_np1, search_iteration, roots, multiplicities, search_failed=failed,
+                               step_multiplicity=m, log='Search did not converge' if failed else '')
+
+        # Converged: keep the root and restart the search from x0 on the deflated function
+        root = float(x_n if f == 0 else x_np1)
+        if f == 0:
+            # The ratio is undefined at an exact root, also use the multiplicity of the step that led to it
+            m = max(self.history['multiplicity'], self.history['step_multiplicity'])
+        for i, found in enumerate(roots):
+            if abs(root - found) <= self.absolute_tolerance:
+                # Deflating a simple root repels the iteration, so the multiplicity of this one was underestimated
+                multiplicity = max(multiplicities[i] + 1, m)
+                multiplicities = multiplicities[:i] + (multiplicity,) + multiplicities[i + 1:]
+                return self._state(self._restart_point(roots), 0, roots, multiplicities,
+                                   log=f'Root {found} found again, multiplicity {multiplicity}')
+        roots, multiplicities = roots + (root,), multiplicities + (m,)
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'Root {root} of multiplicity {m} found')
+        return self._state(self._restart_point(roots), 0, roots, multiplicities, log=f'Root {root} found')
+
+    def _restart_point(self, roots: Tuple[float, ...]) -> float:
+        """x0, moved aside when it is one of the roots found, where the deflated function is singular"""
+        x = self.x0
+        scale = max(1.0, abs(x))
+        while any(abs(x - root) <= 1e-3 * scale for root in roots):
+            x += 1e-2 * scale
+        return x
@@ -1,14 +1,22 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
 from dataclasses import field, dataclass
 
 import numpy as np
-from matplotlib import pyplot as plt
 
+from Core.NumericalHistory import NumericalHistory
 from FindRoots.RootFinder import RootFinder
 from StopConditions.StopAtPlateau import StopAtPlateau
 from StopConditions.StopIfNaN import StopIfNaN
-from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
+
+
+FIX_POINT_ACCELERATIONS = ('none', 'aitken', 'steffensen', 'anderson')
 
-logger = get_logger(__name__)
 
 @dataclass
 class FixPointMethod(RootFinder):
@@ -16,14 +24,35 @@ class FixPointMethod(RootFinder):
     Represents the Fixed Point Method for finding one root of an equation.
     The function f(x) = 0 = g(t) - x -> g(x) = x.
     x_n+1 = g(x_n)
+
+    Plain iteration converges linearly, ``acceleration`` speeds it up:
+
+    - 'aitken': Aitken's delta-squared extrapolation of the last three plain iterates, one g evaluation per step
+    - 'steffensen': restarts the plain iteration from each extrapolated point, x_n+1 = Aitken(x_n, g(x_n),
+      g(g(x_n))), quadratic convergence for two g evaluations per step
+    - 'anderson': Anderson mixing of the last ``anderson_depth`` iterates, for vector-valued fixed points
+      (x0 an array and g mapping arrays to arrays of the same shape)
+
+    The state records the accelerated iterate x, on which the stop conditions work, the plain iterate x_raw
+    it was computed from and g, the last evaluation of g (g(x_raw) for 'aitken', g(x) otherwise).
+
     :ivar x0: Initial guess for the root in the iteration process.
     :type x0: float
     """
     x0 : float = field(default=None)
+    acceleration: str = field(default='none')
+    anderson_depth: int = field(default=5)
+    # Residuals and g values of the previous iterates, for the history they were read from
+    _anderson_memory: deque = field(default=None, init=False, repr=False)
+    _anderson_source: NumericalHistory = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
         if self.x0 is None:
             raise ValueError("x0 cannot be None")
+        if self.acceleration not in FIX_POINT_ACCELERATIONS:
+            raise ValueError(f'Unknown acceleration {self.acceleration!r}, expected one of {FIX_POINT_ACCELERATIONS}')
+        if self.anderson_depth < 1:
+            raise ValueError(f'anderson_depth must be at least 1, got {self.anderson_depth}')
         self.add_stop_condition(StopAtPlateau(tracking='x', patience=self.patience,
                                               absolute_tolerance=self.absolute_tolerance,
                                               relative_tolerance=self.relative_tolerance))
@@ -31,18 +60,70 @@ class FixPointMethod(RootFinder):
 
     @property
     def initial_state(self) -> dict:
-        return dict(t=self.x0, g=self.function(self.x0))
-
+        x0 = np.asarray(self.x0, dtype=float) if self.acceleration == 'anderson' else self.x0
+        return dict(x=x0, x_raw=x0, g=self.function(x0))
 
     def step(self) -> dict:
         """
         Fixed point iteration with relaxation:
         x_{n+1} = g(x_n)
         """
-        x_old = self.history['x']
-        x_new = self.function(x_old)
-        logger.info(f'x_root = {x_new:0.3e}')
-        return dict(t=x_new, g=self.function(x_new))
+        x, x_raw, g = self.history['x'], self.history['x_raw'], self.history['g']
+        if self.acceleration == 'aitken':
+            x_raw_new = g
+            g_new = self.function(x_raw_new)
+            x_new = _aitken(x_raw, x_raw_new, g_new)
+        elif self.acceleration == 'steffensen':
+            x_raw_new = self.function(g)
+            x_new = _aitken(x, g, x_raw_new)
+            g_new = self.function(x_new)
+        elif self.acceleration == 'anderson':
+            x_raw_new = g
+            x_new = self._anderson_mixing(x, g)
+            g_new = self.function(x_new)
+        else:
+            x_new = x_raw_new = g
+            g_new = self.function(x_new)
+
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'x_root = {x_new}')
+        return dict(x=x_new, x_raw=x_raw_new, g=g_new)
+
+    def _anderson_mixing(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        """
+        g(x_n) - sum_i gamma_i (g(x_i+1) - g(x_i)), with gamma minimizing the residual f = g(x) - x
+        linearly extrapolated over the stored iterates: |f_n - sum_i gamma_i (f_i+1 - f_i)|
+        """
+        g = np.asarray(g, dtype=float)
+        residual = (g - x).ravel()
+        memory = self._anderson_history()
+        memory.append((residual, g.ravel()))
+        if len(memory) < 2:
+            return g
+
+        residuals, values = (np.array(columns).T for columns in zip(*memory))
+        gamma, *_ = np.linalg.lstsq(np.diff(residuals, axis=1), residual, rcond=None)
+        return (g.ravel() - np.diff(values, axis=1) @ gamma).reshape(g.shape)
+
+    def _anderson_history(self) -> deque:
+        """
+        Residuals and g values of the iterates before the last one. Rebuilt from the recorded x and g when the
+        history is not the one they were collected from, at the start of a run or after resume().
+        """
+        if self._anderson_memory is not None and self._anderson_source is self.history:
+            return self._anderson_memory
+
+        memory = deque(maxlen=self.anderson_depth + 1)
+        for iteration in range(-min(self.anderson_depth, len(self.history) - 1) - 1, -1):
+            try:
+                state = self.history.state(iteration)
+            except IndexError:
+                # Older than the look-back of a retention policy
+                continue
+            g = np.asarray(state['g'], dtype=float)
+            memory.append(((g - state['x']).ravel(), g.ravel()))
+        self._anderson_memory, self._anderson_source = memory, self.history
+        return memory
 
     def plot_function(self,
                       x_min: float, x_max: float,
@@ -83,4 +164,12 @@ class FixPointMethod(RootFinder):
             x_current = x_next
 
         plt.legend()
-        return ax
\ No newline at end of file
+        return ax
+
+
+def _aitken(x0, x1, x2):
+    """Aitken's delta-squared extrapolation x2 - (x2 - x1)^2 / (x2 - 2 x1 + x0), x2 where it is undefined"""
+    with np.errstate(all='ignore'):
+        step = np.subtract(x2, x1)
+        curvature = step - np.subtract(x1, x0)
+        return np.where(curvature != 0, x2 - step ** 2 / np.where(curvature != 0, curvature, 1.0), x2)[()]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import field, dataclass
+from math import comb
+from typing import ClassVar, List, Sequence, Tuple
+
+from FindRoots.RootFinder import RootFinder
+from StopConditions.StopIfEqual import StopIfZero
+from StopConditions.StopIfNaN import StopIfNaN
+from utils.DerivativeTools import compile_expression, compile_fused_derivatives
+from utils.ExceptionTools import LogAndReraise
+from utils.ValidationTools import function_arg_count
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
+
+
+def derivative_keys(order: int) -> List[str]:
+    """State keys of f and its derivatives: f, df_dx, d2f_dx2, d3f_dx3..."""
+    return ['f', 'df_dx'][:order + 1] + [f'd{k}f_dx{k}' for k in range(2, order + 1)]
+
+
+def householder_step(derivatives: Sequence, order: int):
+    """
+    Householder step d (1/f)^(d-1) / (1/f)^(d) from [f, f', ..., f^(d)], for floats or arrays.
+
+    With q_k = f^(k+1) (1/f)^(k), differentiating f (1/f) = 1 gives q_0 = 1 and
+    q_n = -sum_k<n C(n, k) q_k f^(n-k-1) f^(n-k), so the step is d f q_(d-1) / q_d without dividing by f.
+    Order 1 is Newton's step -f/f', order 2 Halley's -2 f f' / (2 f'^2 - f f'').
+    """
+    f = derivatives[0]
+    q = [1.0]
+    for n in range(1, order + 1):
+        q.append(-sum(comb(n, k) * q[k] * f ** (n - k - 1) * derivatives[n - k] for k in range(n)))
+    return order * f * q[order - 1] / q[order]
+
+
+@dataclass
+class HouseholderMethod(RootFinder):
+    """
+    Householder's method of order d: x_n+1 = x_n + d (1/f)^(d-1)(x_n) / (1/f)^(d)(x_n), converging with
+    order d + 1 to simple roots. Order 1 is Newton-Raphson and order 2 Halley's method.
+
+    f and its first d derivatives come from one fused callable (see compile_fused_derivatives in
+    utils.DerivativeTools): SymPy-compatible functions are differentiated once and compiled with shared
+    subexpressions, so each iteration does a single evaluation. Other functions get numeric derivatives,
+    available up to order 2.
+    For many starting points at once, see BatchHouseholderMethod.
+    """
+    x0: float = field(default=0)
+    order: int = field(default=2)
+    derivative_method: str = field(default='auto')
+    derivatives_function: callable = field(default=None, init=False)
+    function_sym: sympy.Function = field(default=None, init=False)
+    derivative_syms: List[sympy.Function] = field(default=None, init=False)
+
+    # Iterations only call the fused callable, counted as one evaluation of f and its derivatives
+    instrumented_functions: ClassVar[Tuple[str, ...]] = ('function', 'derivatives_function')
+
+    def __post_init__(self) -> None:
+        if function_arg_count(self.function) != 1:
+            raise ValueError(f'Function must take 1 argument, not {function_arg_count(self.function)}')
+        if self.order < 1:
+            raise ValueError(f'Order must be at least 1, got {self.order}')
+
+        with LogAndReraise(
+                logger=self.logger,
+                message=f'The Function must be differentiable {self.order} times. '
+                        f'Use SymPy functions.'):
+            self.derivatives_function, expressions = compile_fused_derivatives(
+                self.function, self.x0, order=self.order, method=self.derivative_method)
+        if expressions is not None:
+            self.function_sym, *self.derivative_syms = expressions
+            self.function = compile_expression(self.function_sym)
+            self.logger.info(f'f(x) = {self.function_sym}')
+
+        self.add_stop_condition(StopIfZero(tracking='f', patience=self.patience,
+                                           absolute_tolerance=self.absolute_tolerance,
+                                           relative_tolerance=self.relative_tolerance))
+        self.add_stop_condition(StopIfNaN(track_variables=['x', *derivative_keys(self.order)]))
+
+    @property
+    def initial_state(self) -> dict:
+        return self._state(self.x0)
+
+    def _state(self, x) -> dict:
+        return dict(x=x, **dict(zip(derivative_keys(self.order), self.derivatives_function(x))))
+
+    def step(self) -> dict:
+        """
+        x_n+1 = x_n + d (1/f)^(d-1)(x_n) / (1/f)^(d)(x_n)
+        """
+        x_n = self.history['x']
+        derivatives = [self.history[key] for key in derivative_keys(self.order)]
+        x_np1 = x_n + householder_step(derivatives, self.order)
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'x_root = {x_np1:0.3e}')
+        return self._state(x_np1)
+
+
+@dataclass
+class HalleyMethod(HouseholderMethod):
+    """
+    Halley's method x_n+1 = x_n - 2 f f' / (2 f'^2 - f f''), cubically convergent to simple roots,
+    with f, f' and f'' from one fused evaluation per iteration (see HouseholderMethod).
+    """
+    order: int = field(default=2, init=False)
@@ -3,6 +3,7 @@ from typing import Dict, Any
 
 from FindRoots.RootFinder import RootFinder
 from StopConditions.StopIfNaN import StopIfNaN
+from utils.AsyncTools import evaluate
 
 
 @dataclass
@@ -26,6 +27,12 @@ class ModifiedSecantMethod(RootFinder):
             f=self.function(self.x0)
         )
 
+    async def ainitial_state(self) -> dict:
+        return dict(
+            x=self.x0,
+            f=await evaluate(self.function, self.x0)
+        )
+
     def step(self) -> Dict[str, Any]:
         """
         x_{n+1} = x_n -\frac{h * f(x_n)}{f(x_n) - f(x_n-h)}}
@@ -41,4 +48,16 @@ class ModifiedSecantMethod(RootFinder):
         return dict(
             x=x_np1,
             f=f_np1
-        )
\ No newline at end of file
+        )
+
+    async def astep(self) -> Dict[str, Any]:
+        x_n = self.history['x']
+        f_n = self.history['f']
+
+        x_np1 = x_n - self.h * f_n / (f_n - await evaluate(self.function, x_n - self.h))
+        f_np1 = await evaluate(self.function, x_np1)
+
+        return dict(
+            x=x_np1,
+            f=f_np1
+        )
@@ -0,0 +1,87 @@
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from FindRoots.RootFinder import RootFinder
+from StopConditions.StopIfEqual import StopIfZero
+from StopConditions.StopIfNaN import StopIfNaN
+
+
+def muller_step(x0, x1, x2, f0, f1, f2):
+    """
+    Step from x2 to the root of the parabola through (x0, f0), (x1, f1), (x2, f2) closest to x2, in complex
+    arithmetic, for scalars or arrays. Zero where f2 = 0, NaN where the parabola is degenerate (a constant).
+    """
+    with np.errstate(all='ignore'):
+        h1, h2 = x1 - x0, x2 - x1
+        d1, d2 = (f1 - f0) / h1, (f2 - f1) / h2
+        a = (d2 - d1) / (h1 + h2)
+        b = a * h2 + d2
+        discriminant = np.sqrt(b * b - 4 * a * f2 + 0j)
+        # The larger denominator gives the root closer to x2, without cancellation
+        denominator = np.where(np.abs(b + discriminant) >= np.abs(b - discriminant),
+                               b + discriminant, b - discriminant)
+        step = np.where(denominator != 0, -2 * f2 / np.where(denominator != 0, denominator, 1), np.nan)
+        return np.where(f2 == 0, 0j, step)[()]
+
+
+@dataclass
+class MullerMethod(RootFinder):
+    """
+    Muller's method: the next point is the root, closest to the last point, of the parabola through the last
+    three points. Its convergence order is about 1.84 with one evaluation per iteration and no derivatives.
+
+    The iteration is done in complex arithmetic, so ``function`` must accept complex arguments (NumPy
+    functions, not ``math``). Even from real starting points it reaches complex roots, as the square root of
+    a negative discriminant leaves the real line. The first three points are x0 - dx, x0 + dx and x0.
+    For many starting points at once, see BatchMullerMethod.
+    """
+    x0: complex = field(default=0.0)
+    dx: complex = field(default=0.5)
+
+    def __post_init__(self) -> None:
+        if self.x0 is None:
+            raise ValueError("x0 cannot be None")
+        if self.dx is None or self.dx == 0:
+            raise ValueError("dx must be non-zero")
+
+        self.add_stop_condition(StopIfZero(tracking='step_size', patience=1,
+                                           absolute_tolerance=self.absolute_tolerance))
+        self.add_stop_condition(StopIfNaN(track_variables=['x', 'f']))
+
+    @property
+    def initial_state(self) -> dict:
+        x0 = complex(self.x0)
+        points = (x0 - self.dx, x0 + self.dx, x0)
+        f_nm2, f_nm1, f = (self.function(x) for x in points)
+        return self._state(*points, f_nm2, f_nm1, f, step=self.dx)
+
+    def step(self) -> dict:
+        x_nm2, x_nm1, x_n = self.history['x_nm2'], self.history['x_nm1'], self.history['x']
+        f_nm2, f_nm1, f_n = self.history['f_nm2'], self.history['f_nm1'], self.history['f']
+
+        step = muller_step(x_nm2, x_nm1, x_n, f_nm2, f_nm1, f_n)
+        x_np1 = x_n + step
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'x_root = {x_np1:.3e}')
+        return self._state(x_nm1, x_n, x_np1, f_nm1, f_n, self.function(x_np1), step)
+
+    @staticmethod
+    def _state(x_nm2, x_nm1, x, f_nm2, f_nm1, f, step) -> dict:
+        return dict(
+            x=x,
+            f=f,
+            x_nm1=x_nm1,
+            f_nm1=f_nm1,
+            x_nm2=x_nm2,
+            f_nm2=f_nm2,
+            step_size=abs(step),
+        )
+
+
+if __name__ == '__main__':
+    # x^4 + 1 has no real root: from real starting points the iterates leave the real line
+    solver = MullerMethod(function=lambda x: x ** 4 + 1, x0=0.5, dx=0.5)
+    df = solver.run()
+    print(df[['x', 'f', 'step_size']])
@@ -1,19 +1,34 @@
+from __future__ import annotations
+
+import logging
 from dataclasses import field, dataclass
 
 import numpy as np
-import sympy
-from matplotlib import pyplot as plt
 
 from FindRoots.RootFinder import RootFinder
 from StopConditions.StopIfEqual import StopIfZero
 from StopConditions.StopIfNaN import StopIfNaN
 from utils.ExceptionTools import LogAndReraise
+from utils.DerivativeTools import compile_derivatives
 from utils.ValidationTools import function_arg_count
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
+plt = lazy_import('matplotlib.pyplot')
 
 
 @dataclass
 class NewtonRaphsonMethod(RootFinder):
+    """
+    Newton-Raphson iteration x_n+1 = x_n - f(x_n)/f'(x_n).
+
+    Functions written with SymPy-compatible operations are differentiated symbolically once, and both f and f'
+    are compiled into NumPy functions, so states hold floats. Other functions (``math``, branching code...)
+    get a numeric derivative: a complex step when they accept complex arguments, central differences otherwise.
+    ``derivative_method`` forces one of 'symbolic', 'complex_step' or 'finite_difference'.
+    """
     x0: float = field(default=0)
+    derivative_method: str = field(default='auto')
     derivative_function: callable = field(default=None, init=False)
     function_sym: sympy.Function = field(default=None, init=False)
     derivative_sym: sympy.Function = field(default=None, init=False)
@@ -22,16 +37,15 @@ class NewtonRaphsonMethod(RootFinder):
         if function_arg_count(self.function) != 1:
             raise ValueError(f'Function must take 1 argument, not {function_arg_count(self.function)}')
 
-
         with LogAndReraise(
                 logger=self.logger,
                 message=f'The Function must be differentiable. '
                         f'Use SymPy functions.'):
-            x_sym = sympy.Symbol('x')
-            self.function_sym = self.function(x_sym)
+            (self.function, self.derivative_function), expressions = compile_derivatives(
+                self.function, self.x0, order=1, method=self.derivative_method)
+        if expressions is not None:
+            self.function_sym, self.derivative_sym = expressions
             self.logger.info(f'f(x) = {self.function_sym}')
-            self.derivative_sym = sympy.diff(self.function_sym, x_sym)
-            self.derivative_function = lambda x_n :self.derivative_sym.evalf(subs={x_sym: x_n})
             self.logger.info(f'f\'(x) = {self.derivative_sym}')
 
         self.add_stop_condition(StopIfZero(tracking='f', patience=self.patience,
@@ -56,14 +70,15 @@ class NewtonRaphsonMethod(RootFinder):
         x_n+1 = x_n - f(x_n)/f'(x_n)
         """
         x_n = self.history['x']
-        f = self.function(x_n)
+        f = self.history['f']
         fp = self.derivative_function(x_n)
         x_np1 = x_n - f / fp
-        self.logger.info(f't_root = {x_np1:0.3e}')
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f't_root = {x_np1:0.3e}')
         return dict(
             x=x_np1,
             f=self.function(x_np1),
-            df_dt=fp,
+            df_dx=fp,
         )
 
     def plot_tangent(self, step: int, ax: plt.Axes) -> plt.Axes:
@@ -108,11 +123,9 @@ class NewtonRaphsonMethod(RootFinder):
             fig, ax = plt.subplots()
 
         x_float = np.linspace(x_min, x_max, resolution)
-        x = sympy.Symbol('x')
-        func = self.function(x)
-        f = sympy.lambdify(x, expr=func)
         ax.plot(
-            x_float, f(x_float),
+            x_float, self.function(x_float) if self.function_sym is not None
+            else [self.function(x) for x in x_float],
             color='black',
             linewidth=1.5,
         )
@@ -121,7 +134,8 @@ class NewtonRaphsonMethod(RootFinder):
         ax.set_xlabel('x')
         ax.set_ylabel('f(x)')
         ax.grid(True)
-        ax.set_title(f'$f(x)={sympy.latex(self.function(x))}$')
+        if self.function_sym is not None:
+            ax.set_title(f'$f(x)={sympy.latex(self.function_sym)}$')
 
         # Highlight x-Axis
         ax.axhline(y=0, color='k', linewidth=2.0)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+import numpy as np
+
+from utils.LazyImport import is_imported, lazy_import
+
+sympy = lazy_import('sympy')
+
+POLYNOMIAL_ROOT_METHODS = ('auto', 'companion', 'aberth', 'durand_kerner')
+
+# Largest degree solved through companion matrix eigenvalues by method='auto'; above it Aberth is faster,
+# for single polynomials and batches alike
+COMPANION_MAX_DEGREE = 100
+
+
+def polynomial_coefficients(polynomial: Any) -> np.ndarray:
+    """
+    Coefficients from the highest degree down, as np.roots takes them, from an array or a SymPy polynomial.
+    A 2-D array is a batch of polynomials of the same degree, one per row.
+    """
+    if is_imported('sympy') and isinstance(polynomial, (sympy.Poly, sympy.Basic)):
+        if not isinstance(polynomial, sympy.Poly):
+            polynomial = sympy.Poly(polynomial)
+        if len(polynomial.gens) != 1:
+            raise ValueError(f'Polynomial must have a single variable, got {polynomial.gens}')
+        return np.array([complex(c) for c in polynomial.all_coeffs()])
+
+    coefficients = np.asarray(polynomial)
+    if coefficients.ndim not in (1, 2):
+        raise ValueError(f'Coefficients must be a 1-D array or a 2-D batch, got shape {coefficients.shape}')
+    return coefficients
+
+
+def _horner(coefficients: np.ndarray, z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """p(z) and p'(z) for a batch of polynomials (rows) at points z (one row of points per polynomial)"""
+    p = np.zeros_like(z)
+    dp = np.zeros_like(z)
+    for c in coefficients.T:
+        dp = dp * z + p
+        p = p * z + c[:, None]
+    return p, dp
+
+
+def _scaled_horner(coefficients: np.ndarray, z: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Horner's scheme that does not overflow for high degrees: inside the unit circle it returns p(z) and p'(z),
+    outside it the reversed polynomial q(w) = w^n p(1/w) and q'(w) at w = 1/z, so that p(z) = z^n q(w).
+
+    :returns: Whether each point is outside the unit circle, and the values and derivatives
+    """
+    outside = np.abs(z) > 1
+    p, dp = _horner(coefficients, np.where(outside, 0, z))
+    q, dq = _horner(coefficients[:, ::-1], np.where(outside, 1 / np.where(outside, z, 1), 0))
+    return outside, np.where(outside, q, p), np.where(outside, dq, dp)
+
+
+def _newton_ratio(coefficients: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """p(z) / p'(z), using p'(z) / p(z) = n / z - w^2 q'(w) / q(w) outside the unit circle"""
+    outside, value, derivative = _scaled_horner(coefficients, z)
+    degree = coefficients.shape[1] - 1
+    w = 1 / z
+    return np.where(outside, 1 / (degree * w - w ** 2 * derivative / value), value / derivative)
+
+
+def _weierstrass_correction(coefficients: np.ndarray, z: np.ndarray, not_self: np.ndarray) -> np.ndarray:
+    """
+    p(z_k) / (a_n prod_j!=k (z_k - z_j)), outside the unit circle as z_k q(w_k) / a_n prod_j!=k z_k / (z_k - z_j)
+    so neither z_k^n nor the product overflows
+    """
+    outside, value, _ = _scaled_horner(coefficients, z)
+    difference = np.where(not_self, z[:, :, None] - z[:, None, :], 1.0)
+    numerator = np.where(outside[:, :, None], z[:, :, None], 1.0)
+    product = np.prod(np.where(not_self, numerator / difference, 1.0), axis=2)
+    return np.where(outside, z, 1.0) * value * product / coefficients[:, :1]
+
+
+def _root_bound(coefficients: np.ndarray) -> np.ndarray:
+    """Fujiwara's bound: every root of each polynomial lies within this radius of the origin"""
+    degree = coefficients.shape[1] - 1
+    magnitude = np.abs(coefficients[:, 1:] / coefficients[:, :1])
+    magnitude[:, -1] /= 2
+    return 2 * np.max(magnitude ** (1 / np.arange(1, degree + 1)), axis=1, keepdims=True)
+
+
+def _initial_points(coefficients: np.ndarray) -> np.ndarray:
+    """Points spread on a circle around the centroid of the roots, with the geometric mean of their moduli"""
+    degree = coefficients.shape[1] - 1
+    centre = -coefficients[:, 1:2] / (degree * coefficients[:, :1])
+    product = np.abs(coefficients[:, -1:] / coefficients[:, :1])
+    radius = np.where(product > 0, product ** (1 / degree), 1.0)
+    # Offset angle avoids starting symmetric to real coefficients
+    angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+    return centre + radius * np.exp(1j * angles)
+
+
+def simultaneous_roots(coefficients: np.ndarray, method: str = 'aberth', tolerance: float = 1e-14,
+                       max_iterations: int = 500) -> np.ndarray:
+    """
+    All roots of a batch of polynomials (rows of ``coefficients``, leading coefficients non-zero), improving
+    every root of every polynomial at once with Aberth-Ehrlich (cubic convergence) or Durand-Kerner
+    (Weierstrass, quadratic) corrections. A root stops moving once its correction is below
+    ``tolerance * max(1, |z|)``, and a polynomial drops out once all its roots have.
+
+    :returns: A (batch, degree) complex array
+    """
+    if method not in ('aberth', 'durand_kerner'):
+        raise ValueError(f"Unknown simultaneous method {method!r}, expected 'aberth' or 'durand_kerner'")
+    coefficients = np.asarray(coefficients, dtype=complex)
+    degree = coefficients.shape[1] - 1
+    roots = _initial_points(coefficients)
+    not_self = ~np.eye(degree, dtype=bool)
+
+    # Rows (polynomials) still iterating, compacted as they converge
+    active = np.arange(len(coefficients))
+    z, active_coefficients, bound = roots, coefficients, _root_bound(coefficients)
+    for _ in range(max_iterations):
+        if not active.size:
+            break
+        with np.errstate(all='ignore'):
+            if method == 'aberth':
+                newton = _newton_ratio(active_coefficients, z)
+                difference = np.where(not_self, z[:, :, None] - z[:, None, :], 1.0)
+                repulsion = np.sum(np.where(not_self, 1 / difference, 0.0), axis=2)
+                correction = newton / (1 - newton * repulsion)
+            else:
+                correction = _weierstrass_correction(active_coefficients, z, not_self)
+        # Roots already exact (p = 0) stay put
+        correction = np.where(np.isfinite(correction), correction, 0.0)
+        z = z - correction
+        # An overshooting correction (mostly Durand-Kerner far from the roots) is pulled back within the bound
+        modulus = np.abs(z)
+        z = np.where(modulus > bound, z * (bound / np.where(modulus > bound, modulus, 1.0)), z)
+
+        converged = np.all(np.abs(correction) <= tolerance * np.maximum(1.0, np.abs(z)), axis=1)
+        roots[active] = z
+        if converged.any():
+            running = ~converged
+            active, z, active_coefficients, bound = \
+                active[running], z[running], active_coefficients[running], bound[running]
+    return roots
+
+
+def companion_roots(coefficients: np.ndarray) -> np.ndarray:
+    """
+    All roots as the eigenvalues of the companion matrices of a batch of polynomials
+    (rows of ``coefficients``, leading coefficients non-zero).
+
+    :returns: A (batch, degree) complex array
+    """
+    coefficients = np.asarray(coefficients)
+    batch, degree = coefficients.shape[0], coefficients.shape[1] - 1
+    companion = np.zeros((batch, degree, degree), dtype=np.result_type(coefficients, float))
+    companion[:, 0, :] = -coefficients[:, 1:] / coefficients[:, :1]
+    companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+    return np.linalg.eigvals(companion).astype(complex)
+
+
+def polish_roots(coefficients: np.ndarray, roots: np.ndarray, iterations: int = 2) -> np.ndarray:
+    """A few Newton steps on the original polynomials, recovering accuracy lost to scaling or deflation"""
+    roots = np.array(roots, dtype=complex)
+    coefficients = np.asarray(coefficients, dtype=complex)
+    for _ in range(iterations):
+        with np.errstate(all='ignore'):
+            step = _newton_ratio(coefficients, roots)
+        roots -= np.where(np.isfinite(step), step, 0.0)
+    return roots
+
+
+def polynomial_roots(polynomial: Any, method: str = 'auto', polish: bool = False, **kwargs) -> np.ndarray:
+    """
+    Every (complex) root of a polynomial, or of each polynomial of a batch.
+
+    :param polynomial: Coefficients from the highest degree down, a SymPy polynomial or expression in one
+        variable, or a 2-D array with one polynomial of the same degree per row
+    :param method: 'companion' (eigenvalues, robust, O(n^3)), 'aberth' or 'durand_kerner' (simultaneous
+        iterations, O(n^2) per iteration and vectorized over a batch) or 'auto': companion matrices
+        up to COMPANION_MAX_DEGREE, Aberth above
+    :param polish: Finish with Newton steps on the original polynomial
+    :param kwargs: tolerance and max_iterations of simultaneous_roots
+    :returns: The roots, sorted by real then imaginary part: an array of the degree for a single polynomial
+        (leading zero coefficients are dropped, as in np.roots), or a (batch, degree) array
+    """
+    if method not in POLYNOMIAL_ROOT_METHODS:
+        raise ValueError(f'Unknown method {method!r}, expected one of {POLYNOMIAL_ROOT_METHODS}')
+    coefficients = polynomial_coefficients(polynomial)
+
+    single = coefficients.ndim == 1
+    if single:
+        nonzero = np.flatnonzero(coefficients)
+        if not nonzero.size:
+            raise ValueError('The zero polynomial has no finite set of roots')
+        # Trailing zero coefficients are roots at zero, found exactly
+        zero_roots = np.zeros(len(coefficients) - 1 - nonzero[-1], dtype=complex)
+        coefficients = coefficients[None, nonzero[0]:nonzero[-1] + 1]
+    elif np.any(coefficients[:, 0] == 0):
+        raise ValueError('Every polynomial of a batch needs a non-zero leading coefficient')
+
+    degree = coefficients.shape[1] - 1
+    if degree == 0:
+        roots = np.empty((len(coefficients), 0), dtype=complex)
+    elif degree == 1:
+        roots = (-coefficients[:, 1:] / coefficients[:, :1]).astype(complex)
+    else:
+        if method == 'auto':
+            method = 'companion' if degree <= COMPANION_MAX_DEGREE else 'aberth'
+        if method == 'companion':
+            roots = companion_roots(coefficients)
+        else:
+            roots = simultaneous_roots(coefficients, method=method, **kwargs)
+        if polish:
+            roots = polish_roots(coefficients, roots)
+
+    roots = np.take_along_axis(roots, np.lexsort((roots.imag, roots.real), axis=-1), axis=-1)
+    if single:
+        return np.sort_complex(np.concatenate((roots[0], zero_roots)))
+    return roots
+
+
+def real_roots(roots: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+    """The real parts of the roots whose imaginary part is below tolerance * max(1, |root|)"""
+    roots = np.asarray(roots)
+    return np.real(roots[np.abs(roots.imag) <= tolerance * np.maximum(1.0, np.abs(roots))])
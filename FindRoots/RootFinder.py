@@ -1,13 +1,19 @@
+from __future__ import annotations
+
 from abc import ABC
 from dataclasses import dataclass, field
+from typing import ClassVar
 
 import numpy as np
-import pandas as pd
-from matplotlib import pyplot as plt
 
 from Core.Numerical import Numerical
+from FindRoots.BracketScanner import find_roots
 from utils.ErrorCalculations import absolute_error, relative_error
 from utils.ValidationTools import function_arg_count
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
 
 
 @dataclass
@@ -15,6 +21,9 @@ class RootFinder(Numerical, ABC):
     function: callable = field(default=None)
     independent_variable_count: int = 1
 
+    # State variable holding the current estimate of the root
+    root_variable: ClassVar[str] = 'x'
+
     def _validate_initial_state(self) -> None:
         if self.function is None:
             raise ValueError("Function must be specified")
@@ -29,6 +38,11 @@ class RootFinder(Numerical, ABC):
         df[f'\varepsilon_r'] = relative_error(df['t'], exact_solution)
         return df
 
+    def find_roots(self, x_min: float, x_max: float, resolution: int = 1000, **kwargs) -> np.ndarray:
+        """Every root of the function on [x_min, x_max], bracketed by a grid scan and refined together.
+        See BracketScanner.find_roots for the keyword arguments"""
+        return find_roots(self.function, x_min, x_max, resolution=resolution, **kwargs)
+
     def plot_function(self, x_min:float, x_max:float, ax:plt.Axes = None, resolution:int=1000, *args, **kwargs) -> plt.Axes:
 
         if ax is None:
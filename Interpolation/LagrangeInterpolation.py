@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import numpy as np
-import sympy as sp
+
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
 
 
 def lagrange_interpolation_polynomial(x: np.ndarray, y: np.ndarray) -> sp.Expr:
@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 from itertools import product
 
 import numpy as np
-import sympy as sp
+
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
 
 
 def newton_coefficients(x:np.ndarray, y: np.ndarray, order:int)->np.ndarray:
@@ -1,9 +1,13 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 
 import numpy as np
-import sympy as sp
 
 from ODE.RungeKutta.RungeKuttaBase import RungeKuttaBase
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
 
 
 @dataclass
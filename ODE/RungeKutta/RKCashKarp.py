@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 from ODE.RungeKutta.RungeKuttaBase import RungeKuttaBase
-import sympy as sp
 import numpy as np
 
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
+
 
 class RKCashKarp(RungeKuttaBase):
     """
@@ -1,8 +1,12 @@
+from __future__ import annotations
+
 from typing import Dict
-import sympy as sp
 import numpy as np
 
 from ODE.RungeKutta.RungeKuttaBase import RungeKuttaBase
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
 
 
 class RKHeunMethod(RungeKuttaBase):
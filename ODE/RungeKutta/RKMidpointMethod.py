@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 import numpy as np
 
 from ODE.RungeKutta.RungeKuttaBase import RungeKuttaBase
-import sympy as sp
+from utils.LazyImport import lazy_import
+
+sp = lazy_import('sympy')
 
 class RKMidpointMethod(RungeKuttaBase):
     """
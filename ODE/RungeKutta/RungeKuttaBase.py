@@ -1,13 +1,17 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Callable
 
 import numpy as np
-import sympy
 
 from Core import Numerical
 from StopConditions.StopIfGreaterThan import StopIfGreaterThan
 from utils.ValidationTools import function_arg_count, raise_value_error_if_none
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
 
 
 @dataclass
@@ -1,9 +1,11 @@
+import logging
 import struct
 from typing import Callable, Tuple, List
 
 import numpy as np
 
 from Core import Numerical
+from utils.AsyncTools import evaluate_many
 from utils.ValidationTools import is_nan
 
 
@@ -37,21 +39,58 @@ class GAExtrema(Numerical):
     @property
     def initial_state(self) -> dict:
         initial_genes: np.ndarray = np.random.uniform(self.x_lower, self.x_upper, self.num_genes)
+        return self._rank_initial_genes(initial_genes, self.function)
+
+    async def ainitial_state(self) -> dict:
+        initial_genes: np.ndarray = np.random.uniform(self.x_lower, self.x_upper, self.num_genes)
+        fitness = dict(zip(initial_genes, await evaluate_many(self.function, initial_genes)))
+        return self._rank_initial_genes(initial_genes, fitness.__getitem__)
+
+    def _rank_initial_genes(self, initial_genes: np.ndarray, fitness: Callable) -> dict:
         initial_genes: dict = {str(ind): val for ind, val in
-                         sorted(enumerate(initial_genes), key=lambda x: self.function(x[1]), reverse=self.find_max)}
-        initial_genes['f(x)'] = self.function(initial_genes['0'])
+                         sorted(enumerate(initial_genes), key=lambda x: fitness(x[1]), reverse=self.find_max)}
+        initial_genes['f(x)'] = fitness(initial_genes['0'])
         return initial_genes
 
-    def step(self) -> dict:
-        self.logger.info(f'======= Generation {self.history.last_iteration} =====')
+    def _previous_genes(self) -> Tuple[dict, List[float]]:
+        """The last generation keyed by gene index, and its gene values (without 'f(x)' or other columns)"""
         previous_genes = self.history.last_state
-        previous_genes_values = sorted(list(previous_genes.values()), key=self.function, reverse=self.find_max)
+        return previous_genes, [val for key, val in previous_genes.items() if key.isdigit()]
+
+    def step(self) -> dict:
+        previous_genes, previous_genes_values = self._previous_genes()
+        next_genes = self._breed(previous_genes, previous_genes_values, self.function)
+        return self._rank(next_genes, self.function)
+
+    async def astep(self) -> dict:
+        """
+        One generation, evaluating the fitness of the whole population concurrently:
+        once for the parents and once for the children.
+        """
+        previous_genes, previous_genes_values = self._previous_genes()
+        fitness = dict(zip(previous_genes_values, await evaluate_many(self.function, previous_genes_values)))
+        next_genes = self._breed(previous_genes, previous_genes_values, fitness.__getitem__)
+
+        children = [val for val in next_genes.values() if val not in fitness]
+        fitness.update(zip(children, await evaluate_many(self.function, children)))
+        return self._rank(next_genes, fitness.__getitem__)
+
+    def _breed(self, previous_genes: dict, previous_genes_values: List[float], fitness: Callable) -> dict:
+        """
+        Select the elites and breed the rest of the next generation.
+        Only the fitness of the previous generation is looked up.
+        """
+        verbose = self.log_enabled(logging.INFO)
+        if verbose:
+            self.logger.info(f'======= Generation {self.history.last_iteration} =====')
+        previous_genes_values = sorted(previous_genes_values, key=fitness, reverse=self.find_max)
         next_genes = {}
-        genes = np.arange(len(previous_genes_values)-1)
+        genes = np.arange(len(previous_genes_values))
 
         # Elite Selection
         for ind, val in enumerate(previous_genes_values[:self.num_elites]):
-            self.logger.info(f'Elite #{ind}:f({val}) = {self.function(val)}')
+            if verbose:
+                self.logger.info(f'Elite #{ind}:f({val}) = {fitness(val)}')
             next_genes[str(ind)] = val
 
         # Non-elite genes
@@ -62,13 +101,14 @@ class GAExtrema(Numerical):
                 zip(crossover_genes, np.roll(crossover_genes, 1))
                 ,start=self.num_elites):
             # Crossover
-            self.logger.info(f'Crossover #{ind}')
-            self.logger.info(f'Parent#{parent1_ind}: '
-                             f'f({previous_genes[str(parent1_ind)]}) = '
-                             f'{self.function(previous_genes[str(parent1_ind)])}')
-            self.logger.info(f'Parent#{parent2_ind}: '
-                             f'f({previous_genes[str(parent2_ind)]}) = '
-                             f'{self.function(previous_genes[str(parent2_ind)])}')
+            if verbose:
+                self.logger.info(f'Crossover #{ind}')
+                self.logger.info(f'Parent#{parent1_ind}: '
+                                 f'f({previous_genes[str(parent1_ind)]}) = '
+                                 f'{fitness(previous_genes[str(parent1_ind)])}')
+                self.logger.info(f'Parent#{parent2_ind}: '
+                                 f'f({previous_genes[str(parent2_ind)]}) = '
+                                 f'{fitness(previous_genes[str(parent2_ind)])}')
             parent1 = previous_genes[str(parent1_ind)]
             parent2 = previous_genes[str(parent2_ind)]
             child1, child2 = self.crossover(parent1, parent2)
@@ -77,16 +117,21 @@ class GAExtrema(Numerical):
             # Mutation
             if np.random.random() < self.mutation_probability:
                 child = self.mutate(child)
-                self.logger.info(f'Mutation applied to child: f({child}) = {self.function(child)}')
+                if verbose:
+                    self.logger.info(f'Mutation applied to child: {child}')
 
             next_genes[str(ind)] = child
-            self.logger.info(f'Child -> f({child}) = {self.function(child)}')
+            if verbose:
+                self.logger.info(f'Child -> {child}')
+        return next_genes
 
+    def _rank(self, next_genes: dict, fitness: Callable) -> dict:
         # Sort genes by fitness function
         next_genes = {ind: val for ind, val in
-                      sorted(next_genes.items(), key=lambda _: self.function(_[1]), reverse=True)}
-        next_genes['f(x)'] = self.function(next_genes['0'])
-        self.logger.info(f'Best Gene: f({next_genes["0"]}) = {next_genes["f(x)"]}')
+                      sorted(next_genes.items(), key=lambda _: fitness(_[1]), reverse=True)}
+        next_genes['f(x)'] = fitness(next_genes['0'])
+        if self.log_enabled(logging.INFO):
+            self.logger.info(f'Best Gene: f({next_genes["0"]}) = {next_genes["f(x)"]}')
         return next_genes
 
     @staticmethod
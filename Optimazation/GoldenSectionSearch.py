@@ -1,7 +1,6 @@
-from jinja2.filters import do_xmlattr
-
 from Core import Numerical
 from StopConditions.StopIfEqual import StopIfZero
+from utils.AsyncTools import evaluate_many
 
 
 class GoldenSectionSearch(Numerical):
@@ -33,21 +32,42 @@ class GoldenSectionSearch(Numerical):
             log='initial state'
         )
 
-    def step(self) -> dict:
+    async def ainitial_state(self) -> dict:
+        fl, fu = await evaluate_many(self.function, (self.x_lower, self.x_upper))
+        return dict(
+            xl=self.x_lower,
+            xu=self.x_upper,
+            fl=fl,
+            fu=fu,
+            dx=abs(self.x_upper - self.x_lower),
+            log='initial state'
+        )
+
+    def _interior_points(self) -> tuple:
         previous_state = self.history.last_state
         xl = previous_state['xl']
         xu = previous_state['xu']
-        fl = previous_state['fl']
-        fu = previous_state['fu']
 
         phi = (1 + 5 ** 0.5) / 2
         r = 1 / phi
         dx = abs(xu - xl)
-        x1 = xu - r * dx
-        x2 = xl + r * dx
+        return xu - r * dx, xl + r * dx
+
+    def step(self) -> dict:
+        x1, x2 = self._interior_points()
+        return self._update_section(x1, x2, self.function(x1), self.function(x2))
+
+    async def astep(self) -> dict:
+        x1, x2 = self._interior_points()
+        return self._update_section(x1, x2, *await evaluate_many(self.function, (x1, x2)))
 
-        f1 = self.function(x1)
-        f2 = self.function(x2)
+    def _update_section(self, x1, x2, f1, f2) -> dict:
+        previous_state = self.history.last_state
+        xl = previous_state['xl']
+        xu = previous_state['xu']
+        fl = previous_state['fl']
+        fu = previous_state['fu']
+        dx = abs(xu - xl)
 
         if f1 < f2:
             xl, xu = xl, x2
@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 from typing import Dict, List
 
 import numpy as np
-import sympy
 
 from Core import Numerical
 from StopConditions.StopIfEqual import StopIfEqual
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
 
 
 class GradientDescent(Numerical):
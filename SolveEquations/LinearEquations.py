@@ -1,11 +1,14 @@
+from __future__ import annotations
+
 from typing import Tuple
 
 import numpy as np
-import sympy
-from IPython.core.display import Markdown, Math
-from IPython.display import display
 
 from utils.LaTeXTools import numpy_to_latex_gauss, vector2latex
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
+ipython = lazy_import('IPython.display')
 
 
 def forward_elimination(aug: sympy.Matrix, verbose:bool=False) -> sympy.Matrix:
@@ -22,7 +25,7 @@ def forward_elimination(aug: sympy.Matrix, verbose:bool=False) -> sympy.Matrix:
             factor = aug[i, k] / aug[k, k]
             # Row operation Ri -> Ri - alpha Rk
             aug[i, k:] = aug[i, k:] - factor * aug[k, k:]
-        if verbose: display(Math(numpy_to_latex_gauss(aug=aug)))
+        if verbose: ipython.display(ipython.Math(numpy_to_latex_gauss(aug=aug)))
     return aug
 
 
@@ -77,18 +80,18 @@ def gauss_naive(a: sympy.Matrix, b: sympy.Matrix, verbose=False) -> sympy.Matrix
     aug: sympy.Matrix = a.row_join(b)
 
     # ======== Forward Elimination ========
-    if verbose: display(Markdown(f"**Forward Elimination**"))
+    if verbose: ipython.display(ipython.Markdown(f"**Forward Elimination**"))
     aug = forward_elimination(aug, verbose=verbose)
 
     # ======== Back Substitution ========
-    if verbose: display(Markdown(f"**Back Substitution**"))
+    if verbose: ipython.display(ipython.Markdown(f"**Back Substitution**"))
     x = back_substitution(aug)
 
     if verbose:
         #display results
-        display(Math(numpy_to_latex_gauss(aug)))
-        display(Markdown(f"**Solution Vector**"))
-        display(Math(
+        ipython.display(ipython.Math(numpy_to_latex_gauss(aug)))
+        ipython.display(ipython.Markdown(f"**Solution Vector**"))
+        ipython.display(ipython.Math(
             f"{vector2latex({f'x_{{{i}}}': j for i, j in enumerate(x.tolist(), start=1)}, brackets='[]')}"
             f" = "
             f"{sympy.latex(x.evalf(10))}"
@@ -116,13 +119,13 @@ def lu_decomposition_linear_solver(
     l, u, _ = a.LUdecomposition()
     x_sym_matrix = sympy.Matrix(sympy.symbols(f"x_{{1:{a.rows+1}}}"))
     if verbose:
-        display(Markdown(f"**LU Decomposition**"))
-        display(Math(
+        ipython.display(ipython.Markdown(f"**LU Decomposition**"))
+        ipython.display(ipython.Math(
             f'{sympy.latex(a)}'
             f'{sympy.latex(x_sym_matrix)} = '
             f'{sympy.latex(b)}'
         ))
-        display(Math(
+        ipython.display(ipython.Math(
             f'{sympy.latex(l)}'
             f'{sympy.latex(u)}'
             f'{sympy.latex(x_sym_matrix)} = '
@@ -135,13 +138,13 @@ def lu_decomposition_linear_solver(
     y_sym_matrix = sympy.Matrix(sympy.symbols(f"y_{{1:{a.rows+1}}}"))
 
     if verbose:
-        display(Markdown(f"**$Ly=b$ forward substitution**"))
-        display(Math(
+        ipython.display(ipython.Markdown(f"**$Ly=b$ forward substitution**"))
+        ipython.display(ipython.Math(
             f'{sympy.latex(l)}'
             f'{sympy.latex(y_sym_matrix)} = '
             f'{sympy.latex(b)}'
         ))
-        display(Math(
+        ipython.display(ipython.Math(
             f'{sympy.latex(y_sym_matrix)} = {sympy.latex(y)}'
         ))
 
@@ -150,16 +153,16 @@ def lu_decomposition_linear_solver(
     x = back_substitution(ux)
 
     if verbose:
-        display(Markdown(f"**$Lx=y$ back substitution**"))
-        display(Math(
+        ipython.display(ipython.Markdown(f"**$Lx=y$ back substitution**"))
+        ipython.display(ipython.Math(
             f'{sympy.latex(l)}'
             f'{sympy.latex(x_sym_matrix)} = '
             f'{sympy.latex(y)}'
         ))
 
         # display results
-        display(Markdown(f"**Solution Vector**"))
-        display(Math(
+        ipython.display(ipython.Markdown(f"**Solution Vector**"))
+        ipython.display(ipython.Math(
             f'{sympy.latex(x_sym_matrix)} = {sympy.latex(x)} ='
             f'{sympy.latex(x.evalf(6))}'
         ))
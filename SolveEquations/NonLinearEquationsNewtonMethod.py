@@ -1,13 +1,17 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from typing import List
 
 import numpy as np
-import sympy
 
 from Core import Numerical
 from StopConditions.StopAtOrderOfMagnitudeIncrease import StopAtOrderOfMagnitudeIncrease
 from StopConditions.StopIfEqual import StopIfZero
 from StopConditions.StopIfNaN import StopIfNaN
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
 
 
 @dataclass
@@ -41,7 +45,7 @@ class NonLinearEquationsNewtonMethod(Numerical):
         self.add_stop_condition(StopIfNaN(track_variables=['residue'] + list(self.variables)))
 
     def get_values(self, iteration: int)->dict:
-        return {k:v for k,v in self.history.data[iteration].items() if k in list(map(str, self.variables))}
+        return {k:v for k,v in self.history.state(iteration).items() if k in list(map(str, self.variables))}
 
     @property
     def initial_state(self) -> dict:
@@ -1,18 +1,25 @@
+from __future__ import annotations
+
 from itertools import product
 from typing import List
 
-import matplotlib.pyplot as plt
 import numpy as np
-import sympy as sp
-import pandas as pd
+
+from utils.LazyImport import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
+sp = lazy_import('sympy')
+pd = lazy_import('pandas')
 
 
 def cubic_spline_functions(
         x_data: np.ndarray,
         y_data: np.ndarray,
         end_condition: str = "natural",
-        x: sp.Symbol = sp.Symbol("x")
+        x: sp.Symbol = None
 ) -> List[dict]:
+    if x is None:
+        x = sp.Symbol("x")
     n = len(x_data)
     n_intervals = n - 1
     h = np.diff(x_data)  # h[i] = x[i+1] - x[i]
@@ -4,6 +4,8 @@ from typing import Generator, Tuple, Optional
 import numpy as np
 
 from Core.Numerical import StopCondition
+from StopConditions.StopConditionBase import Reason
+from StopConditions.StopReason import StopReason
 from utils.ValidationTools import is_nan
 
 
@@ -53,24 +55,26 @@ class StopAtOrderOfMagnitudeIncrease(StopCondition):
             return 10**(self.baseline_order+2)
         return math.floor(math.log10(value))
 
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
-        """Generate stop condition based on integer order of magnitude increase detection."""
+    def reset(self) -> None:
         self.patience_counter = 0
         self.baseline_value = None
         self.baseline_order = None
         self.triggered = False
 
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
+        """Generate stop condition based on integer order of magnitude increase detection."""
         while True:
             # Need at least 1 iteration to establish baseline
             if len(self.history) < 1:
-                yield False, f"Not enough iterations to determine baseline value"
+                yield False, StopReason.NOT_ENOUGH_HISTORY, f"Not enough iterations to determine baseline value"
                 continue
 
             current = self.history[self.tracking]
 
             # Handle special case for zero or negative values
             if current <= 0:
-                yield False, f"Cannot determine order of magnitude for non-positive value: {current}"
+                yield False, StopReason.INVALID_VALUE, lambda: (
+                    f"Cannot determine order of magnitude for non-positive value: {current}")
                 continue
 
             current_order = self._get_order_of_magnitude(current)
@@ -79,7 +83,8 @@ class StopAtOrderOfMagnitudeIncrease(StopCondition):
             if self.baseline_value is None:
                 self.baseline_value = float(current)
                 self.baseline_order = current_order
-                yield False, f"Baseline established: {self.baseline_value} (order: 10^{self.baseline_order})"
+                yield False, StopReason.BASELINE_UPDATED, lambda: (
+                    f"Baseline established: {self.baseline_value} (order: 10^{self.baseline_order})")
                 continue
 
             # Update baseline if value decreases significantly and we're not in triggered state
@@ -88,16 +93,18 @@ class StopAtOrderOfMagnitudeIncrease(StopCondition):
                 old_order = self.baseline_order
                 self.baseline_value = current
                 self.baseline_order = current_order
-                yield False, (f"Baseline decreased from {old_baseline:.6g} (10^{old_order}) to "
-                              f"{self.baseline_value} (10^{self.baseline_order})")
+                yield False, StopReason.BASELINE_UPDATED, lambda: (
+                    f"Baseline decreased from {old_baseline:.6g} (10^{old_order}) to "
+                    f"{self.baseline_value} (10^{self.baseline_order})")
                 continue
 
             # Check if order of magnitude trigger condition is met
             target_order = self.baseline_order + self.orders_increase
             if not self.triggered and current_order >= target_order:
                 self.triggered = True
-                yield False, (f"Order of magnitude increase detected: current={current:.6g} (10^{current_order}) ≥ "
-                              f"threshold=10^{target_order} (baseline: {self.baseline_value:.6g}, 10^{self.baseline_order})")
+                yield False, StopReason.PENDING, lambda: (
+                    f"Order of magnitude increase detected: current={current:.6g} (10^{current_order}) ≥ "
+                    f"threshold=10^{target_order} (baseline: {self.baseline_value:.6g}, 10^{self.baseline_order})")
                 continue
 
             # If triggered, check if value returned below threshold
@@ -111,22 +118,24 @@ class StopAtOrderOfMagnitudeIncrease(StopCondition):
                     # Update baseline to current value
                     self.baseline_value = current
                     self.baseline_order = current_order
-                    yield False, (f"Value returned below threshold: {current:.6g} (10^{current_order}) < "
-                                  f"10^{target_order}, resetting baseline")
+                    yield False, StopReason.BASELINE_UPDATED, lambda: (
+                        f"Value returned below threshold: {current:.6g} (10^{current_order}) < "
+                        f"10^{target_order}, resetting baseline")
                 else:
                     # Value still above threshold, increment counter
                     self.patience_counter += 1
 
                     # Create status update
-                    self.update_stop_history(dict(
-                        current=current,
-                        current_order=current_order,
-                        baseline=self.baseline_value,
-                        baseline_order=self.baseline_order,
-                        threshold_order=target_order,
-                        patience_counter=self.patience_counter,
-                        triggered=self.triggered
-                    ))
+                    if self.record_history:
+                        self.update_stop_history(dict(
+                            current=current,
+                            current_order=current_order,
+                            baseline=self.baseline_value,
+                            baseline_order=self.baseline_order,
+                            threshold_order=target_order,
+                            patience_counter=self.patience_counter,
+                            triggered=self.triggered
+                        ))
 
                     if self.patience_counter >= self.patience:
                         magnitude_diff = current_order - self.baseline_order
@@ -134,11 +143,14 @@ class StopAtOrderOfMagnitudeIncrease(StopCondition):
                             f"Variable '{self.tracking}' increased by {magnitude_diff} order(s) of magnitude "
                             f"from {self.baseline_value:.6g} (10^{self.baseline_order}) to "
                             f"{current:.6g} (10^{current_order}) and remained elevated for {self.patience} iterations")
-                        yield True, self.stop_reason
+                        yield True, StopReason.MET, self.stop_reason
                         break
 
-                    yield False, (f"Value remains elevated: {current:.6g} (10^{current_order}) ≥ "
-                                  f"10^{target_order}, {self.patience_counter}/{self.patience} iterations")
+                    yield False, StopReason.PENDING, lambda: (
+                        f"Value remains elevated: {current:.6g} (10^{current_order}) ≥ "
+                        f"10^{target_order}, {self.patience_counter}/{self.patience} iterations")
             else:
                 # Not triggered, but no significant change - continue monitoring
-                yield False, f"Monitoring: current={current:.6g} (10^{current_order}), baseline={self.baseline_value:.6g} (10^{self.baseline_order})"
\ No newline at end of file
+                yield False, StopReason.NOT_MET, lambda: (
+                    f"Monitoring: current={current:.6g} (10^{current_order}), "
+                    f"baseline={self.baseline_value:.6g} (10^{self.baseline_order})")
\ No newline at end of file
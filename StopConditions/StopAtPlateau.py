@@ -1,7 +1,11 @@
 from dataclasses import field, dataclass
 from typing import Generator, Tuple, Optional
 
+import numpy as np
+
 from Core.Numerical import StopCondition
+from StopConditions.StopConditionBase import Reason
+from StopConditions.StopReason import StopReason
 
 
 @dataclass
@@ -14,6 +18,7 @@ class StopAtPlateau(StopCondition):
 
     def __post_init__(self):
         """Validate initialization parameters."""
+        super().__post_init__()
         if self.tracking is None:
             raise ValueError("Must specify a variable name to track")
         if self.patience < 0:
@@ -58,66 +63,77 @@ class StopAtPlateau(StopCondition):
         return (f"{class_name}: Stop when '{self.tracking}' plateaus "
                 f"({tol_str}) for {self.patience} iterations")
 
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
-        """Generate stop condition based on plateau detection in tracked variable"""
+    def reset(self) -> None:
         self.patience_counter = 0
 
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
+        """Generate stop condition based on plateau detection in tracked variable"""
         while True:
             # Need at least 2 iterations to check for plateaus
             if len(self.history) < 2:
-                yield False, f"Not enough iterations to determine plateau"
+                yield False, StopReason.NOT_ENOUGH_HISTORY, f"Not enough iterations to determine plateau"
                 continue
 
             # Get current and previous values
             current = self.history[self.tracking]
             previous = self.history(-2, self.tracking)
 
-            abs_diff = abs(current - previous)
-            rel_diff = abs_diff / abs(previous) if previous != 0 else float('inf')
-
-            stop_condition = ((self.absolute_tolerance is not None and self.relative_tolerance is not None) and
-                              (abs_diff <= self.absolute_tolerance or rel_diff <= self.relative_tolerance))
-            self.update_stop_history(dict(
-                abs_diff=abs_diff,
-                rel_diff=rel_diff,
-                abs_tol_met=(self.absolute_tolerance is not None and abs_diff <= self.absolute_tolerance),
-                rel_tol_met=(self.relative_tolerance is not None and rel_diff <= self.relative_tolerance),
-                stop_condition=stop_condition
-            ))
+            # Largest component change for vector-valued variables
+            abs_diff = float(np.max(np.abs(np.subtract(current, previous))))
+            scale = float(np.max(np.abs(previous)))
+            rel_diff = abs_diff / scale if scale != 0 else float('inf')
+
+            stop_condition = ((self.absolute_tolerance is not None and abs_diff <= self.absolute_tolerance) or
+                              (self.relative_tolerance is not None and rel_diff <= self.relative_tolerance))
+            if self.record_history:
+                self.update_stop_history(dict(
+                    abs_diff=abs_diff,
+                    rel_diff=rel_diff,
+                    abs_tol_met=(self.absolute_tolerance is not None and abs_diff <= self.absolute_tolerance),
+                    rel_tol_met=(self.relative_tolerance is not None and rel_diff <= self.relative_tolerance),
+                    stop_condition=stop_condition
+                ))
 
             # Check if value has plateaued within tolerance
             if stop_condition:
                 self.patience_counter += 1
 
-                # Create a tolerance description that includes the active tolerance(s)
-                tolerance_desc = []
-                if self.absolute_tolerance is not None:
-                    tolerance_desc.append(f"abs diff: {abs_diff:.6g} ≤ {self.absolute_tolerance:.6g}")
-                if self.relative_tolerance is not None:
-                    tolerance_desc.append(f"rel diff: {rel_diff:.6g} ≤ {self.relative_tolerance:.6g}")
-                tolerance_str = " and ".join(tolerance_desc)
+                def tolerance_str() -> str:
+                    # Create a tolerance description that includes the active tolerance(s)
+                    tolerance_desc = []
+                    if self.absolute_tolerance is not None:
+                        tolerance_desc.append(f"abs diff: {abs_diff:.6g} ≤ {self.absolute_tolerance:.6g}")
+                    if self.relative_tolerance is not None:
+                        tolerance_desc.append(f"rel diff: {rel_diff:.6g} ≤ {self.relative_tolerance:.6g}")
+                    return " and ".join(tolerance_desc)
 
                 if self.patience_counter >= self.patience:
                     self.stop_reason = (f"Variable '{self.tracking}' plateaued for"
-                                        f" {self.patience} iterations ({tolerance_str})")
-                    yield True, self.stop_reason
+                                        f" {self.patience} iterations ({tolerance_str()})")
+                    yield True, StopReason.MET, self.stop_reason
                     break
-                yield False, (f"Potential plateau detected - {self.patience_counter}/{self.patience} "
-                              f"iterations ({tolerance_str})")
+                yield False, StopReason.PENDING, lambda: (
+                    f"Potential plateau detected - {self.patience_counter}/{self.patience} "
+                    f"iterations ({tolerance_str()})")
             else:
                 # Reset counter if significant change observed
                 self.patience_counter = 0
 
-                # Create message showing why condition wasn't met
-                if self.absolute_tolerance is not None and self.relative_tolerance is not None:
-                    reason = (f"Change detected in '{self.tracking}': {previous:.6g} → {current:.6g}, "
-                              f"abs diff: {abs_diff:.6g} > {self.absolute_tolerance:.6g} or "
-                              f"rel diff: {rel_diff:.6g} > {self.relative_tolerance:.6g}")
-                elif self.absolute_tolerance is not None:
-                    reason = (f"Change detected in '{self.tracking}': {previous:.6g} → {current:.6g}, "
-                              f"abs diff: {abs_diff:.6g} > {self.absolute_tolerance:.6g}")
-                else:
-                    reason = (f"Change detected in '{self.tracking}': {previous:.6g} → {current:.6g}, "
-                              f"rel diff: {rel_diff:.6g} > {self.relative_tolerance:.6g}")
-
-                yield False, reason
\ No newline at end of file
+                def reason() -> str:
+                    # Create message showing why condition wasn't met
+                    if self.absolute_tolerance is not None and self.relative_tolerance is not None:
+                        return (f"Change detected in '{self.tracking}': {_format(previous)} → {_format(current)}, "
+                                f"abs diff: {abs_diff:.6g} > {self.absolute_tolerance:.6g} or "
+                                f"rel diff: {rel_diff:.6g} > {self.relative_tolerance:.6g}")
+                    elif self.absolute_tolerance is not None:
+                        return (f"Change detected in '{self.tracking}': {_format(previous)} → {_format(current)}, "
+                                f"abs diff: {abs_diff:.6g} > {self.absolute_tolerance:.6g}")
+                    else:
+                        return (f"Change detected in '{self.tracking}': {_format(previous)} → {_format(current)}, "
+                                f"rel diff: {rel_diff:.6g} > {self.relative_tolerance:.6g}")
+
+                yield False, StopReason.NOT_MET, reason
+
+
+def _format(value) -> str:
+    return f'{value:.6g}' if np.ndim(value) == 0 else np.array2string(np.asarray(value), precision=6)
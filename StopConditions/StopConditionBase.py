@@ -1,41 +1,134 @@
-from abc import abstractmethod, ABC
-from dataclasses import dataclass, field
-from typing import Generator, Tuple, Optional, Dict
+from __future__ import annotations
 
-import pandas as pd
+from abc import abstractmethod, ABC
+from dataclasses import dataclass, field, fields
+from typing import Any, Generator, Tuple, Optional, Dict, Callable, Union
 
+from Core.ColumnarNumericalHistory import ColumnarNumericalHistory
 from Core.NumericalHistory import NumericalHistory
+from StopConditions.StopReason import StopReason
 from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+
+# A reason is either a ready string or a callable that formats it on demand
+Reason = Union[str, Callable[[], str]]
 
 
 @dataclass
 class StopCondition(ABC):
     history: NumericalHistory = field(default_factory=NumericalHistory)
-    stop_condition_history: pd.DataFrame = field(default_factory=pd.DataFrame, init=False)
+    record_history: bool = field(default=True, kw_only=True)
+    _recorder: ColumnarNumericalHistory = field(default_factory=ColumnarNumericalHistory, init=False, repr=False)
     stop_reason: str = field(default='', init=False)
-    _generator: Optional[Generator[Tuple[bool, str], None, None]] = field(default=None, init=False)
+    verbose: bool = field(default=True, init=False)
+    last_code: Optional[StopReason] = field(default=None, init=False)
+    _reason: Optional[Reason] = field(default=None, init=False, repr=False)
+    _generator: Optional[Generator[Tuple[bool, StopReason, Reason], None, None]] = field(default=None, init=False)
+    _resumed: bool = field(default=False, init=False, repr=False)
+
+    # init=False fields that are not part of the run state saved in checkpoints
+    _TRANSIENT_FIELDS = ('_generator', '_reason', 'verbose', '_resumed')
 
     def __post_init__(self):
         self.logger = get_logger(self.__class__.__name__)
 
+    def __getstate__(self) -> dict:
+        # Generators and lazy reasons cannot be pickled; the condition restarts its generator on the next check
+        state = self.__dict__.copy()
+        state['_generator'] = None
+        state['_reason'] = self.reason
+        return state
+
     @property
     def last_iteration(self) -> int:
         return len(self.history)
 
     @abstractmethod
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
-        """Create a generator that will yield stop condition results"""
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
+        """
+        Create a generator that will yield stop condition results as (should_stop, code, reason).
+        The reason may be a callable so the message is only formatted when someone reads it.
+        Generators yielding the older (should_stop, reason) pairs are still supported.
+        """
+        pass
+
+    def reset(self) -> None:
+        """Reset the per-run state (counters, baselines) before a new generator starts"""
         pass
 
     def _initialize_generator(self) -> None:
         """Initialize the generator"""
         if self._generator is None:
+            if not self._resumed:
+                self.reset()
+            self._resumed = False
             self._generator = self.stop_condition_generator()
 
+    def run_state(self) -> Dict[str, Any]:
+        """
+        Internal state accumulated during a run (patience counters, baselines, diagnostics),
+        as saved in checkpoints. Configuration passed to the constructor is not included.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if not f.init and f.name not in self._TRANSIENT_FIELDS}
+
+    def restore_run_state(self, state: Dict[str, Any]) -> None:
+        """Restore a run_state() so the next check continues where the saved run left off"""
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._generator = None
+        self._reason = None
+        self._resumed = True
+
     def update_stop_history(self, current_condition_params: Dict[str, any]) -> None:
-        """Update the stop history with the current condition parameters"""
-        new_row = pd.DataFrame([current_condition_params])
-        self.stop_condition_history = pd.concat([self.stop_condition_history, new_row], ignore_index=True)
+        """
+        Update the stop history with the current condition parameters.
+        Rows are appended to a columnar buffer in amortized O(1); nothing is recorded if record_history is False.
+        """
+        if self.record_history:
+            self._recorder.record_state(current_condition_params)
+
+    @property
+    def stop_condition_history(self) -> pd.DataFrame:
+        """Per-iteration diagnostics of this stop condition, built on demand"""
+        return self._recorder.to_data_frame
+
+    def check(self, history: NumericalHistory) -> Tuple[bool, StopReason]:
+        """
+        Executes the next step of the stop condition generator without formatting any message.
+
+        :param history: The current state NumericalHistory.
+        :return: Whether the computation should stop, and the structured reason code.
+        """
+        self._initialize_generator()
+        self.history = history
+        try:
+            result = next(self._generator)
+        except StopIteration:
+            self._reason = lambda: f'Stop condition [{self.__class__.__name__}] met: {self.stop_reason}'
+            return True, self.last_code or StopReason.MET
+
+        if len(result) == 2:
+            should_stop, reason = result
+            code = StopReason.MET if should_stop else StopReason.NOT_MET
+        else:
+            should_stop, code, reason = result
+        self.last_code, self._reason = code, reason
+        return should_stop, code
+
+    @property
+    def reason(self) -> str:
+        """Human-readable message for the latest check (formatted on demand)"""
+        reason = self._reason
+        if reason is None:
+            return ''
+        return reason() if callable(reason) else reason
+
+    def log_enabled(self, level: int) -> bool:
+        """Whether a message at this level would be consumed by the stop condition logger"""
+        return self.verbose and self.logger.isEnabledFor(level)
 
     def next(self, history: NumericalHistory) -> Tuple[bool, str]:
         """
@@ -48,11 +141,5 @@ class StopCondition(ABC):
             generator should stop, and the second element is the reason for stopping.
         :rtype: Tuple[bool, str]
         """
-        while True:
-            self._initialize_generator()
-            try:
-                self.history = history
-                should_stop, reason = next(self._generator)
-                return should_stop, reason
-            except StopIteration:
-                return True, f'Stop condition [{self.__class__.__name__}] met: {self.stop_reason}'
+        should_stop, _ = self.check(history)
+        return should_stop, self.reason
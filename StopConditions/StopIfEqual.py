@@ -1,7 +1,9 @@
+import logging
 from dataclasses import dataclass, field
 from typing import Generator, Tuple, Optional
 
-from StopConditions.StopConditionBase import StopCondition
+from StopConditions.StopConditionBase import StopCondition, Reason
+from StopConditions.StopReason import StopReason
 from utils.ValidationTools import is_nan
 from utils.log_config import get_logger
 
@@ -71,7 +73,7 @@ class StopIfEqual(StopCondition):
         else:
             return self.value
 
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
         while True:
             current = self.history[self.tracking]
             value = self.get_value()
@@ -79,11 +81,11 @@ class StopIfEqual(StopCondition):
             # Handle NaN values
             if is_nan(current):
                 self.logger.warning(f"Variable {self.tracking} is NaN")
-                yield True, f"Variable {self.tracking} is NaN"
+                yield True, StopReason.NAN, f"Variable {self.tracking} is NaN"
                 continue
             if is_nan(value):
                 self.logger.warning(f"Value {value} is NaN")
-                yield True, f"Value {value} is NaN"
+                yield True, StopReason.NAN, f"Value {value} is NaN"
                 continue
 
             # Calculate absolute and relative differences
@@ -97,59 +99,64 @@ class StopIfEqual(StopCondition):
             rel_tol_met = self.relative_tolerance is not None and rel_diff <= self.relative_tolerance
 
             # Update history with detailed metrics
-            self.update_stop_history(dict(
-                abs_diff=abs_diff,
-                rel_diff=rel_diff,
-                abs_tol_met=abs_tol_met,
-                rel_tol_met=rel_tol_met
-            ))
+            if self.record_history:
+                self.update_stop_history(dict(
+                    abs_diff=abs_diff,
+                    rel_diff=rel_diff,
+                    abs_tol_met=abs_tol_met,
+                    rel_tol_met=rel_tol_met
+                ))
 
             # Check if either tolerance condition is met
             if abs_tol_met or rel_tol_met:
                 self.patience_counter += 1
 
-                # Create tolerance description
-                tolerance_desc = []
-                if abs_tol_met:
-                    tolerance_desc.append(f"abs diff: {float(abs_diff):.6g} ≤ {self.absolute_tolerance:.6g}")
-                if rel_tol_met:
-                    tolerance_desc.append(f"rel diff: {float(rel_diff):.6g} ≤ {self.relative_tolerance:.6g}")
-                tolerance_str = " or ".join(tolerance_desc)
+                def tolerance_str() -> str:
+                    # Create tolerance description
+                    tolerance_desc = []
+                    if abs_tol_met:
+                        tolerance_desc.append(f"abs diff: {float(abs_diff):.6g} ≤ {self.absolute_tolerance:.6g}")
+                    if rel_tol_met:
+                        tolerance_desc.append(f"rel diff: {float(rel_diff):.6g} ≤ {self.relative_tolerance:.6g}")
+                    return " or ".join(tolerance_desc)
 
                 if self.patience_counter >= self.patience:
                     self.stop_reason = (
                         f"Variable {self.tracking}:{float(current):.6g} reached "
-                        f"target {value:.6g} ({tolerance_str}) "
+                        f"target {value:.6g} ({tolerance_str()}) "
                         f"for {self.patience} iterations"
                     )
                     self.logger.debug(self.stop_reason)
-                    yield True, self.stop_reason
+                    yield True, StopReason.MET, self.stop_reason
                 else:
-                    continue_reason = (
+                    continue_reason = lambda: (
                         f"Variable {self.tracking}:{float(current):.6g} matches "
-                        f"target {value:.6g} ({tolerance_str}) "
+                        f"target {value:.6g} ({tolerance_str()}) "
                         f"({self.patience_counter}/{self.patience} iterations)"
                     )
-                    self.logger.debug(continue_reason)
-                    yield False, continue_reason
+                    if self.log_enabled(logging.DEBUG):
+                        self.logger.debug(continue_reason())
+                    yield False, StopReason.PENDING, continue_reason
             else:
                 # Reset counter if value doesn't match within tolerances
                 self.patience_counter = 0
 
-                # Create message showing why condition wasn't met
-                condition_desc = []
-                if self.absolute_tolerance is not None:
-                    condition_desc.append(f"abs diff: {float(abs_diff):.6g} > {self.absolute_tolerance:.6g}")
-                if self.relative_tolerance is not None:
-                    condition_desc.append(f"rel diff: {float(rel_diff):.6g} > {self.relative_tolerance:.6g}")
-                condition_str = " and ".join(condition_desc)
-
-                continue_reason = (
-                    f"Variable {self.tracking}:{float(current):.6g} != "
-                    f"{value:.6g} ({condition_str})"
-                )
-                self.logger.debug(continue_reason)
-                yield False, continue_reason
+                def continue_reason() -> str:
+                    # Create message showing why condition wasn't met
+                    condition_desc = []
+                    if self.absolute_tolerance is not None:
+                        condition_desc.append(f"abs diff: {float(abs_diff):.6g} > {self.absolute_tolerance:.6g}")
+                    if self.relative_tolerance is not None:
+                        condition_desc.append(f"rel diff: {float(rel_diff):.6g} > {self.relative_tolerance:.6g}")
+                    condition_str = " and ".join(condition_desc)
+
+                    return (
+                        f"Variable {self.tracking}:{float(current):.6g} != "
+                        f"{value:.6g} ({condition_str})"
+                    )
+                if self.log_enabled(logging.DEBUG):
+                    self.logger.debug(continue_reason())
+                yield False, StopReason.NOT_MET, continue_reason
 
 
 class StopIfZero(StopIfEqual):
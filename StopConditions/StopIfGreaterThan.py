@@ -1,7 +1,9 @@
+import logging
 from dataclasses import dataclass, field
 from typing import Generator, Tuple
 
-from StopConditions.StopConditionBase import StopCondition
+from StopConditions.StopConditionBase import StopCondition, Reason
+from StopConditions.StopReason import StopReason
 from utils.ValidationTools import is_nan
 from utils.log_config import get_logger
 
@@ -36,26 +38,27 @@ class StopIfGreaterThan(StopCondition):
         comparison = ">=" if self.include_equal else ">"
         return f"{class_name}: Stop when '{self.tracking}' {comparison} {self.threshold:.6g} for {self.patience} iterations"
 
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
         while True:
             current = self.history[self.tracking]
 
             # Handle NaN values
             if is_nan(current):
                 self.logger.warning(f"Variable {self.tracking} is NaN")
-                yield True, f"Variable {self.tracking} is NaN"
+                yield True, StopReason.NAN, f"Variable {self.tracking} is NaN"
                 continue
 
             # Calculate difference from threshold
             diff = current - self.threshold
 
             # Update history with detailed metrics
-            self.update_stop_history(dict(
-                current_value=current,
-                threshold=self.threshold,
-                diff=diff,
-                include_equal=self.include_equal
-            ))
+            if self.record_history:
+                self.update_stop_history(dict(
+                    current_value=current,
+                    threshold=self.threshold,
+                    diff=diff,
+                    include_equal=self.include_equal
+                ))
 
             # Check condition based on include_equal flag
             condition_met = current > self.threshold or (self.include_equal and current == self.threshold)
@@ -71,23 +74,25 @@ class StopIfGreaterThan(StopCondition):
                         f"for {self.patience} iterations"
                     )
                     self.logger.debug(self.stop_reason)
-                    yield True, self.stop_reason
+                    yield True, StopReason.MET, self.stop_reason
                 else:
-                    continue_reason = (
+                    continue_reason = lambda: (
                         f"Variable {self.tracking}:{float(current):.6g} {comparison_symbol} "
                         f"threshold {self.threshold:.6g} "
                         f"({self.patience_counter}/{self.patience} iterations)"
                     )
-                    self.logger.debug(continue_reason)
-                    yield False, continue_reason
+                    if self.log_enabled(logging.DEBUG):
+                        self.logger.debug(continue_reason())
+                    yield False, StopReason.PENDING, continue_reason
             else:
                 # Reset counter if value doesn't meet condition
                 self.patience_counter = 0
 
                 inverse_symbol = "<" if self.include_equal else "<="
-                continue_reason = (
+                continue_reason = lambda: (
                     f"Variable {self.tracking}:{float(current):.6g} {inverse_symbol} "
                     f"{self.threshold:.6g} (diff: {float(diff):.6g})"
                 )
-                self.logger.debug(continue_reason)
-                yield False, continue_reason
\ No newline at end of file
+                if self.log_enabled(logging.DEBUG):
+                    self.logger.debug(continue_reason())
+                yield False, StopReason.NOT_MET, continue_reason
\ No newline at end of file
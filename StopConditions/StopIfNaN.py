@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Generator, Tuple, List
 
-from StopConditions.StopConditionBase import StopCondition
+from StopConditions.StopConditionBase import StopCondition, Reason
+from StopConditions.StopReason import StopReason
 from utils.ValidationTools import is_nan
 
 
@@ -10,6 +11,7 @@ class StopIfNaN(StopCondition):
     track_variables: List[str] = field(default_factory=list)
 
     def __post_init__(self):
+        super().__post_init__()
         if len(self.track_variables) == 0:
             raise ValueError("Must specify at least one variable to track")
 
@@ -19,12 +21,12 @@ class StopIfNaN(StopCondition):
     def __str__(self):
         return f"StopIfNaN: Stop if any of {self.track_variables} is NaN"
 
-    def stop_condition_generator(self) -> Generator[Tuple[bool, str], None, None]:
+    def stop_condition_generator(self) -> Generator[Tuple[bool, StopReason, Reason], None, None]:
         while True:
             for var in self.track_variables:
                 if is_nan(self.history[var]):
-                    yield True, f"Variable {var} is NaN"
+                    yield True, StopReason.NAN, f"Variable {var} is NaN"
                     break
             else:
-                yield False, "No NaN values found"
+                yield False, StopReason.NOT_MET, "No NaN values found"
 
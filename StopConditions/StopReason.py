@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class StopReason(Enum):
+    """Structured outcome of a single stop condition check"""
+    NOT_ENOUGH_HISTORY = 'not enough history'
+    NOT_MET = 'not met'
+    PENDING = 'met, waiting for patience'
+    MET = 'met'
+    NAN = 'NaN value'
+    INVALID_VALUE = 'invalid value'
+    BASELINE_UPDATED = 'baseline updated'
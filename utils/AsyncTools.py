@@ -0,0 +1,26 @@
+import asyncio
+import inspect
+from typing import Any, Callable, Iterable, List
+
+
+async def resolve(value: Any) -> Any:
+    """Await value if it is awaitable (e.g. the result of calling a coroutine function), else return it"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def evaluate(function: Callable, x: Any) -> Any:
+    """Evaluate a plain or coroutine function at x"""
+    return await resolve(function(x))
+
+
+async def evaluate_many(function: Callable, points: Iterable[Any]) -> List[Any]:
+    """
+    Evaluate a plain or coroutine function at every point.
+    Awaitable results are awaited concurrently, plain results are returned as they are.
+    """
+    values = [function(x) for x in points]
+    if not any(inspect.isawaitable(value) for value in values):
+        return values
+    return list(await asyncio.gather(*(resolve(value) for value in values)))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import sys
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from utils.LazyImport import lazy_import
+
+sympy = lazy_import('sympy')
+
+DERIVATIVE_METHODS = ('auto', 'symbolic', 'complex_step', 'finite_difference')
+
+
+def symbolic_derivatives(function: Callable, order: int = 1) -> List[sympy.Expr]:
+    """
+    The expressions [f, f', ..., f^(order)] of a function written with operations SymPy understands
+    (arithmetic, ``sympy.sin``...). Raises when the function cannot be called on a symbol.
+    """
+    x = sympy.Symbol('x')
+    expressions = [sympy.sympify(function(x))]
+    for _ in range(order):
+        expressions.append(sympy.diff(expressions[-1], x))
+    return expressions
+
+
+def compile_expression(expression: sympy.Expr) -> Callable:
+    """
+    Compile an expression of x into a NumPy function with common subexpression elimination.
+    Constant expressions still broadcast to the shape of x.
+    """
+    x = sympy.Symbol('x')
+    compiled = sympy.lambdify(x, expression, modules='numpy', cse=True)
+    if x in expression.free_symbols:
+        return compiled
+    value = float(expression)
+    return lambda x_n: value + 0 * np.real(x_n)
+
+
+def complex_step_derivative(function: Callable, step: float = 1e-20) -> Callable:
+    """
+    f'(x) = Im(f(x + ih)) / h, exact to machine precision with no subtractive cancellation,
+    for real analytic functions that accept complex arguments (NumPy functions, not ``math``).
+    """
+    def derivative(x):
+        return np.imag(function(x + 1j * step)) / step
+    return derivative
+
+
+def central_difference_derivative(function: Callable, order: int = 1) -> Callable:
+    """Central finite difference for the first or second derivative, with a step scaled to |x|"""
+    if order not in (1, 2):
+        raise ValueError(f'Finite difference derivatives are only available up to order 2, got {order}')
+    # Steps balancing truncation and rounding errors
+    relative_step = sys.float_info.epsilon ** (1 / 3 if order == 1 else 1 / 4)
+
+    def derivative(x):
+        h = relative_step * np.maximum(1.0, np.abs(x))
+        if order == 1:
+            return (function(x + h) - function(x - h)) / (2 * h)
+        return (function(x + h) - 2 * function(x) + function(x - h)) / h ** 2
+    return derivative
+
+
+def accepts_complex(function: Callable, x: float) -> bool:
+    """Whether the function can be evaluated at a complex point near x with a finite complex result"""
+    try:
+        value = function(x + 1e-20j)
+    except (TypeError, ValueError, ArithmeticError):
+        return False
+    return np.iscomplexobj(value) and bool(np.all(np.isfinite(value)))
+
+
+def numeric_derivatives(function: Callable, x0: float, order: int = 1, method: str = 'auto') -> List[Callable]:
+    """
+    Numeric [f', ..., f^(order)] of a function that cannot be differentiated symbolically.
+    'auto' uses a complex step for f' when the function accepts complex arguments at x0,
+    central differences otherwise and for the higher derivatives.
+    """
+    if method == 'auto':
+        method = 'complex_step' if accepts_complex(function, x0) else 'finite_difference'
+    derivatives = []
+    for derivative_order in range(1, order + 1):
+        if method == 'complex_step' and derivative_order == 1:
+            derivatives.append(complex_step_derivative(function))
+        else:
+            derivatives.append(central_difference_derivative(function, derivative_order))
+    return derivatives
+
+
+def compile_derivatives(function: Callable, x0: float, order: int = 1,
+                        method: str = 'auto') -> tuple[List[Callable], Optional[List[sympy.Expr]]]:
+    """
+    Numeric callables [f, f', ..., f^(order)] for a scalar function, returning floats for float inputs.
+
+    With method 'auto' or 'symbolic' the function is first differentiated with SymPy and every expression is
+    compiled once with lambdify, so no symbolic work happens per evaluation. If that fails ('auto' only),
+    or with method 'complex_step' / 'finite_difference', the function itself is kept and the derivatives are
+    approximated numerically, see numeric_derivatives.
+
+    :returns: The callables and the SymPy expressions they were compiled from (None for numeric derivatives)
+    """
+    if method not in DERIVATIVE_METHODS:
+        raise ValueError(f'Unknown derivative method {method!r}, expected one of {DERIVATIVE_METHODS}')
+
+    if method in ('auto', 'symbolic'):
+        try:
+            expressions = symbolic_derivatives(function, order)
+        except Exception:  # noqa: the function is not SymPy compatible
+            if method == 'symbolic':
+                raise
+        else:
+            return [compile_expression(expression) for expression in expressions], expressions
+
+    return [function, *numeric_derivatives(function, x0, order, method)], None
+
+
+def compile_fused_derivatives(function: Callable, x0: float, order: int = 2,
+                              method: str = 'auto') -> tuple[Callable, Optional[List[sympy.Expr]]]:
+    """
+    One callable returning [f(x), f'(x), ..., f^(order)(x)] together, to be evaluated once per iteration.
+
+    Symbolically (method 'auto' or 'symbolic'), the expressions are lambdified as a single tuple with
+    common subexpression elimination, so work shared between f and its derivatives is done once.
+    Numerically, a complex step gives f and f' from a single complex evaluation, and higher orders
+    (up to 2) use central differences, see numeric_derivatives.
+
+    :returns: The fused callable and the SymPy expressions it was compiled from (None for numeric derivatives)
+    """
+    if method not in DERIVATIVE_METHODS:
+        raise ValueError(f'Unknown derivative method {method!r}, expected one of {DERIVATIVE_METHODS}')
+
+    if method in ('auto', 'symbolic'):
+        try:
+            expressions = symbolic_derivatives(function, order)
+        except Exception:  # noqa: the function is not SymPy compatible
+            if method == 'symbolic':
+                raise
+        else:
+            compiled = sympy.lambdify(sympy.Symbol('x'), expressions, modules='numpy', cse=True)
+
+            def fused(x):
+                # Constant derivatives still broadcast to the shape of x
+                return [value + 0 * np.real(x) for value in compiled(x)]
+            return fused, expressions
+
+    if method == 'auto':
+        method = 'complex_step' if accepts_complex(function, x0) else 'finite_difference'
+    if method == 'complex_step' and order == 1:
+        step = 1e-20
+
+        def fused(x):
+            value = function(x + 1j * step)
+            return [np.real(value), np.imag(value) / step]
+        return fused, None
+
+    derivatives = [function, *numeric_derivatives(function, x0, order, method)]
+
+    def fused(x):
+        return [derivative(x) for derivative in derivatives]
+    return fused, None
@@ -6,7 +6,7 @@ from utils.log_config import get_logger
 
 
 @contextmanager
-def IgnoreException(exception_type, logger=get_logger(__name__)): # noqa
+def IgnoreException(exception_type, logger=None): # noqa
     try:
         yield
     except exception_type:
@@ -31,10 +31,12 @@ def ignore_exception(exception_type, logger=None):
     return decorator
 
 @contextmanager
-def LogAndReraise(logger=get_logger(__name__), message:str = ''): # noqa
+def LogAndReraise(logger=None, message:str = ''): # noqa
     try:
         yield
     except Exception as e:
+        if logger is None:
+            logger = get_logger(__name__)
         logger.error(f'Exception [{e.__class__.__name__}] raised: {message}\n{e}')
         logger.error(traceback.format_exc())
         raise
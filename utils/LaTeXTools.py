@@ -1,12 +1,13 @@
+from __future__ import annotations
+
 import numpy as np
-import pandas as pd
 from typing import List
 
-import sympy
-from IPython.core.display import Math
-from IPython.core.display_functions import display
-
 from utils.log_config import get_logger
+from utils.LazyImport import lazy_import
+
+pd = lazy_import('pandas')
+sympy = lazy_import('sympy')
 
 
 def df_to_latex(
@@ -18,7 +19,7 @@ def df_to_latex(
         caption: str = None,
         label: str = None,
         formatting: dict = None,
-        logger = get_logger(__name__)
+        logger = None
 ) -> str:
     """
     Convert DataFrame to a LaTeX table and save to file
@@ -87,6 +88,8 @@ def df_to_latex(
     with open(filepath, 'w') as file:
         file.write(latex_content)
 
+    if logger is None:
+        logger = get_logger(__name__)
     logger.info(f"LaTeX table exported to {filepath}")
     return latex_content
 
@@ -0,0 +1,29 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is only imported when one of its attributes is first used"""
+
+    def __getattr__(self, item: str) -> Any:
+        # Only reached until the real module has been loaded into this one's namespace
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, item)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return the module if it is already imported, otherwise a LazyModule that imports it on first attribute access,
+    e.g. ``plt = lazy_import('matplotlib.pyplot')``.
+    Modules using it for names in annotations need ``from __future__ import annotations``.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_imported(name: str) -> bool:
+    """Whether a module has actually been imported (objects of its types may exist)"""
+    return name in sys.modules
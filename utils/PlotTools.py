@@ -1,4 +1,8 @@
-from matplotlib import pyplot as plt
+from __future__ import annotations
+
+from utils.LazyImport import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
 
 
 def draw_line(point1, point2, ax=None, *args, **kwargs):
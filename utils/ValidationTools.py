@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 import inspect
 
 import numpy as np
-import sympy
 
 from utils.ExceptionTools import IgnoreException
 from utils.log_config import get_logger
+from utils.LazyImport import is_imported, lazy_import
+
+sympy = lazy_import('sympy')
 
 
 def is_nan(x) -> bool:
@@ -15,8 +19,8 @@ def is_nan(x) -> bool:
         if np.isnan(x):
             return True
 
-        # Handle sympy objects
-        if isinstance(x, sympy.Basic):
+        # Handle sympy objects (there can be none if sympy was never imported)
+        if is_imported('sympy') and isinstance(x, sympy.Basic):
             x: np.ndarray = np.array(x)
             return np.any(np.isnan(x))
     return x != x
@@ -1,62 +1,106 @@
+import atexit
 import logging
 import logging.config
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-# Define log folder relative to script location
+# Define log folder relative to script location (created on the first write to a log file, not on import)
 log_folder = Path(__file__).parent / "logs"
-# Create logs directory if it doesn't exist
-log_folder.mkdir(exist_ok=True)
+
+# Background thread writing the records put on the queue by the QueueHandler, when logging runs in queue mode
+_listener: QueueListener | None = None
 
 
 class SequentialRotatingFileHandler(RotatingFileHandler):
-    def __init__(self, filename, maxBytes, backupCount=0, encoding=None, delay=False): # noqa
+    """
+    Writes log_1.log, log_2.log, ... in the log folder, moving to the next number when a file is full.
+
+    The folder and the file are only created when the first record is written. Files are created exclusively,
+    so the handler never appends to an existing log (or one another process just created): it moves on to the
+    next free number instead. Only the first open lists the folder, to start after the highest existing number.
+
+    With ``flush_every`` > 1 the stream is flushed once per that many records instead of after every record;
+    the queue listener also flushes whenever its queue runs empty.
+    """
+
+    def __init__(self, filename=None, maxBytes=0, backupCount=0, encoding=None, delay=True,  # noqa
+                 flush_every: int = 1):
         # Ensure we're using the log folder
         self.log_dir = log_folder
-
-        # Find the next available number for the initial log file
-        next_num = self._get_next_number()
-        initial_filename = self.log_dir / f"log_{next_num}.log"
+        self.flush_every = flush_every
+        self._number = None
+        self._unflushed = 0
 
         super().__init__(
-            filename=str(initial_filename),
+            filename=str(self.log_dir / "log.log"),  # replaced by the numbered file when it is opened
             maxBytes=maxBytes,
             backupCount=backupCount,
             encoding=encoding,
             delay=delay
         )
 
-    def _get_next_number(self):
-        existing_logs = list(self.log_dir.glob("log_*.log"))
-        if not existing_logs:
-            return 1
-
-        numbers = []
-        for log in existing_logs:
+    def _last_number(self) -> int:
+        numbers = [0]
+        for entry in os.scandir(self.log_dir):
+            name, extension = os.path.splitext(entry.name)
+            prefix, _, number = name.partition('_')
+            if extension == '.log' and prefix == 'log' and number.isdigit():
+                numbers.append(int(number))
+        return max(numbers)
+
+    def _open(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        if self._number is None:
+            self._number = self._last_number() + 1
+        while True:
+            self.baseFilename = str(self.log_dir / f"log_{self._number}.log")
             try:
-                num = int(log.stem.split('_')[1])
-                numbers.append(num)
-            except (IndexError, ValueError):
-                continue
-
-        return max(numbers) + 1 if numbers else 1
+                return open(self.baseFilename, 'x', encoding=self.encoding, errors=self.errors)
+            except FileExistsError:
+                self._number += 1
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:  # noqa
+            self.handleError(record)
+
+    def flush(self):
+        super().flush()
+        self._unflushed = 0
 
     def doRollover(self):
         if self.stream:
             self.stream.close()
             self.stream = None  # noqa
 
-        next_num = self._get_next_number()
-        new_file = self.log_dir / f"log_{next_num}.log"
-
-        if os.path.exists(self.baseFilename):
-            os.rename(self.baseFilename, str(new_file))
+        self._number += 1
 
         if not self.delay:
             self.stream = self._open()
 
 
+class BatchingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs empty, rather than after every record"""
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
 LOGGING_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -73,19 +117,18 @@ LOGGING_CONFIG = {
             'stream': 'ext://sys.stdout'
         },
         'file': {
-            'class': '__main__.SequentialRotatingFileHandler',
+            'class': f'{__name__}.SequentialRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'detailed',
-            'filename': 'placeholder.log',  # This will be overridden by the handler's __init__
             'maxBytes': 3 * 1024 * 1024,  # 3MB
-            'backupCount': 0
+            'backupCount': 0,
+            'flush_every': 64
         }
     },
     'loggers': {
         '': {  # Root logger
             'handlers': [
-                'console',
-                'file'
+                'console'
             ],
             'level': 'DEBUG',
             'propagate': True
@@ -94,25 +137,116 @@ LOGGING_CONFIG = {
 }
 
 
-def get_logger(name, console_log_level:str | int=None):
-    logging.SequentialRotatingFileHandler = SequentialRotatingFileHandler
-    if not log_folder.exists():
-        log_folder.mkdir(exist_ok=True)
+def configure_logging(console_log_level: str | int = None, log_file: bool = False, use_queue: bool = True):
+    """
+    (Re)configure the root logger.
 
-    if logging.getLogger().handlers:
-        return logging.getLogger(name)
+    :param console_log_level: level of the console handler (INFO by default); 'OFF' or an int removes it
+    :param log_file: also write records (from DEBUG up) to the numbered files in the log folder. Off by default
+    :param use_queue: hand records to a QueueHandler and let a background QueueListener thread format
+        and write them, so solver iterations never wait for the console or the disk
+    """
+    global _listener
+    stop_logging()
 
-    # Update the class path in the config to match the current module
-    log_config_dict = LOGGING_CONFIG.copy()
-    log_config_dict['handlers']['file']['class'] = f'{__name__}.SequentialRotatingFileHandler'
+    log_config_dict = {**LOGGING_CONFIG,
+                       'handlers': {name: dict(handler) for name, handler in LOGGING_CONFIG['handlers'].items()},
+                       'loggers': {'': dict(LOGGING_CONFIG['loggers'][''])}}
+    handler_names = []
 
-    if console_log_level and isinstance(console_log_level, str):
-        console_log_level = 100 if console_log_level.upper() == 'OFF' else console_log_level.upper()
-        log_config_dict['handlers']['console']['level'] = console_log_level
-    elif console_log_level and isinstance(console_log_level, int):
-        del log_config_dict['handlers']['console']
+    # An int level or 'OFF' drops the console handler: a silenced handler would still receive every record
+    if not console_log_level:
+        handler_names.append('console')
+    elif isinstance(console_log_level, str) and console_log_level.upper() != 'OFF':
+        log_config_dict['handlers']['console']['level'] = console_log_level.upper()
+        handler_names.append('console')
+    if log_file:
+        handler_names.append('file')
+
+    log_config_dict['handlers'] = {name: log_config_dict['handlers'][name] for name in handler_names}
+    log_config_dict['loggers']['']['handlers'] = handler_names
 
     # Apply the configuration
     logging.config.dictConfig(log_config_dict)
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+
+    # Let loggers skip building messages that no handler would write
+    root.setLevel(min((handler.level for handler in handlers), default=100))
+
+    if use_queue and handlers:
+        for handler in handlers:
+            root.removeHandler(handler)
+        record_queue = queue.SimpleQueue()
+        root.addHandler(QueueHandler(record_queue))
+        _listener = BatchingQueueListener(record_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    elif not handlers:
+        # Keeps get_logger from configuring again and logging from falling back to its last resort handler
+        root.addHandler(logging.NullHandler())
+
+
+def stop_logging():
+    """Write out the records still queued and stop the background listener, if any"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def _hold_listener_handlers() -> None:
+    """Before a fork: flush the listener's handlers and keep them locked, so no half-written buffer is copied"""
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.acquire()
+            handler.flush()
+
+
+def _release_listener_handlers() -> None:
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.release()
+
+
+def _log_directly_after_fork() -> None:
+    """
+    In a forked child (e.g. a run_many worker) the listener thread does not exist: records put on the queue would
+    never be written, and stop_logging would wait for the thread forever. Hand the root logger the listener's
+    handlers instead; files are reopened, so a child writes its own numbered log file.
+    """
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        handler.createLock()
+        if isinstance(handler, logging.FileHandler) and handler.stream is not None:
+            handler.stream.close()
+            handler.stream = None  # noqa
+        if isinstance(handler, SequentialRotatingFileHandler):
+            # Nothing flushes when idle any more, and workers exit without running atexit
+            handler.flush_every = 1
+        root.addHandler(handler)
+    _listener = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_hold_listener_handlers, after_in_parent=_release_listener_handlers,
+                        after_in_child=_log_directly_after_fork)
+
+
+def get_logger(name, console_log_level:str | int=None):
+    if logging.getLogger().handlers:
+        return logging.getLogger(name)
+
+    configure_logging(console_log_level)
 
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)